@@ -0,0 +1,35 @@
+"""Benchmarks of one dimensional tensor network methods.
+
+Run with::
+
+    python benchmarks/bench_tensor_1d.py
+
+"""
+import timeit
+
+import quimb.tensor as qtn
+
+
+def _timeit(fn, repeat=7, number=1):
+    """Best time per call of ``repeat`` batches of ``number`` calls, in
+    milliseconds.
+    """
+    return 1000 * min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def _report(name, value, unit='ms'):
+    print("{:<40} {:>10.3f} {}".format(name, value, unit))
+
+
+def bench_mps_sample(n=50, bond_dims=(8, 32, 128), C=100000):
+    """Configurations sampled per second from random MPS.
+    """
+    for D in bond_dims:
+        psi = qtn.MPS_rand_state(n, D)
+        t = _timeit(lambda: psi.sample(C, seed=42), repeat=3)
+        _report("MPS.sample (n={}, D={})".format(n, D),
+                1000 * C / t, 'samples/s')
+
+
+if __name__ == '__main__':
+    bench_mps_sample()
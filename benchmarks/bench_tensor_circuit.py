@@ -0,0 +1,175 @@
+"""Benchmarks of quantum circuit simulation with ``Circuit``.
+
+Run with::
+
+    python benchmarks/bench_tensor_circuit.py
+
+"""
+import os
+import timeit
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+import quimb as qu
+import quimb.tensor as qtn
+from quimb.tensor.circuit import (
+    parse_qasm_file,
+    parse_qasm_file_stream,
+    get_gate_array,
+    build_gate_arrays,
+)
+
+
+def _timeit(fn, repeat=7, number=1):
+    """Best time per call of ``repeat`` batches of ``number`` calls, in
+    milliseconds.
+    """
+    return 1000 * min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def _report(name, value, unit='ms'):
+    print("{:<40} {:>10.3f} {}".format(name, value, unit))
+
+
+def rand_qasm(n, depth, seed=42):
+    """A random circuit of layers of single qubit gates on every qubit
+    followed by two qubit gates on random neighbouring pairs.
+    """
+    rng = np.random.RandomState(seed)
+    lines = [str(n)]
+    for _ in range(depth):
+        for i in range(n):
+            g = rng.choice(['H', 'T', 'X_1_2', 'Y_1_2', 'RZ'])
+            if g == 'RZ':
+                lines.append("RZ {} {}".format(rng.uniform(0, 6), i))
+            else:
+                lines.append("{} {}".format(g, i))
+        for i in range(n - 1):
+            if rng.rand() < 0.5:
+                g = rng.choice(['CZ', 'CNOT'])
+                lines.append("{} {} {}".format(g, i, i + 1))
+    return "\n".join(lines) + "\n"
+
+
+def bench_circuit_lazy(n=20, depths=(10, 100, 1000)):
+    """Time to build the circuit tensor network from a random QASM circuit,
+    gate by gate and with the lazy, fused mode.
+    """
+    for depth in depths:
+        qasm = rand_qasm(n, depth)
+        num_gates = len(qasm.splitlines()) - 1
+        for lazy in (False, True):
+
+            def fn():
+                return qtn.Circuit.from_qasm(qasm, lazy=lazy).psi
+
+            t = _timeit(fn, repeat=3)
+            _report("Circuit {} ({} gates)".format(
+                'lazy' if lazy else 'apply_circuit', num_gates), t)
+            _report("  -> tensors", len(fn().tensors), '')
+
+
+def bench_circuit_amplitudes(n=20, depth=8, batch_sizes=(1, 10, 100, 1000)):
+    """Throughput of computing the amplitudes of batches of random
+    bitstrings, which share more prefixes and suffixes as the batch grows.
+    """
+    qc = qtn.Circuit.from_qasm(rand_qasm(n, depth), lazy=True)
+    rng = np.random.RandomState(7)
+
+    for batch_size in batch_sizes:
+        bitstrings = rng.randint(0, 2, size=(batch_size, n))
+        t = _timeit(lambda: qc.amplitudes(bitstrings), repeat=3)
+        _report("Circuit.amplitudes (batch={})".format(batch_size),
+                1000 * batch_size / t, 'bitstrings/s')
+
+
+def bench_qasm_file_parse(n=50, depth=2000):
+    """Time and peak memory to parse a large qasm file, all at once and
+    streamed gate by gate.
+    """
+    fd, fname = tempfile.mkstemp(suffix='.qasm')
+    with os.fdopen(fd, 'w') as f:
+        f.write(rand_qasm(n, depth))
+
+    def parse_all():
+        return len(parse_qasm_file(fname)['gates'])
+
+    def parse_stream():
+        return sum(1 for _ in parse_qasm_file_stream(fname)['gates'])
+
+    try:
+        for name, fn in [('parse_qasm_file', parse_all),
+                         ('parse_qasm_file_stream', parse_stream)]:
+            _report(name, _timeit(fn, repeat=3))
+            tracemalloc.start()
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            _report("  -> peak memory", peak / 2**20, 'MB')
+    finally:
+        os.remove(fname)
+
+
+def bench_from_qasm_file(n=8, depths=(1000, 4000)):
+    """Time and peak memory of ``Circuit.from_qasm_file`` itself, contracting
+    each gate into the state, for files of increasing depth. Recording every
+    gate, all at once in lazy mode, uses memory that grows with the number
+    of gates, while fusing them in chunks without recording them is bounded,
+    once the gate array cache is full.
+    """
+    opts = {
+        'recorded': {'lazy': True, 'lazy_chunk_size': float('inf')},
+        'chunked': {'lazy': True, 'record_gates': False},
+    }
+
+    for depth in depths:
+        fd, fname = tempfile.mkstemp(suffix='.qasm')
+        with os.fdopen(fd, 'w') as f:
+            f.write(rand_qasm(n, depth))
+
+        try:
+            for name, circ_opts in opts.items():
+
+                def load():
+                    qc = qtn.Circuit.from_qasm_file(
+                        fname, gate_opts={'contract': True}, **circ_opts)
+                    return qc.psi
+
+                _report("from_qasm_file {} (depth={})".format(name, depth),
+                        _timeit(load, repeat=1))
+                tracemalloc.start()
+                load()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                _report("  -> peak memory", peak / 2**20, 'MB')
+        finally:
+            os.remove(fname)
+
+
+def bench_gate_arrays(num_angles=1000, num_calls=10000):
+    """Gate arrays constructed per second for ``num_calls`` rotations drawn
+    from ``num_angles`` angles, as in a variational circuit, with
+    ``qu.Rz``, the gate cache, and all at once with ``build_gate_arrays``.
+    """
+    rng = np.random.RandomState(7)
+    angles = rng.uniform(0, 2 * np.pi, size=num_angles)
+    thetas = angles[rng.randint(0, num_angles, size=num_calls)].tolist()
+
+    for name, fn in [
+        ('qu.Rz', lambda: [qu.Rz(theta) for theta in thetas]),
+        ('get_gate_array', lambda: [get_gate_array('RZ', theta)
+                                    for theta in thetas]),
+        ('build_gate_arrays', lambda: build_gate_arrays('RZ', thetas)),
+    ]:
+        t = _timeit(fn, repeat=5)
+        _report(name, 1000 * num_calls / t, 'gates/s')
+
+
+if __name__ == '__main__':
+    bench_circuit_lazy()
+    bench_circuit_amplitudes()
+    bench_qasm_file_parse()
+    bench_from_qasm_file()
+    bench_gate_arrays()
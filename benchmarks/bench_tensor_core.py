@@ -0,0 +1,153 @@
+"""Benchmarks of the core tensor network data structures.
+
+Run with::
+
+    python benchmarks/bench_tensor_core.py
+
+"""
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+from cytoolz import concat, unique
+
+import quimb.tensor as qtn
+from quimb.tensor.tensor_core import (
+    _gen_output_inds,
+    _maybe_map_indices_to_alphabet,
+)
+
+
+def _timeit(fn, repeat=7):
+    """Best time of ``repeat`` calls, in milliseconds.
+    """
+    return 1000 * min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def _report(name, value, unit='ms'):
+    print("{:<40} {:>10.3f} {}".format(name, value, unit))
+
+
+def _tensors(n):
+    return [qtn.Tensor(np.empty((2, 2)), inds=(i, i + 1), tags={i})
+            for i in range(n)]
+
+
+def bench_tensor_memory(n=10000):
+    """Memory allocated per (tiny) tensor, including its attributes.
+    """
+    data = np.empty((2, 2))
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    ts = [qtn.Tensor(data, inds=(i, i + 1), tags={i}) for i in range(n)]
+    tn = qtn.TensorNetwork(ts, virtual=True, check_collisions=False)
+    diff = tracemalloc.take_snapshot().compare_to(snapshot, 'filename')
+    tracemalloc.stop()
+
+    size = sum(d.size_diff for d in diff)
+    _report("memory per owned tensor", size / n, 'B')
+    return tn
+
+
+def bench_tensor_network_init(n=10000):
+    ts = _tensors(n)
+    t = _timeit(lambda: qtn.TensorNetwork(ts, check_collisions=False))
+    _report("TensorNetwork.__init__ ({} tensors)".format(n), t)
+
+
+def bench_tensor_network_copy(n=10000):
+    tn = qtn.TensorNetwork(_tensors(n), check_collisions=False)
+    for virtual in (False, True):
+        t = _timeit(lambda: tn.copy(virtual=virtual))
+        _report("TensorNetwork.copy(virtual={})".format(virtual), t)
+
+
+def bench_pairwise_contract(bond_dims=(2, 4, 8, 16, 32), number=1000):
+    """Per call time of contracting an MPS-like site tensor with an
+    MPO-like site tensor, where python overhead dominates for small ``D``.
+    """
+    for D in bond_dims:
+        a = qtn.rand_tensor((D, D, 2), inds=('l', 'r', 'k'))
+        b = qtn.rand_tensor((4, 4, 2, 2), inds=('L', 'R', 'b', 'k'))
+        t = 1000 * min(timeit.repeat(lambda: qtn.tensor_contract(a, b),
+                                     number=number, repeat=5)) / number
+        _report("tensor_contract pair (D={})".format(D), 1000 * t, 'us')
+
+
+def _lattice(L, ind):
+    """An ``L x L`` lattice of tensors, with string tags and indices
+    labelled by ``ind(kind, i, j)``.
+    """
+    ts = []
+    for i in range(L):
+        for j in range(L):
+            inds = [ind('k', i, j)]
+            if i > 0:
+                inds.append(ind('v', i - 1, j))
+            if i < L - 1:
+                inds.append(ind('v', i, j))
+            if j > 0:
+                inds.append(ind('h', i, j - 1))
+            if j < L - 1:
+                inds.append(ind('h', i, j))
+            tags = {'I{},{}'.format(i, j), 'ROW{}'.format(i),
+                    'COL{}'.format(j)}
+            ts.append(qtn.Tensor(np.empty((1,) * len(inds)), inds, tags))
+    return qtn.TensorNetwork(ts, check_collisions=False)
+
+
+def bench_label_lookups(L=30):
+    """Time the label heavy network operations on a lattice, with string and
+    then integer indices. The integer times bound what interning labels as
+    integers internally could save, before paying for the translation of
+    each label passed to or returned from the public API - itself one
+    string keyed dict lookup, which is what ``tag_map`` and ``ind_map``
+    already cost.
+    """
+    # as with ``rand_uuid`` bonds, both tensors share the same label object
+    str_labels, int_labels = {}, {}
+
+    def str_ind(kind, i, j):
+        return str_labels.setdefault((kind, i, j),
+                                     '{}{},{}'.format(kind, i, j))
+
+    def int_ind(kind, i, j):
+        return int_labels.setdefault((kind, i, j), len(int_labels))
+
+    for name, ind in (('str', str_ind), ('int', int_ind)):
+        tn = _lattice(L, ind)
+        ixs = list(tn.ind_map)[::3]
+        index_map = {ix: ind('r', ix, 0) for ix in tn.ind_map}
+
+        def contract_str():
+            i_ix = tuple(t.inds for t in tn)
+            a_ix = tuple(concat(i_ix))
+            o_ix = tuple(_gen_output_inds(a_ix))
+            return _maybe_map_indices_to_alphabet([*unique(a_ix)], i_ix, o_ix)
+
+        t = _timeit(lambda: tn._get_tids_from(tn.ind_map, ixs, 'any'))
+        _report("ind_map lookups ({} inds)".format(name), t)
+        t = _timeit(lambda: tn.reindex(index_map))
+        _report("reindex ({} inds)".format(name), t)
+        t = _timeit(contract_str)
+        _report("contraction string ({} inds)".format(name), t)
+
+    # integer tags are interpreted as sites, so only strings here
+    rows = ['ROW{}'.format(i) for i in range(L // 2)]
+    t = _timeit(lambda: tn.select('ROW{}'.format(L // 2)))
+    _report("select (one tag)", t)
+    t = _timeit(lambda: tn.select(['ROW{}'.format(L // 2),
+                                   'COL{}'.format(L // 2)]))
+    _report("select (two tags, which='all')", t)
+    t = _timeit(lambda: tn.partition_tensors(rows))
+    _report("partition_tensors ({} tags)".format(len(rows)), t)
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    bench_tensor_memory(n)
+    bench_tensor_network_init(n)
+    bench_tensor_network_copy(n)
+    bench_pairwise_contract()
+    bench_label_lookups()
@@ -0,0 +1,84 @@
+"""Benchmarks of the DMRG building blocks.
+
+Run with::
+
+    python benchmarks/bench_tensor_dmrg.py
+
+"""
+import timeit
+
+import numpy as np
+
+import quimb.tensor as qtn
+from quimb.tensor.tensor_core import TNLinearOperator
+from quimb.tensor.tensor_dmrg import (
+    EffHamLinearOperator,
+    MovingEnvironment,
+    parse_2site_inds_dims,
+)
+
+
+def _timeit(fn, repeat=7, number=1):
+    """Best time per call of ``repeat`` batches of ``number`` calls, in
+    milliseconds.
+    """
+    return 1000 * min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def _report(name, value, unit='ms'):
+    print("{:<40} {:>10.3f} {}".format(name, value, unit))
+
+
+def _eff_ham_2site(bond_dim, n=10):
+    """The 2-site effective hamiltonian network in the middle of a chain,
+    as in ``DMRG2``, along with its left and right indices.
+    """
+    k = qtn.MPS_rand_state(n, bond_dim)
+    b, H = k.H, qtn.MPO_ham_heis(n)
+    k.add_tag('_KET')
+    b.add_tag('_BRA')
+    H.add_tag('_HAM')
+    k.align_(H, b)
+
+    i = n // 2 - 1
+    me = MovingEnvironment(b | H | k, begin='left', bsz=2)
+    me.move_to(i)
+
+    dims, *_, lix, _, _, uix, _, _ = parse_2site_inds_dims(k, b, i)
+    return me()['_HAM'], lix, uix, dims
+
+
+def bench_eff_ham_matvec(bond_dims=(16, 32, 64, 128), nvecs=4):
+    """Throughput of the 2-site effective hamiltonian as a generic
+    ``TNLinearOperator`` versus ``EffHamLinearOperator``, for single vectors
+    (as in lanczos) and blocks of ``nvecs`` vectors (as in e.g. lobpcg).
+    Also the cost of creating the operator and performing the first
+    matvec, which happens once per site per sweep.
+    """
+    for D in bond_dims:
+        tensors, lix, uix, dims = _eff_ham_2site(D)
+        number = max(1, 2**16 // D**2)
+
+        ops = {
+            'TNLinearOperator': lambda: TNLinearOperator(
+                tensors, lix, uix, ldims=dims, rdims=dims),
+            'EffHamLinearOperator': lambda: EffHamLinearOperator(
+                tensors, lix, uix),
+        }
+
+        for name, make_op in ops.items():
+            A = make_op()
+            x = np.random.randn(A.shape[1])
+            X = np.random.randn(A.shape[1], nvecs)
+
+            t = _timeit(lambda: make_op() @ x, number=number)
+            _report("{} first matvec (D={})".format(name, D), t)
+            t = _timeit(lambda: A @ x, number=number)
+            _report("{} matvec (D={})".format(name, D), 1000 / t, '/s')
+            t = _timeit(lambda: A @ X, number=number)
+            _report("{} matmat x{} (D={})".format(name, nvecs, D),
+                    nvecs * 1000 / t, 'vecs/s')
+
+
+if __name__ == '__main__':
+    bench_eff_ham_matvec()
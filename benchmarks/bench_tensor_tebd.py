@@ -0,0 +1,65 @@
+"""Benchmarks of TEBD gate application.
+
+Run with::
+
+    python benchmarks/bench_tensor_tebd.py
+
+"""
+import timeit
+
+import quimb as qu
+import quimb.tensor as qtn
+
+
+def _timeit(fn, repeat=7, number=1):
+    """Best time per call of ``repeat`` batches of ``number`` calls, in
+    milliseconds.
+    """
+    return 1000 * min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def _report(name, value, unit='ms'):
+    print("{:<40} {:>10.3f} {}".format(name, value, unit))
+
+
+def bench_tebd_sweeps(n=32, bond_dims=(4, 8, 16, 32, 64)):
+    """Gates applied per second by second order TEBD steps, with the bond
+    dimension held fixed, using the fused kernel and gate by gate
+    ``gate_split``.
+    """
+    H = qu.ham_heis(2)
+    # right, left then right sweeps
+    num_gates = 2 * len(range(0, n - 1, 2)) + len(range(1, n - 1, 2))
+
+    for D in bond_dims:
+        psi0 = qtn.MPS_rand_state(n, D, dtype=complex)
+        for fused in (False, True):
+            tebd = qtn.TEBD(psi0, H, dt=0.01, fused=fused,
+                            split_opts={'max_bond': D, 'cutoff': 1e-14})
+            t = _timeit(tebd.step, repeat=5)
+            _report("TEBD {} (D={})".format(
+                'fused' if fused else 'gate_split', D),
+                1000 * num_gates / t, 'gates/s')
+
+
+def bench_tebd_parallel(n=32, bond_dims=(16, 32, 64), num_threads=(1, 2, 4)):
+    """Gates applied per second by second order TEBD steps in the Vidal
+    gauge, with the gates of each sweep applied by a pool of threads.
+    """
+    H = qu.ham_heis(2)
+    num_gates = 2 * len(range(0, n - 1, 2)) + len(range(1, n - 1, 2))
+
+    for D in bond_dims:
+        psi0 = qtn.MPS_rand_state(n, D, dtype=complex)
+        for nt in num_threads:
+            tebd = qtn.TEBDParallel(
+                psi0, H, dt=0.01, num_threads=nt,
+                split_opts={'max_bond': D, 'cutoff': 1e-14})
+            t = _timeit(tebd.step, repeat=5)
+            _report("TEBDParallel threads={} (D={})".format(nt, D),
+                    1000 * num_gates / t, 'gates/s')
+
+
+if __name__ == '__main__':
+    bench_tebd_sweeps()
+    bench_tebd_parallel()
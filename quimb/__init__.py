@@ -94,6 +94,7 @@ from .gen.operators import (
     S_gate,
     T_gate,
     rotation,
+    rotations,
     Rx,
     Ry,
     Rz,
@@ -303,6 +304,7 @@ __all__ = [
     'T_gate',
     'S_gate',
     'rotation',
+    'rotations',
     'Rx',
     'Ry',
     'Rz',
@@ -231,6 +231,17 @@ def realify_scalar(x, imag_tol=1e-12):
         return x
 
 
+def realify_item(x, imag_tol=1e-12):
+    """Convert the scalar or single element array ``x`` to a python number,
+    dropping its imaginary part if very small.
+    """
+    try:
+        x = x.item()
+    except AttributeError:
+        pass
+    return realify_scalar(x, imag_tol=imag_tol)
+
+
 def realify(fn, imag_tol=1e-12):
     """Decorator that drops ``fn``'s output imaginary part if very small.
     """
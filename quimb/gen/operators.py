@@ -205,6 +205,29 @@ Ry = functools.partial(rotation, xyz='y')
 Rz = functools.partial(rotation, xyz='z')
 
 
+def rotations(phis, xyz='Z', dtype=complex):
+    """A batch of single qubit rotation gates, constructed at once.
+
+    Parameters
+    ----------
+    phis : array_like
+        The rotation angles.
+    xyz : {'X', 'Y', 'Z'}, optional
+        The axis of rotation.
+    dtype : numpy.dtype, optional
+        The data type of the gates.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape ``(*np.shape(phis), 2, 2)``, with the gate for each
+        angle.
+    """
+    phis = np.asarray(phis, dtype=float)[..., None, None] / 2
+    I, P = np.asarray(pauli('I')), np.asarray(pauli(xyz))
+    return (np.cos(phis) * I - 1.0j * np.sin(phis) * P).astype(dtype)
+
+
 @functools.lru_cache(maxsize=8)
 def swap(dim=2, dtype=complex, **kwargs):
     """The SWAP operator acting on subsystems of dimension `dim`.
@@ -485,8 +485,73 @@ def expm(A, herm=False):
         return evecs @ ldmul(np.exp(evals), dag(evecs))
 
 
+def expm_multiply_lanczos(mat, vec, t=1.0, krylov_dim=32, tol=1e-12):
+    """Compute the action of ``expm(t * mat)`` on ``vec``, for hermitian
+    ``mat`` and scalar, possibly complex, ``t``, by projecting into the Krylov
+    subspace generated by the lanczos iteration. If the error estimate is not
+    below ``tol`` by ``krylov_dim`` iterations, ``t`` is split in two and each
+    half applied in turn.
+
+    Parameters
+    ----------
+    mat : operator
+        Hermitian operator, only needs to support ``mat @ x`` for vectors.
+    vec : vector-like
+        Vector to act with exponential of operator on.
+    t : scalar, optional
+        Factor to multiply ``mat`` by in the exponent, e.g. ``-1j * dt`` for
+        unitary time evolution.
+    krylov_dim : int, optional
+        The maximum size of the Krylov subspace.
+    tol : float, optional
+        Relative tolerance for the error estimate.
+
+    Returns
+    -------
+    vector
+        Result of ``expm(t * mat) @ vec``.
+    """
+    shape = vec.shape
+    v = np.asarray(vec).ravel()
+    dtype = np.result_type(mat.dtype, v.dtype, t)
+
+    beta0 = np.linalg.norm(v)
+    if beta0 == 0.0:
+        return np.zeros(shape, dtype=dtype)
+
+    V = np.empty((krylov_dim, v.size), dtype=dtype)
+    V[0] = v / beta0
+    alpha, beta = [], []
+
+    for j in range(krylov_dim):
+        w = np.asarray(mat @ V[j]).ravel().astype(dtype, copy=False)
+
+        # full reorthogonalization is cheap for these small subspaces
+        alpha.append(np.vdot(V[j], w).real)
+        w = w - V[:j + 1].T @ (V[:j + 1].conj() @ w)
+        w = w - V[:j + 1].T @ (V[:j + 1].conj() @ w)
+        beta.append(np.linalg.norm(w))
+
+        # exponentiate the projected, tridiagonal, matrix
+        evals, evecs = sla.eigh_tridiagonal(alpha, beta[:-1])
+        c = evecs @ (np.exp(t * evals) * evecs[0])
+
+        # invariant subspace found or converged
+        if beta[-1] * abs(c[-1]) < tol:
+            return (beta0 * (c @ V[:j + 1])).reshape(shape)
+
+        if j + 1 < krylov_dim:
+            V[j + 1] = w / beta[-1]
+
+    # not converged -> split the step
+    opts = {'krylov_dim': krylov_dim, 'tol': tol}
+    vec = expm_multiply_lanczos(mat, vec, t=t / 2, **opts)
+    return expm_multiply_lanczos(mat, vec, t=t / 2, **opts)
+
+
 _EXPM_MULTIPLY_METHODS = {
     'SCIPY': spla.expm_multiply,
+    'LANCZOS': expm_multiply_lanczos,
     'SLEPC': functools.partial(mfn_multiply_slepc_spawn, fntype='exp'),
     'SLEPC-KRYLOV': functools.partial(
         mfn_multiply_slepc_spawn, fntype='exp', MFNType='KRYLOV'),
@@ -505,8 +570,10 @@ def expm_multiply(mat, vec, backend="AUTO", **kwargs):
         Operator with which to act with exponential on ``vec``.
     vec : vector-like
         Vector to act with exponential of operator on.
-    backend : {'AUTO', 'SCIPY', 'SLEPC', 'SLEPC-KRYLOV', 'SLEPC-EXPOKIT'}
-        Which backend to use.
+    backend : {'AUTO', 'SCIPY', 'LANCZOS', 'SLEPC', 'SLEPC-KRYLOV',
+               'SLEPC-EXPOKIT'}
+        Which backend to use. 'LANCZOS' requires ``mat`` to be hermitian,
+        see :func:`~quimb.linalg.base_linalg.expm_multiply_lanczos`.
     kwargs
         Supplied to backend function.
 
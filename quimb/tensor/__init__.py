@@ -3,7 +3,16 @@ from .tensor_core import (
     set_contract_backend,
     get_tensor_linop_backend,
     set_tensor_linop_backend,
+    get_contract_path_cache,
+    set_contract_path_cache,
+    add_contract_hook,
+    remove_contract_hook,
+    ContractProfiler,
     tensor_contract,
+    infer_backend,
+    tensor_contract_sliced,
+    tensor_contract_parallel,
+    tensor_contract_batched,
     tensor_split,
     tensor_direct_product,
     bonds,
@@ -12,6 +21,7 @@ from .tensor_core import (
     TensorNetwork,
     TNLinearOperator1D,
 )
+from .block_sparse import BlockSparseArray
 from .tensor_gen import (
     rand_tensor,
     MPS_rand_state,
@@ -47,9 +57,11 @@ from .tensor_1d import (
 )
 from .tensor_dmrg import (
     MovingEnvironment,
+    EffHamLinearOperator,
     DMRG,
     DMRG1,
     DMRG2,
+    DMRG2Parallel,
     DMRGX,
 )
 from .tensor_mera import (
@@ -57,6 +69,10 @@ from .tensor_mera import (
 )
 from .tensor_tebd import (
     TEBD,
+    TEBDParallel,
+)
+from .tensor_tdvp import (
+    TDVP,
 )
 from .circuit import (
     Circuit
@@ -67,7 +83,16 @@ __all__ = (
     "set_contract_backend",
     "get_tensor_linop_backend",
     "set_tensor_linop_backend",
+    "get_contract_path_cache",
+    "set_contract_path_cache",
+    "add_contract_hook",
+    "remove_contract_hook",
+    "ContractProfiler",
     "tensor_contract",
+    "infer_backend",
+    "tensor_contract_sliced",
+    "tensor_contract_parallel",
+    "tensor_contract_batched",
     "tensor_split",
     "tensor_direct_product",
     "bonds",
@@ -75,6 +100,7 @@ __all__ = (
     "Tensor",
     "TensorNetwork",
     "TNLinearOperator1D",
+    "BlockSparseArray",
     "rand_tensor",
     "MPS_rand_state",
     "MPS_product_state",
@@ -105,11 +131,15 @@ __all__ = (
     "expec_TN_1D",
     "gate_TN_1D",
     "MovingEnvironment",
+    "EffHamLinearOperator",
     "DMRG",
     "DMRG1",
     "DMRG2",
+    "DMRG2Parallel",
     "DMRGX",
     "MERA",
     "TEBD",
+    "TEBDParallel",
+    "TDVP",
     "Circuit",
 )
@@ -0,0 +1,861 @@
+"""Block-sparse arrays for tensors with an abelian - U(1) or Z_n - symmetry.
+
+Every index of a :class:`BlockSparseArray` labels each of its basis elements
+with a charge (quantum number) and has a 'flow', ``+1`` for incoming and
+``-1`` for outgoing. Only the dense blocks whose charges are conserved, i.e.
+``sum(flow * charge) == array.charge``, are stored.
+
+As well as the array class, this module implements ``tensordot``,
+``transpose`` and ``einsum`` so that it can be used directly as an
+``opt_einsum`` backend, which is what
+:func:`~quimb.tensor.tensor_core.tensor_contract` selects automatically for
+tensors with block-sparse data.
+"""
+
+import functools
+import itertools
+
+import numpy as np
+from cytoolz import concat
+
+from .decomp import _trim_singular_vals, _renorm_singular_vals
+
+
+@functools.lru_cache(32)
+def _parse_symmetry(symmetry):
+    """Get the modulus of the group ``symmetry``, with 0 denoting U(1).
+    """
+    if symmetry == 'U1':
+        return 0
+
+    if (symmetry[0] == 'Z') and symmetry[1:].isdigit():
+        n = int(symmetry[1:])
+        if n >= 2:
+            return n
+
+    raise ValueError("``symmetry`` should be 'U1' or 'Z{{n}}' with n >= 2, "
+                     "got {}.".format(symmetry))
+
+
+def _fuse(charges, flows, modulus):
+    """Combine ``charges`` with signs ``flows`` into a single total charge.
+    """
+    q = sum(f * c for f, c in zip(flows, charges))
+    return q % modulus if modulus else q
+
+
+@functools.lru_cache(256)
+def _sectors(charges):
+    """Find the positions of each distinct charge in the index ``charges``, as
+    an ordered mapping ``{charge: positions, ...}``.
+    """
+    positions = {}
+    for i, q in enumerate(charges):
+        positions.setdefault(q, []).append(i)
+    return {q: np.array(positions[q]) for q in sorted(positions)}
+
+
+@functools.lru_cache(256)
+def _allowed_keys(charges, flows, charge, modulus):
+    """Find all the block keys - tuples of one charge per index - that conserve
+    ``charge``, in sorted order.
+    """
+    if not charges:
+        return ((),) if charge == 0 else ()
+
+    *sectors, last = (tuple(_sectors(c)) for c in charges)
+    *fs, f_last = flows
+
+    keys = []
+    for key in itertools.product(*sectors):
+        q = f_last * (charge - _fuse(key, fs, 0))
+        if modulus:
+            q %= modulus
+        if q in last:
+            keys.append((*key, q))
+
+    return tuple(sorted(keys))
+
+
+def _norm_charges(charges, modulus):
+    """Convert an index's ``charges`` to a hashable tuple of python ints.
+    """
+    if modulus:
+        return tuple(int(q) % modulus for q in charges)
+    return tuple(int(q) for q in charges)
+
+
+class BlockSparseArray:
+    """A dense array stored only as the blocks allowed by an abelian symmetry.
+
+    Parameters
+    ----------
+    blocks : dict[tuple[int], numpy.ndarray]
+        Mapping of block keys - one charge per index - to the dense sub-array
+        of elements with those charges. Missing blocks are zero.
+    charges : sequence of sequence of int
+        For each index, the charge of each of its elements.
+    flows : sequence of {1, -1}
+        For each index, whether it is incoming (``1``) or outgoing (``-1``).
+    charge : int, optional
+        The total charge of the array, ``0`` for an invariant array.
+    symmetry : {'U1', 'Z2', 'Z3', ...}, optional
+        The symmetry group that the charges belong to.
+    dtype : numpy.dtype, optional
+        The data type, needed only if there are no blocks.
+    """
+
+    # make numpy defer to the methods below, e.g. for ``numpy.float64 * x``
+    __array_ufunc__ = None
+
+    def __init__(self, blocks, charges, flows, charge=0, symmetry='U1',
+                 dtype=None):
+        self.symmetry = symmetry
+        self.modulus = _parse_symmetry(symmetry)
+        self.charges = tuple(_norm_charges(c, self.modulus) for c in charges)
+        self.flows = tuple(int(f) for f in flows)
+        self.charge = charge % self.modulus if self.modulus else charge
+        self.blocks = dict(blocks)
+
+        if dtype is None:
+            dtype = (np.result_type(*self.blocks.values()) if self.blocks else
+                     np.dtype(float))
+        self._dtype = np.dtype(dtype)
+
+        if len(self.flows) != len(self.charges):
+            raise ValueError("Need one flow per index, got {} flows for {} "
+                             "indices.".format(len(self.flows),
+                                               len(self.charges)))
+
+    # ------------------------------ creation ------------------------------- #
+
+    @classmethod
+    def from_dense(cls, x, charges, flows, charge=0, symmetry='U1', tol=None):
+        """Create a block-sparse array from the dense array ``x``.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            The dense array.
+        charges : sequence of sequence of int
+            For each index, the charge of each of its elements.
+        flows : sequence of {1, -1}
+            The flow of each index.
+        charge : int, optional
+            The total charge of the array.
+        symmetry : {'U1', 'Z2', 'Z3', ...}, optional
+            The symmetry group that the charges belong to.
+        tol : float, optional
+            If given, raise an error if the norm of the elements of ``x`` not
+            conserving ``charge``, and thus discarded, exceeds this.
+
+        Returns
+        -------
+        BlockSparseArray
+        """
+        x = np.asarray(x)
+        modulus = _parse_symmetry(symmetry)
+        charges = tuple(_norm_charges(c, modulus) for c in charges)
+        flows = tuple(flows)
+        charge = charge % modulus if modulus else charge
+
+        if x.shape != tuple(map(len, charges)):
+            raise ValueError("Shape {} doesn't match the charges given, "
+                             "{}.".format(x.shape, tuple(map(len, charges))))
+
+        sectors = [_sectors(c) for c in charges]
+        rest = x.copy() if tol is not None else None
+        blocks = {}
+        for key in _allowed_keys(charges, flows, charge, modulus):
+            locs = np.ix_(*(s[q] for s, q in zip(sectors, key)))
+            block = x[locs]
+            if np.any(block):
+                blocks[key] = block
+            if rest is not None:
+                rest[locs] = 0
+
+        if tol is not None:
+            lost = np.linalg.norm(rest)
+            if lost > tol:
+                raise ValueError("The array has elements with norm {} that "
+                                 "don't conserve charge {}."
+                                 "".format(lost, charge))
+
+        return cls(blocks, charges, flows, charge, symmetry, dtype=x.dtype)
+
+    @classmethod
+    def zeros(cls, charges, flows, charge=0, symmetry='U1', dtype=float):
+        """Create a block-sparse array with every allowed block present but
+        filled with zeros.
+        """
+        modulus = _parse_symmetry(symmetry)
+        charges = tuple(_norm_charges(c, modulus) for c in charges)
+        flows = tuple(flows)
+        charge = charge % modulus if modulus else charge
+
+        sectors = [_sectors(c) for c in charges]
+        blocks = {
+            key: np.zeros([s[q].size for s, q in zip(sectors, key)], dtype)
+            for key in _allowed_keys(charges, flows, charge, modulus)
+        }
+        return cls(blocks, charges, flows, charge, symmetry, dtype=dtype)
+
+    def _like(self, blocks, charges=None, flows=None, charge=None, dtype=None):
+        """Create a new array with the same symmetry as this one.
+        """
+        return BlockSparseArray(
+            blocks,
+            self.charges if charges is None else charges,
+            self.flows if flows is None else flows,
+            self.charge if charge is None else charge,
+            self.symmetry,
+            dtype=self._dtype if dtype is None else dtype)
+
+    # ----------------------------- properties ------------------------------ #
+
+    @property
+    def shape(self):
+        return tuple(map(len, self.charges))
+
+    @property
+    def ndim(self):
+        return len(self.charges)
+
+    @property
+    def size(self):
+        """The size of the equivalent dense array.
+        """
+        return int(np.prod(self.shape))
+
+    @property
+    def nnz(self):
+        """The number of elements actually stored.
+        """
+        return sum(block.size for block in self.blocks.values())
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def allowed_keys(self):
+        """All the keys of blocks that conserve the charge of this array,
+        whether present or not, in sorted order.
+        """
+        return _allowed_keys(self.charges, self.flows,
+                             self.charge, self.modulus)
+
+    def block_shape(self, key):
+        """The shape of the block with ``key``.
+        """
+        return tuple(_sectors(c)[q].size for c, q in zip(self.charges, key))
+
+    def __repr__(self):
+        return ("BlockSparseArray(shape={}, symmetry='{}', charge={}, "
+                "nblocks={}, nnz={})".format(self.shape, self.symmetry,
+                                             self.charge, len(self.blocks),
+                                             self.nnz))
+
+    # ------------------------------ operations ----------------------------- #
+
+    def to_dense(self):
+        """Convert this block-sparse array to a dense numpy array.
+        """
+        x = np.zeros(self.shape, dtype=self.dtype)
+        sectors = [_sectors(c) for c in self.charges]
+        for key, block in self.blocks.items():
+            x[np.ix_(*(s[q] for s, q in zip(sectors, key)))] = block
+        return x
+
+    todense = to_dense
+
+    def copy(self):
+        return self._like({k: b.copy() for k, b in self.blocks.items()})
+
+    def astype(self, dtype):
+        return self._like({k: b.astype(dtype)
+                           for k, b in self.blocks.items()}, dtype=dtype)
+
+    def conj(self):
+        """Complex conjugate, which is also the 'dual' array - flows and the
+        total charge are reversed.
+        """
+        return self._like({k: b.conj() for k, b in self.blocks.items()},
+                          flows=tuple(-f for f in self.flows),
+                          charge=-self.charge)
+
+    def transpose(self, *axes):
+        if not axes:
+            axes = tuple(range(self.ndim - 1, -1, -1))
+        elif len(axes) == 1 and not isinstance(axes[0], int):
+            axes, = axes
+        return transpose(self, axes)
+
+    def reshape(self, *shape):
+        """Reshape this array, which is only possible if each new dimension
+        fuses a group of consecutive old dimensions - see :func:`fuse`. Since
+        this is ambiguous for size 1 dimensions, these are fused with the
+        group before them where possible.
+        """
+        if len(shape) == 1 and not isinstance(shape[0], int):
+            shape, = shape
+        shape = tuple(shape)
+
+        groups, i = [], 0
+        for n_after, d in zip(range(len(shape) - 1, -1, -1), shape):
+            group, size = [], 1
+            while (i < self.ndim) and (
+                    (not group) or (size < d) or
+                    # absorb singlets while leaving enough for later groups
+                    (self.shape[i] == 1 and self.ndim - i > n_after)):
+                group.append(i)
+                size *= self.shape[i]
+                i += 1
+            if (not group) or (size != d):
+                break
+            groups.append(group)
+
+        if (len(groups) != len(shape)) or (i != self.ndim):
+            raise NotImplementedError(
+                "Block-sparse arrays can only be reshaped by fusing "
+                "consecutive dimensions, can't go from {} to {}."
+                "".format(self.shape, shape))
+
+        return fuse(self, groups)
+
+    def norm(self):
+        """Frobenius norm of this array.
+        """
+        return sum(np.linalg.norm(b)**2 for b in self.blocks.values())**0.5
+
+    def _map_blocks(self, fn, dtype=None):
+        blocks = {k: fn(b) for k, b in self.blocks.items()}
+        if dtype is None:
+            dtype = (np.result_type(*blocks.values()) if blocks else
+                     self.dtype)
+        return self._like(blocks, dtype=dtype)
+
+    def __neg__(self):
+        return self._map_blocks(lambda b: -b)
+
+    def __abs__(self):
+        return self._map_blocks(abs)
+
+    def __pow__(self, other):
+        return self._map_blocks(lambda b: b**other)
+
+    def __mul__(self, other):
+        if not np.isscalar(other):
+            return NotImplemented
+        return self._map_blocks(lambda b: b * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if not np.isscalar(other):
+            return NotImplemented
+        return self._map_blocks(lambda b: b / other)
+
+    def _check_compatible(self, other):
+        if ((self.charges, self.flows, self.charge, self.symmetry) !=
+                (other.charges, other.flows, other.charge, other.symmetry)):
+            raise ValueError("Block-sparse arrays have different charges, "
+                             "flows or symmetry.")
+
+    def __add__(self, other):
+        if not isinstance(other, BlockSparseArray):
+            return NotImplemented
+        self._check_compatible(other)
+        blocks = dict(self.blocks)
+        for k, b in other.blocks.items():
+            blocks[k] = blocks[k] + b if k in blocks else b
+        return self._like(blocks, dtype=np.result_type(self.dtype,
+                                                       other.dtype))
+
+    def __sub__(self, other):
+        if not isinstance(other, BlockSparseArray):
+            return NotImplemented
+        return self + (-other)
+
+    def sum(self):
+        """Sum of all elements.
+        """
+        return sum((b.sum() for b in self.blocks.values()),
+                   self.dtype.type(0))
+
+    @property
+    def real(self):
+        return self._map_blocks(np.real)
+
+    @property
+    def imag(self):
+        return self._map_blocks(np.imag)
+
+
+# --------------------------------------------------------------------------- #
+#                     opt_einsum compatible backend functions                 #
+# --------------------------------------------------------------------------- #
+
+def transpose(x, axes):
+    """Permute the indices of the block-sparse array ``x``.
+    """
+    axes = tuple(axes)
+    return x._like(
+        {tuple(k[i] for i in axes): b.transpose(axes)
+         for k, b in x.blocks.items()},
+        charges=tuple(x.charges[i] for i in axes),
+        flows=tuple(x.flows[i] for i in axes))
+
+
+def fuse(x, groups):
+    """Fuse each group of consecutive indices of ``x`` into a single index,
+    with elements in row-major order as for :func:`numpy.reshape`. The fused
+    index takes the flow of the first index in its group, and each of its
+    elements the charge which conserves the combined charge of the group.
+
+    Parameters
+    ----------
+    x : BlockSparseArray
+        The array to fuse.
+    groups : sequence of sequence of int
+        Consecutive groups of axes covering all of ``x``, e.g.
+        ``[(0, 1), (2,), (3, 4)]``.
+
+    Returns
+    -------
+    BlockSparseArray
+    """
+    groups = tuple(map(tuple, groups))
+    if tuple(concat(groups)) != tuple(range(x.ndim)):
+        raise ValueError("Groups {} don't cover the indices of the array in "
+                         "order.".format(groups))
+
+    flows, charges, lookups = [], [], []
+    for g in groups:
+        f = x.flows[g[0]]
+        sub = [np.asarray(x.charges[i]) for i in g]
+        grids = np.meshgrid(*sub, indexing='ij', sparse=True)
+        fused = f * sum(x.flows[i] * q for i, q in zip(g, grids))
+        fused = fused + np.zeros(tuple(map(len, sub)), int)
+        if x.modulus:
+            fused %= x.modulus
+        flows.append(f)
+        charges.append(_norm_charges(fused.reshape(-1), x.modulus))
+
+        # map each element of the fused index to its position in its sector
+        position = np.empty(fused.size, int)
+        for q, where in _sectors(charges[-1]).items():
+            position[where] = np.arange(where.size)
+        lookups.append((g, fused, position.reshape(fused.shape)))
+
+    new = x._like({}, charges=tuple(charges), flows=tuple(flows))
+    blocks = {}
+    for key, block in x.blocks.items():
+        new_key, idxs = [], []
+        for g, fused, position in lookups:
+            locs = np.ix_(*(_sectors(x.charges[i])[key[i]] for i in g))
+            new_key.append(int(fused[locs].flat[0]))
+            idxs.append(position[locs].reshape(-1))
+        new_key = tuple(new_key)
+
+        if new_key not in blocks:
+            blocks[new_key] = np.zeros(new.block_shape(new_key), x.dtype)
+        blocks[new_key][np.ix_(*idxs)] = block.reshape(tuple(map(len, idxs)))
+
+    new.blocks = blocks
+    return new
+
+
+def _parse_axes(axes, ndim_a):
+    if isinstance(axes, int):
+        return tuple(range(ndim_a - axes, ndim_a)), tuple(range(axes))
+    axes_a, axes_b = axes
+    if isinstance(axes_a, int):
+        return (axes_a,), (axes_b,)
+    return tuple(axes_a), tuple(axes_b)
+
+
+def tensordot(a, b, axes=2):
+    """Contract the block-sparse arrays ``a`` and ``b`` like
+    :func:`numpy.tensordot`, block by block. Contracted indices must have the
+    same charges and opposite flows.
+    """
+    # scalars - e.g. dummy environment end pieces
+    if not isinstance(a, BlockSparseArray):
+        return np.asarray(a).item() * b
+    if not isinstance(b, BlockSparseArray):
+        return a * np.asarray(b).item()
+
+    if a.symmetry != b.symmetry:
+        raise ValueError("Can't contract arrays with symmetries '{}' and '{}'"
+                         ".".format(a.symmetry, b.symmetry))
+
+    axes_a, axes_b = _parse_axes(axes, a.ndim)
+
+    for i, j in zip(axes_a, axes_b):
+        if a.flows[i] != -b.flows[j]:
+            raise ValueError("Contracted indices must have opposite flows.")
+        if a.charges[i] != b.charges[j]:
+            raise ValueError("Contracted indices must have matching charges.")
+
+    free_a = tuple(i for i in range(a.ndim) if i not in axes_a)
+    free_b = tuple(j for j in range(b.ndim) if j not in axes_b)
+    dtype = np.result_type(a.dtype, b.dtype)
+
+    # group the blocks of b by their contracted charges
+    b_groups = {}
+    for kb, xb in b.blocks.items():
+        kc = tuple(kb[j] for j in axes_b)
+        b_groups.setdefault(kc, []).append((kb, xb))
+
+    blocks = {}
+    for ka, xa in a.blocks.items():
+        kc = tuple(ka[i] for i in axes_a)
+        for kb, xb in b_groups.get(kc, ()):
+            key = (*(ka[i] for i in free_a), *(kb[j] for j in free_b))
+            x = np.tensordot(xa, xb, (axes_a, axes_b))
+            if key in blocks:
+                blocks[key] += x
+            else:
+                blocks[key] = x
+
+    if not (free_a or free_b):
+        return blocks.get((), dtype.type(0))
+
+    return BlockSparseArray(
+        blocks,
+        charges=(*(a.charges[i] for i in free_a),
+                 *(b.charges[j] for j in free_b)),
+        flows=(*(a.flows[i] for i in free_a), *(b.flows[j] for j in free_b)),
+        charge=a.charge + b.charge,
+        symmetry=a.symmetry,
+        dtype=dtype)
+
+
+def einsum(eq, *operands):
+    """Einsum for block-sparse arrays, limited to permutations of a single
+    array and contractions of pairs of arrays that each index appears once in.
+    """
+    lhs, out = eq.split('->')
+    terms = lhs.split(',')
+
+    if len(terms) == 1:
+        term, = terms
+        if (len(set(term)) == len(term)) and (sorted(term) == sorted(out)):
+            return transpose(operands[0], tuple(map(term.index, out)))
+
+    elif len(terms) == 2:
+        ta, tb = terms
+        shared = set(ta) & set(tb)
+        if ((len(set(ta)) == len(ta)) and (len(set(tb)) == len(tb)) and
+                (set(ta) ^ set(tb) == set(out))):
+            axes = (tuple(map(ta.index, shared)), tuple(map(tb.index, shared)))
+            x = tensordot(*operands, axes=axes)
+
+            current = [ix for ix in ta + tb if ix not in shared]
+            if (not out) or (current == list(out)):
+                return x
+            return transpose(x, tuple(map(current.index, out)))
+
+    raise NotImplementedError("Block-sparse ``einsum`` only supports "
+                              "permutations and pairwise contractions, got "
+                              "'{}'.".format(eq))
+
+
+def _vector_layout(like):
+    keys = like.allowed_keys()
+    shapes = tuple(map(like.block_shape, keys))
+    offsets = tuple(itertools.accumulate(
+        (0, *(int(np.prod(s)) for s in shapes))))
+    return keys, shapes, offsets
+
+
+def to_vector(x, like=None):
+    """Flatten every symmetry allowed block of ``x`` - zeros if missing - into
+    a single vector, so that it can be used with e.g. iterative solvers. The
+    blocks, and their order, are those of ``like``, if given.
+    """
+    keys, _, offsets = _vector_layout(x if like is None else like)
+    vec = np.zeros(offsets[-1], dtype=x.dtype)
+    for k, i, j in zip(keys, offsets, offsets[1:]):
+        if k in x.blocks:
+            vec[i:j] = x.blocks[k].reshape(-1)
+    return vec
+
+
+def from_vector(vec, like):
+    """Inverse of :func:`to_vector` - create a block-sparse array with the
+    same structure as ``like`` from the vector ``vec``.
+    """
+    vec = np.asarray(vec).reshape(-1)
+    keys, shapes, offsets = _vector_layout(like)
+    blocks = {k: vec[i:j].reshape(s) for k, s, i, j in
+              zip(keys, shapes, offsets, offsets[1:])}
+    return like._like(blocks, dtype=vec.dtype)
+
+
+# --------------------------------------------------------------------------- #
+#                              Decompositions                                 #
+# --------------------------------------------------------------------------- #
+
+def _sector_matrices(x, n_left):
+    """Group the blocks of ``x`` by the charge of a bond between its first
+    ``n_left`` indices and the rest, and build the dense matrix of each such
+    sector, along with the information needed to split it back into blocks.
+    """
+    lflows = x.flows[:n_left]
+
+    # group keys by the charge of the new bond they map to
+    sectors = {}
+    for key in x.blocks:
+        q = _fuse(key[:n_left], lflows, x.modulus)
+        lks, rks = sectors.setdefault(q, ({}, {}))
+        lks.setdefault(key[:n_left], None)
+        rks.setdefault(key[n_left:], None)
+
+    matrices = {}
+    for q, (lks, rks) in sorted(sectors.items()):
+        lks, rks = sorted(lks), sorted(rks)
+        lshapes = [x.block_shape(k + rks[0])[:n_left] for k in lks]
+        rshapes = [x.block_shape(lks[0] + k)[n_left:] for k in rks]
+        lsizes = [int(np.prod(s)) for s in lshapes]
+        rsizes = [int(np.prod(s)) for s in rshapes]
+        loffs, roffs = np.cumsum([0, *lsizes]), np.cumsum([0, *rsizes])
+
+        M = np.zeros((loffs[-1], roffs[-1]), dtype=x.dtype)
+        for i, lk in enumerate(lks):
+            for j, rk in enumerate(rks):
+                block = x.blocks.get(lk + rk, None)
+                if block is not None:
+                    M[loffs[i]:loffs[i + 1], roffs[j]:roffs[j + 1]] = \
+                        block.reshape(lsizes[i], rsizes[j])
+
+        matrices[q] = (M, lks, rks, lshapes, rshapes, loffs, roffs)
+
+    return matrices
+
+
+def singular_values(x, n_left):
+    """Find the singular values of the block-sparse array ``x``, with its
+    first ``n_left`` indices grouped as rows, in descending order.
+    """
+    svals = [np.linalg.svd(M, compute_uv=False) for M, *_ in
+             _sector_matrices(x, n_left).values()]
+    if not svals:
+        return np.zeros(1)
+    return np.sort(np.concatenate(svals))[::-1]
+
+
+def split(x, n_left, method='svd', cutoff=-1.0, cutoff_mode=3, max_bond=-1,
+          absorb=0):
+    """Decompose the block-sparse array ``x``, with its first ``n_left``
+    indices grouped as rows, as ``left @ right``. The matrix is block diagonal
+    in the charge of the new bond, so each sector is decomposed separately,
+    but singular values are truncated globally, as for a dense SVD.
+
+    Parameters
+    ----------
+    x : BlockSparseArray
+        The array to split.
+    n_left : int
+        How many of the leading indices to group as the rows.
+    method : {'svd', 'qr', 'lq'}, optional
+        How to decompose each sector. Any other method is treated as 'svd'.
+    cutoff, cutoff_mode, max_bond, absorb
+        Truncation options, with the same numeric convention as the dense
+        functions in :mod:`quimb.tensor.decomp`.
+
+    Returns
+    -------
+    left, right : BlockSparseArray
+        The new bond is the last index of ``left``, with flow ``-1``, and the
+        first of ``right``, with flow ``1``.
+    """
+    lflows, rflows = x.flows[:n_left], x.flows[n_left:]
+
+    decomps = {}
+    for q, (M, *layout) in _sector_matrices(x, n_left).items():
+        if method == 'qr':
+            U, V = np.linalg.qr(M)
+            s = None
+        elif method == 'lq':
+            V, U = np.linalg.qr(M.T)
+            U, V, s = U.T, V.T, None
+        else:
+            U, s, V = np.linalg.svd(M, full_matrices=False)
+
+        decomps[q] = (U, s, V, *layout)
+
+    # find how many singular values to keep from each sector
+    if method in ('qr', 'lq'):
+        keep = {q: d[0].shape[1] for q, d in decomps.items()}
+    else:
+        keep = _global_truncation({q: d[1] for q, d in decomps.items()},
+                                  cutoff, cutoff_mode, max_bond)
+
+    bond = []
+    lblocks, rblocks = {}, {}
+    for q, (U, s, V, lks, rks, lshapes, rshapes, loffs, roffs) in \
+            decomps.items():
+        k = keep[q]
+        if k == 0:
+            continue
+
+        U, V = U[:, :k], V[:k, :]
+        if s is not None:
+            s, norm = s[:k], keep['norm']
+            s = s * norm
+            if absorb == -1:
+                U = U * s.reshape((1, -1))
+            elif absorb == 1:
+                V = V * s.reshape((-1, 1))
+            else:
+                s = s**0.5
+                U = U * s.reshape((1, -1))
+                V = V * s.reshape((-1, 1))
+
+        bond.extend([q] * k)
+        for i, lk in enumerate(lks):
+            lblocks[(*lk, q)] = U[loffs[i]:loffs[i + 1], :].reshape(
+                (*lshapes[i], k))
+        for j, rk in enumerate(rks):
+            rblocks[(q, *rk)] = V[:, roffs[j]:roffs[j + 1]].reshape(
+                (k, *rshapes[j]))
+
+    if not bond:
+        # all zero array
+        bond = [0]
+
+    bond = tuple(bond)
+    left = x._like(lblocks, charges=(*x.charges[:n_left], bond),
+                   flows=(*lflows, -1), charge=0)
+    right = x._like(rblocks, charges=(bond, *x.charges[n_left:]),
+                    flows=(1, *rflows))
+    return left, right
+
+
+def _global_truncation(svals, cutoff, cutoff_mode, max_bond):
+    """Given the singular values ``svals`` of each sector, as a mapping, find
+    how many to keep in each, plus the overall renormalization, stored under
+    the key ``'norm'``.
+    """
+    keep = {q: s.size for q, s in svals.items()}
+    keep['norm'] = 1.0
+
+    if (cutoff <= 0.0) or (not svals):
+        return keep
+
+    qs = list(svals)
+    s_all = np.concatenate([svals[q] for q in qs]).astype(float)
+    owner = np.concatenate([np.full(svals[q].size, i) for i, q in
+                            enumerate(qs)])
+    order = np.argsort(-s_all, kind='stable')
+    s_all, owner = np.ascontiguousarray(s_all[order]), owner[order]
+
+    n_chi = _trim_singular_vals(s_all, cutoff, cutoff_mode)
+    if max_bond > 0:
+        n_chi = min(n_chi, max_bond)
+
+    if n_chi < s_all.size:
+        keep['norm'] = _renorm_singular_vals(s_all, n_chi)
+        counts = np.bincount(owner[:n_chi], minlength=len(qs))
+        keep.update(zip(qs, map(int, counts)))
+
+    return keep
+
+
+# --------------------------------------------------------------------------- #
+#                           Charge inference                                  #
+# --------------------------------------------------------------------------- #
+
+def split_charges(x, charges, flows, charge=0, symmetry='U1', tol=1e-14):
+    """Find charges for the single unknown index of ``x``, marked with ``None``
+    in ``charges``. Elements of that index which connect to more than one
+    charge are split into several, each with a definite charge, so that::
+
+        x == y.to_dense() @ expand
+
+    along the unknown index, where ``y`` is the returned block-sparse array.
+    Elements that are all zero are dropped.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        The dense array.
+    charges : sequence of (sequence of int or None)
+        The charges of each index, exactly one of which should be ``None``.
+    flows : sequence of {1, -1}
+        The flow of each index.
+    charge : int, optional
+        The total charge of the array.
+    symmetry : {'U1', 'Z2', 'Z3', ...}, optional
+        The symmetry group that the charges belong to.
+    tol : float, optional
+        Elements with absolute value less than this are treated as zero.
+
+    Returns
+    -------
+    y : BlockSparseArray
+        The block-sparse array, with the new unknown index.
+    expand : numpy.ndarray
+        The matrix mapping the new elements of the unknown index to the
+        original ones, of shape ``(new_dim, old_dim)``.
+    """
+    x = np.asarray(x)
+    modulus = _parse_symmetry(symmetry)
+    ax, = (i for i, c in enumerate(charges) if c is None)
+
+    # the charge each element would imply for the unknown index
+    known = [np.asarray(c) for c in charges if c is not None]
+    kflows = [f for c, f in zip(charges, flows) if c is not None]
+    grids = np.meshgrid(*known, indexing='ij', sparse=True)
+    implied = flows[ax] * (charge - sum(f * g for f, g in zip(kflows, grids)))
+    if modulus:
+        implied %= modulus
+
+    xt = np.moveaxis(x, ax, 0)
+    new_charges, new_slices, expand = [], [], []
+    for i, xi in enumerate(xt):
+        nonzero = np.abs(xi) > tol
+        for q in np.unique(implied[nonzero]) if nonzero.any() else ():
+            new_charges.append(int(q))
+            new_slices.append(np.where(nonzero & (implied == q), xi, 0.0))
+            expand.append(i)
+
+    if not new_charges:
+        # whole array is zero - keep a single element
+        new_charges.append(0)
+        new_slices.append(np.zeros_like(xt[0]))
+        expand.append(0)
+
+    xnew = np.moveaxis(np.stack(new_slices), 0, ax)
+    xnew = xnew.astype(np.result_type(x.dtype, xnew.dtype), copy=False)
+    charges = list(charges)
+    charges[ax] = new_charges
+
+    y = BlockSparseArray.from_dense(xnew, charges, flows, charge, symmetry)
+    E = np.zeros((len(expand), x.shape[ax]), dtype=x.dtype)
+    E[np.arange(len(expand)), expand] = 1
+    return y, E
+
+
+def infer_charge(x, charges, flows, symmetry='U1', tol=1e-14):
+    """Find the total charge of the dense array ``x``, given the charges of
+    all its indices. Raises an error if ``x`` has no definite charge.
+    """
+    x = np.asarray(x)
+    modulus = _parse_symmetry(symmetry)
+    grids = np.meshgrid(*map(np.asarray, charges), indexing='ij', sparse=True)
+    total = sum(f * g for f, g in zip(flows, grids)) + np.zeros(x.shape, int)
+    if modulus:
+        total %= modulus
+
+    qs = np.unique(total[np.abs(x) > tol])
+    if qs.size > 1:
+        raise ValueError("Array has elements with several different total "
+                         "charges: {}.".format(tuple(qs)))
+
+    return int(qs[0]) if qs.size else 0
@@ -1,5 +1,13 @@
 import math
+import functools
+import itertools
+import collections
+
+import numpy as np
+
 import quimb as qu
+from ..core import make_immutable
+from .tensor_core import Tensor, tensor_contract
 from .tensor_gen import MPS_computational_state
 
 
@@ -24,20 +32,62 @@ def parse_qasm(qasm, strip_round=False):
         - circuit_info['gates']: list[list[str]], list of gates, each of which
           is a list of strings read from a line of the qasm file.
     """
-    lns = qasm.split('\n')
-    n = int(lns[0])
-    gates = [l.split(" ") for l in lns[1:] if l]
+    info = parse_qasm_stream(qasm.split('\n'), strip_round=strip_round)
+    gates = list(info['gates'])
+    return {'n': info['n'], 'gates': gates, 'n_gates': len(gates)}
+
+
+def _gen_qasm_gates(lines, strip_round=False):
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line:
+            gate = line.split(" ")
+            yield gate[1:] if strip_round else gate
 
-    if strip_round:
-        gates = [g[1:] for g in gates]
 
-    return {'n': n, 'gates': gates, 'n_gates': len(gates)}
+def parse_qasm_stream(lines, strip_round=False):
+    """Lazily parse qasm from an iterable of lines, such as an open file.
+
+    Parameters
+    ----------
+    lines : iterable of str
+        The lines of the qasm, the first of which, giving the number of
+        qubits, is consumed immediately.
+    strip_round : bool, optional
+        If true, remove the first entry of each line,
+        assuming it to the the gate round.
+
+    Returns
+    -------
+    circuit_info : dict
+        Information about the circuit:
+
+        - circuit_info['n']: the number of qubits
+        - circuit_info['gates']: generator of list[str], yielding each gate
+          as it is parsed from the remaining lines.
+    """
+    lines = iter(lines)
+    n = int(next(lines))
+    return {'n': n, 'gates': _gen_qasm_gates(lines, strip_round)}
 
 
 def parse_qasm_file(fname, **kwargs):
     """Parse a qasm file.
     """
-    return parse_qasm(open(fname).read(), **kwargs)
+    with open(fname) as f:
+        return parse_qasm(f.read(), **kwargs)
+
+
+def _gen_file_lines(fname):
+    with open(fname) as f:
+        yield from f
+
+
+def parse_qasm_file_stream(fname, **kwargs):
+    """Lazily parse a qasm file, which is only read as the gates are
+    consumed, see :func:`~quimb.tensor.circuit.parse_qasm_stream`.
+    """
+    return parse_qasm_stream(_gen_file_lines(fname), **kwargs)
 
 
 def parse_qasm_url(url, **kwargs):
@@ -49,47 +99,244 @@ def parse_qasm_url(url, **kwargs):
 
 # -------------------------- core gate functions ---------------------------- #
 
-def build_gate_1(gate, tags=None):
+# gate id -> (tag, number of qubits, function of the parameters -> array)
+GATE_SPECS = {
+    'H': ('H', 1, qu.hadamard),
+    'CNOT': ('CNOT', 2, qu.CNOT),
+    'RX': ('RX', 1, qu.Rx),
+    'RY': ('RY', 1, qu.Ry),
+    'RZ': ('RZ', 1, qu.Rz),
+    'CX': ('CX', 2, qu.cX),
+    'CY': ('CY', 2, qu.cY),
+    'CZ': ('CZ', 2, qu.cZ),
+    'T': ('T', 1, qu.T_gate),
+    'X_1_2': ('X_1/2', 1, functools.partial(qu.Rx, math.pi / 2)),
+    'Y_1_2': ('Y_1/2', 1, functools.partial(qu.Ry, math.pi / 2)),
+}
 
-    def apply_gate(psi, i, **gate_opts):
-        psi.gate_(gate, int(i), tags=tags, **gate_opts)
 
-    return apply_gate
+def parse_gate(gate_id, *gate_args):
+    """Get the array, qubits acted on and tag of a gate.
 
+    Parameters
+    ----------
+    gate_id : str
+        Which type of gate, a key of ``GATE_SPECS``.
+    gate_args : list[str]
+        Its parameters, if any, followed by the qubits it acts on.
+
+    Returns
+    -------
+    G : array
+        The gate's array.
+    where : tuple[int]
+        The qubits it acts on.
+    tag : str
+        The gate's tag.
+    """
+    tag, num_qubits, _ = GATE_SPECS[gate_id.upper()]
+    params, where = gate_args[:-num_qubits], gate_args[-num_qubits:]
+    G = get_gate_array(gate_id, *params)
+    return G, tuple(map(int, where)), tag
+
+
+# gate id -> function of a batch of parameters -> array of gates
+BATCH_GATE_FNS = {
+    'RX': functools.partial(qu.rotations, xyz='X'),
+    'RY': functools.partial(qu.rotations, xyz='Y'),
+    'RZ': functools.partial(qu.rotations, xyz='Z'),
+}
+
+# the maximum number of gate arrays ``get_gate_array`` keeps
+GATE_CACHE_MAXSIZE = 4096
+
+_GATE_CACHE = collections.OrderedDict()
+
+
+def _cache_gate_array(key, G):
+    _GATE_CACHE[key] = G
+    _GATE_CACHE.move_to_end(key)
+    while len(_GATE_CACHE) > GATE_CACHE_MAXSIZE:
+        _GATE_CACHE.popitem(last=False)
 
-def build_gate_2(gate, tags=None):
 
-    def apply_gate(psi, i, j, **gate_opts):
-        psi.gate_(gate, (int(i), int(j)), tags=tags, **gate_opts)
+def get_gate_array(gate_id, *params):
+    """Get the array of gate ``gate_id`` with parameters ``params``. The
+    ``GATE_CACHE_MAXSIZE`` most recently used gates are cached, keyed on
+    their id and parameters, so the array is read-only.
+
+    Parameters
+    ----------
+    gate_id : str
+        Which type of gate, a key of ``GATE_SPECS``.
+    params : float
+        Its parameters, if any.
+
+    Returns
+    -------
+    G : numpy.ndarray
+    """
+    key = (gate_id.upper(), *map(float, params))
+    try:
+        G = _GATE_CACHE[key]
+        _GATE_CACHE.move_to_end(key)
+        return G
+    except KeyError:
+        pass
+
+    G = np.asarray(GATE_SPECS[key[0]][2](*key[1:]))
+    make_immutable(G)
+    _cache_gate_array(key, G)
+    return G
+
+
+def build_gate_arrays(gate_id, params):
+    """Construct the arrays of parametrized gate ``gate_id`` for a whole
+    batch of parameters at once, for example all the angles of a variational
+    circuit, adding each to the cache of
+    :func:`~quimb.tensor.circuit.get_gate_array`.
+
+    Parameters
+    ----------
+    gate_id : str
+        Which type of gate, a key of ``BATCH_GATE_FNS``.
+    params : array_like
+        The parameters of each gate.
+
+    Returns
+    -------
+    Gs : numpy.ndarray
+        The read-only array of gates, with shape ``(len(params), d, d)``.
+    """
+    gate_id = gate_id.upper()
+    params = np.asarray(params, dtype=float)
+    Gs = BATCH_GATE_FNS[gate_id](params)
+    make_immutable(Gs)
+
+    for p, G in zip(params.tolist(), Gs):
+        _cache_gate_array((gate_id, *np.atleast_1d(p).tolist()), G)
+
+    return Gs
+
+
+def _build_apply_gate(gate_id):
+
+    def apply_gate(psi, *gate_args, **gate_opts):
+        G, where, tag = parse_gate(gate_id, *gate_args)
+        psi.gate_(G, where, tags=tag, **gate_opts)
 
     return apply_gate
 
 
-def apply_Rx(psi, theta, i, **gate_opts):
-    psi.gate_(qu.Rx(float(theta)), int(i), tags='RX', **gate_opts)
+APPLY_GATES = {gate_id: _build_apply_gate(gate_id) for gate_id in GATE_SPECS}
 
+apply_Rx = APPLY_GATES['RX']
+apply_Ry = APPLY_GATES['RY']
+apply_Rz = APPLY_GATES['RZ']
 
-def apply_Ry(psi, theta, i, **gate_opts):
-    psi.gate_(qu.Ry(float(theta)), int(i), tags='RY', **gate_opts)
 
+def _embed_1q(G, k):
+    """Embed single qubit gate ``G`` as acting on qubit ``k`` of two.
+    """
+    return np.kron(G, np.eye(2)) if k == 0 else np.kron(np.eye(2), G)
 
-def apply_Rz(psi, theta, i, **gate_opts):
-    psi.gate_(qu.Rz(float(theta)), int(i), tags='RZ', **gate_opts)
 
+_SWAP = np.asarray(qu.swap())
 
-APPLY_GATES = {
-    'H': build_gate_1(qu.hadamard(), tags='H'),
-    'CNOT': build_gate_2(qu.CNOT(), tags='CNOT'),
-    'RZ': apply_Rx,
-    'RY': apply_Ry,
-    'RX': apply_Rz,
-    'CX': build_gate_2(qu.cX(), tags='CX'),
-    'CY': build_gate_2(qu.cY(), tags='CY'),
-    'CZ': build_gate_2(qu.cZ(), tags='CZ'),
-    'T': build_gate_1(qu.T_gate(), tags='T'),
-    'X_1_2': build_gate_1(qu.Rx(math.pi / 2), tags='X_1/2'),
-    'Y_1_2': build_gate_1(qu.Ry(math.pi / 2), tags='Y_1/2')
-}
+
+def fuse_gates(gates):
+    """Fuse a sequence of gates, each given as ``(G, where, tags)``, by
+    multiplying together every run of gates acting on the same one or two
+    qubits, including single qubit gates directly before or after a two
+    qubit gate on the same qubits. The fused gates act in the same order,
+    and two qubit gates are permuted to act on increasing qubits.
+
+    Parameters
+    ----------
+    gates : sequence of tuple
+        The gates, each with ``G`` its array, ``where`` the tuple of one or
+        two qubits it acts on, and ``tags`` a tag or sequence of tags.
+
+    Returns
+    -------
+    fused : list[tuple]
+        The fused gates, in the same format but with ``tags`` a tuple of the
+        tags of all the gates fused into each one.
+    """
+    # insertion ordered dict of id -> [G, where, tags], and, for each qubit,
+    # the id of the last block acting on it
+    blocks, last = {}, {}
+
+    for bid, (G, where, tags) in enumerate(gates):
+        G, where = np.asarray(G), tuple(where)
+        tags = (tags,) if isinstance(tags, str) else tuple(tags or ())
+
+        if len(where) == 1:
+            q, = where
+            if q in last:
+                # nothing since the last block on ``q`` touches ``q``
+                b = blocks[last[q]]
+                G = _embed_1q(G, b[1].index(q)) if len(b[1]) == 2 else G
+                b[0] = G @ b[0]
+                b[2] += tags
+                continue
+
+        else:
+            # always order the qubits of two qubit gates
+            if where[0] > where[1]:
+                G, where = _SWAP @ G @ _SWAP, where[::-1]
+
+            a, b = where
+            k = last.get(a)
+            if (k is not None) and (k == last.get(b)):
+                # both qubits last acted on by the same two qubit block
+                blk = blocks[k]
+                blk[0] = G @ blk[0]
+                blk[2] += tags
+                continue
+
+            # absorb the last single qubit blocks on either qubit
+            prev, ptags = np.eye(4), ()
+            for i, q in enumerate(where):
+                k = last.get(q)
+                if (k is not None) and (len(blocks[k][1]) == 1):
+                    Gq, _, tq = blocks.pop(k)
+                    prev = _embed_1q(Gq, i) @ prev
+                    ptags += tq
+            G, tags = G @ prev, ptags + tags
+
+        blocks[bid] = [G, where, tags]
+        for q in where:
+            last[q] = bid
+
+    return [tuple(b) for b in blocks.values()]
+
+
+def _contract(a, b):
+    """Contract two tensors, either of which may have become a scalar, or be
+    ``None``, standing for nothing.
+    """
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if isinstance(a, Tensor) and isinstance(b, Tensor):
+        return a @ b
+    return a * b
+
+
+def _project(t, bits):
+    """Project the tensor ``t`` into the basis states ``bits``, a dict
+    mapping some of its indices to values.
+    """
+    selector = tuple(bits.get(ix, slice(None)) for ix in t.inds)
+    inds = tuple(ix for ix in t.inds if ix not in bits)
+    return Tensor(t.data[selector], inds, tags=t.tags)
+
+
+# each gate tensor is tagged with the lowest qubit it acts on, which, unlike
+#     the site tags that propagate along the light cone, locates it
+GATE_COLUMN_TAG = '_COL{}'
 
 
 # --------------------------- main circuit class ---------------------------- #
@@ -110,14 +357,30 @@ class Circuit:
         Tag(s) to add to the initial wavefunction tensors (whether these are
         propagated to the rest of the circuit's tensors depends on
         ``gate_opts``).
+    lazy : bool, optional
+        If true, gates are only recorded as they are applied, then, once the
+        state is needed, runs of gates acting on the same qubits are fused
+        with :func:`~quimb.tensor.circuit.fuse_gates` and the fused gates
+        applied in one pass. This greatly reduces the number of gates, and
+        thus tensors, for long circuits.
+    lazy_chunk_size : int, optional
+        In lazy mode, fuse and apply the pending gates every time this many
+        have been recorded, bounding the memory they use.
+    record_gates : bool, optional
+        Whether to keep the list of every gate applied, as ``gates``. Turn
+        this off for very long circuits, e.g. streamed from a file, so that
+        the memory used does not grow with the number of gates.
 
     Attributes
     ----------
     psi : TensorNetwork1DVector
         The current wavefunction.
+    gates : list[tuple]
+        The gates applied, if ``record_gates`` is true.
     """
 
-    def __init__(self, N=None, psi0=None, gate_opts=None, tags=None):
+    def __init__(self, N=None, psi0=None, gate_opts=None, tags=None,
+                 lazy=False, lazy_chunk_size=4096, record_gates=True):
 
         if N is None and psi0 is None:
             raise ValueError("You must supply one of `N` or `psi0`.")
@@ -144,6 +407,11 @@ class Circuit:
 
         self.gate_opts = {} if gate_opts is None else dict(gate_opts)
         self.gates = []
+        self.record_gates = record_gates
+        self.lazy = lazy
+        self.lazy_chunk_size = lazy_chunk_size
+        self._pending_gates = []
+        self._columns = None
 
     @classmethod
     def from_qasm(cls, qasm, strip_round=False, **quantum_circuit_opts):
@@ -155,12 +423,33 @@ class Circuit:
         return qc
 
     @classmethod
-    def from_qasm_file(cls, fname, strip_round=False, **quantum_circuit_opts):
-        """Generate a ``Circuit`` instance from a qasm file.
+    def from_qasm_file(cls, fname, strip_round=False, progbar=False,
+                       **quantum_circuit_opts):
+        """Generate a ``Circuit`` instance from a qasm file. The file is
+        streamed, each gate being applied as soon as it is parsed, so that
+        neither the file nor its list of gates are ever held in memory, as
+        long as ``record_gates=False`` is also given.
+
+        Parameters
+        ----------
+        fname : str
+            The qasm file.
+        strip_round : bool, optional
+            If true, remove the first entry of each line,
+            assuming it to the the gate round.
+        progbar : bool, optional
+            Whether to show the progress, in number of gates applied.
+        quantum_circuit_opts
+            Supplied to :class:`~quimb.tensor.circuit.Circuit`.
         """
-        info = parse_qasm_file(fname, strip_round=strip_round)
+        info = parse_qasm_file_stream(fname, strip_round=strip_round)
         qc = Circuit(info['n'], **quantum_circuit_opts)
-        qc.apply_circuit(info['gates'])
+
+        gates = info['gates']
+        if progbar:
+            gates = qu.utils.progbar(gates, unit='gates')
+
+        qc.apply_circuit(gates)
         return qc
 
     @classmethod
@@ -182,9 +471,23 @@ class Circuit:
         gate_args : list[str]
             The argument to supply to it.
         """
-        apply_fn = APPLY_GATES[gate_id.upper()]
-        apply_fn(self._psi, *gate_args, **self.gate_opts)
-        self.gates.append((gate_id, *gate_args))
+        G, where, tag = parse_gate(gate_id, *gate_args)
+        if self.lazy:
+            self._pending_gates.append((G, where, tag))
+            if len(self._pending_gates) >= self.lazy_chunk_size:
+                self._apply_pending_gates()
+        else:
+            self._gate_psi(G, where, (tag,))
+
+        if self.record_gates:
+            self.gates.append((gate_id, *gate_args))
+        self._columns = None
+
+    def _gate_psi(self, G, where, tags):
+        """Apply the gate array ``G`` to the qubits ``where`` of the state.
+        """
+        tags = (*tags, GATE_COLUMN_TAG.format(min(where)))
+        self._psi.gate_(G, where, tags=tags, **self.gate_opts)
 
     def apply_circuit(self, gates):
         """Apply a sequence of gates to this tensor network quantum circuit.
@@ -197,8 +500,139 @@ class Circuit:
         for gate in gates:
             self.apply_gate(*gate)
 
+        if not self.lazy:
+            self._psi.squeeze_()
+
+    def _apply_pending_gates(self):
+        """Fuse then apply all the gates recorded in lazy mode.
+        """
+        if not self._pending_gates:
+            return
+
+        for G, where, tags in fuse_gates(self._pending_gates):
+            self._gate_psi(G, where, tags)
+
+        self._pending_gates = []
         self._psi.squeeze_()
 
     @property
     def psi(self):
+        self._apply_pending_gates()
         return self._psi.copy()
+
+    def _get_columns(self):
+        """Group the tensors of the final state into one column per qubit,
+        each gate by the lowest qubit it acts on (see ``GATE_COLUMN_TAG``),
+        and the remaining tensors of the initial state by their site. Since
+        the final gates on several qubits can share a column, each column is
+        given as its tensors, the qubits whose output index it has and a
+        cache of its contractions projected into each basis state of them,
+        the whole lot being cached until the next gate is applied.
+        """
+        if self._columns is not None:
+            return self._columns
+
+        self._apply_pending_gates()
+        psi = self._psi
+        tag_cols = {GATE_COLUMN_TAG.format(i): i for i in range(self.N)}
+        site_tags = {psi.site_tag(i): i for i in range(self.N)}
+
+        groups = [[] for _ in range(self.N)]
+        for t in psi:
+            cols = [tag_cols[tag] for tag in t.tags if tag in tag_cols]
+            if not cols:
+                cols = [site_tags[tag] for tag in t.tags if tag in site_tags]
+            groups[min(cols)].append(t)
+
+        self._columns = []
+        for ts in groups:
+            inds = {ix for t in ts for ix in t.inds}
+            sites = tuple(i for i in range(self.N)
+                          if psi.site_ind(i) in inds)
+            self._columns.append((ts, sites, {}))
+
+        return self._columns
+
+    def _get_projected_column(self, c, bits):
+        """Get column ``c`` contracted after projecting the output indices of
+        its qubits into ``bits``, or ``None`` if it has no tensors.
+        """
+        ts, sites, projections = self._columns[c]
+        try:
+            return projections[bits]
+        except KeyError:
+            pass
+
+        if ts:
+            selectors = {self._psi.site_ind(i): b for i, b in zip(sites, bits)}
+            C = tensor_contract(*(_project(t, selectors) for t in ts))
+        else:
+            C = None
+
+        projections[bits] = C
+        return C
+
+    def amplitudes(self, bitstrings):
+        """Compute the amplitudes of the final state of the circuit for a
+        batch of bitstrings, without forming the whole state. The tensors
+        of the circuit are grouped into a column per qubit, each of which is
+        contracted once for every projection of its output indices needed,
+        and kept until another gate is applied. The projected columns of each
+        bitstring are then contracted from either end to the middle, the
+        partial contractions of any shared prefixes and suffixes being
+        computed only once.
+
+        Parameters
+        ----------
+        bitstrings : sequence of str or sequence of sequence of int
+            The bitstrings, e.g. ``['0110', '1011']`` or an integer array of
+            shape ``(batch, N)``.
+
+        Returns
+        -------
+        amps : numpy.ndarray
+            The amplitude of each bitstring.
+        """
+        bitstrings = [tuple(map(int, b)) for b in bitstrings]
+        if any(len(b) != self.N for b in bitstrings):
+            raise ValueError("Each bitstring should have length {}."
+                             .format(self.N))
+
+        columns = self._get_columns()
+        m = self.N // 2
+
+        # cache of the contractions of the left and right columns, keyed by
+        # the bits of the qubits of each column
+        lefts, rights = {(): None}, {(): None}
+
+        def get_left(key):
+            try:
+                return lefts[key]
+            except KeyError:
+                L = get_left(key[:-1])
+                C = self._get_projected_column(len(key) - 1, key[-1])
+                L = lefts[key] = _contract(L, C)
+                return L
+
+        def get_right(key):
+            try:
+                return rights[key]
+            except KeyError:
+                R = get_right(key[1:])
+                C = self._get_projected_column(self.N - len(key), key[0])
+                R = rights[key] = _contract(C, R)
+                return R
+
+        amps = np.empty(len(bitstrings), dtype=complex)
+        for k, b in enumerate(bitstrings):
+            key = tuple(tuple(b[i] for i in sites) for _, sites, _ in columns)
+            amp = _contract(get_left(key[:m]), get_right(key[m:]))
+            amps[k] = amp.data if isinstance(amp, Tensor) else amp
+
+        return amps
+
+    def amplitude(self, bitstring):
+        """Compute the amplitude of the final state of the circuit for a
+        single bitstring, see :meth:`~quimb.tensor.circuit.Circuit.amplitudes`.
+        """
+        return self.amplitudes([bitstring])[0]
@@ -342,3 +342,214 @@ def _lq(x):
     """
     Q, L = np.linalg.qr(x.T)
     return L.T, Q.T
+
+
+# --------------------------------------------------------------------------- #
+#                     Decompositions of non-numpy arrays                      #
+# --------------------------------------------------------------------------- #
+
+def _to_numpy(x):
+    """Convert a non-numpy array, e.g. from ``sparse`` or ``dask``, to a dense
+    numpy array.
+    """
+    for meth in ('todense', 'compute'):
+        if hasattr(x, meth):
+            return np.asarray(getattr(x, meth)())
+    return np.asarray(x)
+
+
+def _trim_and_renorm_SVD_generic(U, s, V, cutoff, cutoff_mode, max_bond,
+                                 absorb):
+    """Like ``_trim_and_renorm_SVD``, but with ``U`` and ``V`` any arrays that
+    support slicing and broadcasting, such as lazy dask arrays - only the
+    singular values ``s`` need be an actual numpy array.
+    """
+    if cutoff > 0.0:
+        n_chi = _trim_singular_vals(s, cutoff, cutoff_mode)
+
+        if max_bond > 0:
+            n_chi = min(n_chi, max_bond)
+
+        if n_chi < s.size:
+            norm = _renorm_singular_vals(s, n_chi)
+            s = s[:n_chi] * norm
+            U = U[:, :n_chi]
+            V = V[:n_chi, :]
+
+    if absorb == -1:
+        U = U * s.reshape((1, -1))
+    elif absorb == 1:
+        V = V * s.reshape((-1, 1))
+    else:
+        s = s**0.5
+        U = U * s.reshape((1, -1))
+        V = V * s.reshape((-1, 1))
+
+    return U, V
+
+
+def _check_truncated_k(x, max_bond, backend):
+    """Check that a truncated decomposition of the ``backend`` array ``x`` can
+    be performed without densifying it, and return the number of singular
+    values to find.
+    """
+    d = min(x.shape)
+    if not 0 < max_bond < d:
+        raise ValueError(
+            "Truncated decompositions of {} arrays need ``max_bond`` to be "
+            "given and less than {}, got {}.".format(backend, d, max_bond))
+    return max_bond
+
+
+def _svd_dask(x, cutoff=-1.0, cutoff_mode=3, max_bond=-1, absorb=0):
+    """SVD-decomposition of a dask array. The factors are computed together
+    and persisted, so that the singular values are available to find the new
+    bond dimension without running the decomposition again for ``U`` and
+    ``V``, which remain (chunked) dask arrays.
+    """
+    import dask
+    import dask.array as da
+
+    if x.shape[0] < x.shape[1]:
+        # dask only supports tall-and-skinny SVD -> decompose the transpose
+        Vt, Ut = _svd_dask(x.T, cutoff, cutoff_mode, max_bond, -absorb)
+        return Ut.T, Vt.T
+
+    U, s, V = dask.persist(*da.linalg.svd(x.rechunk({1: -1})))
+    s = np.ascontiguousarray(s.compute())
+    return _trim_and_renorm_SVD_generic(U, s, V, cutoff, cutoff_mode,
+                                        max_bond, absorb)
+
+
+def _svds_dask(x, cutoff=0.0, cutoff_mode=2, max_bond=-1, absorb=0):
+    """Truncated SVD-decomposition of a dask array, using the randomized
+    ``dask.array.linalg.svd_compressed``, which needs ``max_bond`` to be
+    given.
+    """
+    import dask
+    import dask.array as da
+
+    k = _check_truncated_k(x, max_bond, 'dask')
+    U, s, V = dask.persist(*da.linalg.svd_compressed(x, k))
+    s = np.ascontiguousarray(s.compute())
+    return _trim_and_renorm_SVD_generic(U, s, V, cutoff, cutoff_mode,
+                                        max_bond, absorb)
+
+
+def _qr_dask(x):
+    """QR-decomposition of a dask array.
+    """
+    import dask.array as da
+
+    if x.shape[0] < x.shape[1]:
+        # dask only supports tall-and-skinny QR -> decompose the square left
+        # block, then ``R`` is just ``Q^H x`` which can stay lazy
+        m = x.shape[0]
+        Q, _ = da.linalg.qr(x[:, :m].rechunk({0: -1, 1: -1}))
+        return Q, Q.conj().T @ x
+
+    return da.linalg.qr(x.rechunk({1: -1}))
+
+
+def _lq_dask(x):
+    """LQ-decomposition of a dask array.
+    """
+    Q, L = _qr_dask(x.T)
+    return L.T, Q.T
+
+
+_DASK_DECOMPS = {
+    'svd': _svd_dask,
+    'svds': _svds_dask,
+    'isvd': _svds_dask,
+    'rsvd': _svds_dask,
+    'qr': _qr_dask,
+    'lq': _lq_dask,
+}
+
+
+def _svds_sparse(x, cutoff=0.0, cutoff_mode=2, max_bond=-1, absorb=0):
+    """Truncated SVD-decomposition of a sparse matrix with
+    ``scipy.sparse.linalg.svds``, which needs ``max_bond`` to be given. The
+    factors returned are dense.
+    """
+    k = _check_truncated_k(x, max_bond, 'sparse')
+    U, s, V = spla.svds(x, k=k)
+    # make sure largest singular value first
+    U, s, V = U[:, ::-1], np.ascontiguousarray(s[::-1]), V[::-1, :]
+    return _trim_and_renorm_SVD_generic(U, s, V, cutoff, cutoff_mode,
+                                        max_bond, absorb)
+
+
+def _eigsh_sparse(x, cutoff=0.0, cutoff_mode=2, max_bond=-1, absorb=0):
+    """Truncated SVD-decomposition of a hermitian sparse matrix with
+    ``scipy.sparse.linalg.eigsh``, which needs ``max_bond`` to be given. The
+    factors returned are dense.
+    """
+    k = _check_truncated_k(x, max_bond, 'sparse')
+    s, U = spla.eigsh(x, k=k, which='LM')
+    # make sure largest singular value first
+    ix = np.argsort(-np.abs(s))
+    s, U = s[ix], U[:, ix]
+    V = np.sign(s).reshape(-1, 1) * dag(U)
+    s = np.ascontiguousarray(np.abs(s))
+    return _trim_and_renorm_SVD_generic(U, s, V, cutoff, cutoff_mode,
+                                        max_bond, absorb)
+
+
+_SPARSE_DECOMPS = {
+    'svds': _svds_sparse,
+    'eigsh': _eigsh_sparse,
+}
+
+
+def _decomp_generic(fn, method, x, **opts):
+    """Perform the decomposition ``method`` (with numpy implementation ``fn``)
+    on the non-numpy array ``x``. Dask arrays are decomposed natively with
+    the methods in ``_DASK_DECOMPS``, and ``sparse`` arrays with the
+    truncated methods in ``_SPARSE_DECOMPS``, other methods raise an error
+    rather than silently densifying the array. Any other array, e.g. from
+    ``cupy``, is converted to numpy first.
+    """
+    backend = x.__class__.__module__.split('.')[0]
+
+    if backend == 'dask':
+        decomps = _DASK_DECOMPS
+    elif backend == 'sparse':
+        decomps = _SPARSE_DECOMPS
+    else:
+        return fn(_to_numpy(x), **opts)
+
+    if method not in decomps:
+        raise NotImplementedError(
+            "The '{}' decomposition of {} arrays is not supported, use one of "
+            "{} or convert the array to dense first."
+            "".format(method, backend, tuple(decomps)))
+
+    if backend == 'sparse':
+        x = x.tocsr()
+
+    return decomps[method](x, **opts)
+
+
+def _svdvals_generic(method, x):
+    """Find the singular values of the non-numpy array ``x`` using ``method``,
+    natively for dask arrays with 'svd'. Since all of them are needed, sparse
+    arrays are not supported.
+    """
+    backend = x.__class__.__module__.split('.')[0]
+
+    if backend == 'dask' and method == 'svd':
+        import dask.array as da
+
+        if x.shape[0] < x.shape[1]:
+            x = x.T
+        return np.asarray(da.linalg.svd(x.rechunk({1: -1}))[1])
+
+    if backend in ('dask', 'sparse'):
+        raise NotImplementedError(
+            "Finding the singular values of {} arrays with '{}' is not "
+            "supported, convert the array to dense first."
+            "".format(backend, method))
+
+    return {'svd': _svdvals, 'eig': _svdvals_eig}[method](_to_numpy(x))
@@ -1,8 +1,10 @@
 """Classes and algorithms related to 1D tensor networks.
 """
 
+import os
 import re
 import functools
+import tempfile
 from math import log2
 from numbers import Integral
 
@@ -21,6 +23,7 @@ from .tensor_core import (
     _asarray,
     _ndim,
 )
+from . import block_sparse
 
 
 def align_TN_1D(*tns, ind_ids=None, inplace=False):
@@ -831,6 +834,62 @@ class TensorNetwork1DFlat:
 
         return tn
 
+    def _to_block_sparse(self, phys_charges, charge, symmetry, inplace):
+        """Convert the data of this 1D TN to block-sparse arrays, inferring
+        the charges of each bond from the sparsity of the tensors by sweeping
+        from left to right. Bond elements that would carry several charges are
+        split into one element per charge, with the corresponding rows of
+        the next tensor repeated, so that the TN represents the same object.
+        """
+        tn = self if inplace else self.copy()
+
+        if tn.cyclic:
+            raise NotImplementedError("Only open boundary 1D tensor networks "
+                                      "can be converted to block-sparse form.")
+
+        phys_charges = tuple(phys_charges)
+        sites = tuple(tn.sites)
+        bond_charges = expand = None
+
+        for n, i in enumerate(sites):
+            T = tn[i]
+            phys_flows = tn._block_sparse_phys_flows(i)
+            lix = tn.bond(sites[n - 1], i) if n > 0 else None
+            rix = tn.bond(i, sites[n + 1]) if n < len(sites) - 1 else None
+
+            data = np.asarray(T.data)
+            if expand is not None:
+                # absorb any bond elements split by the previous site
+                ax = T.inds.index(lix)
+                data = np.moveaxis(np.tensordot(expand, data, (1, ax)), 0, ax)
+
+            charges, flows = [], []
+            for ix in T.inds:
+                if ix in phys_flows:
+                    charges.append(phys_charges)
+                    flows.append(phys_flows[ix])
+                elif ix == lix:
+                    charges.append(bond_charges)
+                    flows.append(1)
+                else:
+                    charges.append(None)
+                    flows.append(-1)
+
+            if rix is not None:
+                data, expand = block_sparse.split_charges(
+                    data, charges, flows, symmetry=symmetry)
+                bond_charges = data.charges[T.inds.index(rix)]
+            else:
+                if charge is None:
+                    charge = block_sparse.infer_charge(data, charges, flows,
+                                                       symmetry=symmetry)
+                data = block_sparse.BlockSparseArray.from_dense(
+                    data, charges, flows, charge=charge, symmetry=symmetry)
+
+            T.modify(data=data)
+
+        return tn
+
     def singular_values(self, i, cur_orthog=None, method='svd'):
         r"""Find the singular values associated with the ith bond::
 
@@ -906,6 +965,10 @@ class TensorNetwork1DFlat:
                     (0, max(new_bond_dim - d, 0))
                     for d, i in zip(tensor.shape, tensor.inds)]
 
+            if not any(pad for _, pad in pads):
+                # already large enough -> leave the tensor untouched
+                continue
+
             if rand_strength > 0:
                 edata = np.pad(tensor.data, pads, mode=rand_padder,
                                rand_strength=rand_strength)
@@ -1200,6 +1263,46 @@ class MatrixProductState(TensorNetwork1DVector,
             setattr(other, p, getattr(self, p))
         other.__class__ = MatrixProductState
 
+    def _block_sparse_phys_flows(self, i):
+        return {self.site_ind(i): 1}
+
+    def to_block_sparse(self, phys_charges, charge=None, symmetry='U1',
+                        inplace=False):
+        """Convert this MPS to one with block-sparse data, see
+        :class:`~quimb.tensor.block_sparse.BlockSparseArray`, which only
+        stores and operates on the blocks allowed by an abelian symmetry. The
+        charges of the bonds are inferred from the current data.
+
+        Parameters
+        ----------
+        phys_charges : sequence of int
+            The charge of each physical basis state, e.g. ``[1, -1]`` for the
+            ``2 * Sz`` values of a spin-1/2.
+        charge : int, optional
+            The total charge of the state, e.g. ``2 * Sz`` of the whole chain.
+            If not given it is inferred, in which case the MPS must have a
+            definite charge already. Otherwise any components with other
+            charges are discarded.
+        symmetry : {'U1', 'Z2', 'Z3', ...}, optional
+            The symmetry group that the charges belong to.
+        inplace : bool, optional
+            Whether to perform the conversion in place.
+
+        Returns
+        -------
+        MatrixProductState
+
+        Examples
+        --------
+        Create a Neel state in the ``Sz == 0`` sector, to use as the initial
+        state of a DMRG solve with a U(1) symmetric MPO:
+
+            >>> p0 = MPS_neel_state(10).to_block_sparse([1, -1])
+        """
+        return self._to_block_sparse(phys_charges, charge, symmetry, inplace)
+
+    to_block_sparse_ = functools.partialmethod(to_block_sparse, inplace=True)
+
     def add_MPS(self, other, inplace=False, compress=False, **compress_opts):
         """Add another MatrixProductState to this one.
         """
@@ -1577,6 +1680,94 @@ class MatrixProductState(TensorNetwork1DVector,
 
         return S[0] - S[1]
 
+    def sample(self, C, seed=None, batch_size=4096, cur_orthog=None,
+               inplace=False):
+        r"""Perfectly sample ``C`` configurations from this MPS, in the
+        computational basis. A copy of the MPS (or the MPS itself if
+        ``inplace=True``) is canonized at site 0 just once, after which each
+        configuration is drawn site by site from the conditional single site
+        marginals::
+
+            v-o-<-<-<-<
+              | | | | |   ->  p(b_i | b_0 ... b_{i-1})
+            v-o-<-<-<-<
+
+        where ``v`` is the left environment projected into the bits already
+        drawn. All the samples of a batch are drawn at once.
+
+        Parameters
+        ----------
+        C : int
+            The number of configurations to draw.
+        seed : int or numpy.random.Generator, optional
+            A seed for, or instance of, the local random number generator to
+            draw from, the global random state is left untouched.
+        batch_size : int, optional
+            How many configurations to draw at once, bounding the memory
+            used to ``batch_size * max_bond * phys_dim``.
+        cur_orthog : int, optional
+            If given, the known current orthogonality center, to speed up the
+            canonization.
+        inplace : bool, optional
+            Whether to canonize this MPS in place, saving a copy, which is
+            cheap if sampling repeatedly with ``cur_orthog=0``.
+
+        Returns
+        -------
+        configs : numpy.ndarray
+            Integer array of shape ``(C, nsites)``, each row a configuration.
+        probs : numpy.ndarray
+            The probability of each configuration, with respect to the
+            normalized state.
+        """
+        if self.cyclic:
+            raise NotImplementedError("Sampling relies on canonization so "
+                                      "is only supported for OBC.")
+
+        psi = self if inplace else self.copy()
+        psi.canonize(0, cur_orthog)
+        N = psi.nsites
+        rng = np.random.default_rng(seed)
+
+        # site arrays as (left bond, physical, right bond)
+        arrays = []
+        for i in range(N):
+            inds = _lrp_inds(psi, i)
+            dl = psi[i].ind_size(inds[0]) if i > 0 else 1
+            dr = psi[i].ind_size(inds[-2]) if i < N - 1 else 1
+            A = psi[i].transpose(*inds).data.reshape(dl, dr, -1)
+            arrays.append(A.transpose(0, 2, 1))
+
+        configs = np.empty((C, N), dtype=int)
+        probs = np.empty(C)
+
+        for start in range(0, C, batch_size):
+            B = min(batch_size, C - start)
+            rows = np.arange(B)
+            v = np.ones((B, 1))
+            p = np.ones(B)
+
+            for i, A in enumerate(arrays):
+                dl, d, dr = A.shape
+                t = (v @ A.reshape(dl, d * dr)).reshape(B, d, dr)
+
+                # unnormalized conditional probability of each value
+                pi = np.sum(abs(t)**2, axis=2)
+                cdf = np.cumsum(pi, axis=1)
+                r = rng.random(B) * cdf[:, -1]
+                b = np.minimum(np.sum(r[:, None] > cdf, axis=1), d - 1)
+
+                pib = pi[rows, b]
+                p *= pib / cdf[:, -1]
+                v = t[rows, b, :] / pib[:, None]**0.5
+                configs[start:start + B, i] = b
+
+            probs[start:start + B] = p
+
+        return configs, probs
+
+    sample_ = functools.partialmethod(sample, inplace=True)
+
     def partial_trace(self, keep, upper_ind_id="b{}", rescale_sites=True):
         r"""Partially trace this matrix product state, producing a matrix
         product operator.
@@ -2364,6 +2555,38 @@ class MatrixProductOperator(TensorNetwork1DFlat,
         """
         return self.upper_ind_id.format(i)
 
+    def _block_sparse_phys_flows(self, i):
+        return {self.upper_ind(i): -1, self.lower_ind(i): 1}
+
+    def to_block_sparse(self, phys_charges, charge=0, symmetry='U1',
+                        inplace=False):
+        """Convert this MPO to one with block-sparse data, see
+        :class:`~quimb.tensor.block_sparse.BlockSparseArray`, which only
+        stores and operates on the blocks allowed by an abelian symmetry. The
+        charges of the bonds are inferred from the current data.
+
+        Parameters
+        ----------
+        phys_charges : sequence of int
+            The charge of each physical basis state, e.g. ``[1, -1]`` for the
+            ``2 * Sz`` values of a spin-1/2.
+        charge : int, optional
+            The total charge of the operator, by default ``0``, i.e. an
+            operator that conserves the symmetry. Any components with other
+            charges are discarded.
+        symmetry : {'U1', 'Z2', 'Z3', ...}, optional
+            The symmetry group that the charges belong to.
+        inplace : bool, optional
+            Whether to perform the conversion in place.
+
+        Returns
+        -------
+        MatrixProductOperator
+        """
+        return self._to_block_sparse(phys_charges, charge, symmetry, inplace)
+
+    to_block_sparse_ = functools.partialmethod(to_block_sparse, inplace=True)
+
     def add_MPO(self, other, inplace=False, compress=False, **compress_opts):
         """Add another MatrixProductState to this one.
         """
@@ -2696,3 +2919,90 @@ class Dense1D(TensorNetwork1DVector,
 
         super().__init__([T], structure=site_tag_id, sites=sites,
                          nsites=nsites, check_collisions=False, **tn_opts)
+
+
+# --------------------------------------------------------------------------- #
+#                                Checkpointing                                #
+# --------------------------------------------------------------------------- #
+
+def _lrp_inds(mps, i):
+    """The indices of site ``i`` of ``mps`` in 'lrp' order, i.e. left-bond,
+    right-bond, physical, with the end bonds dropped if not cyclic.
+    """
+    bnds = []
+    if (i > 0) or mps.cyclic:
+        bnds.append(mps.bond(i - 1, i))
+    if (i < mps.nsites - 1) or mps.cyclic:
+        bnds.append(mps.bond(i, i + 1))
+    return (*bnds, *(ix for ix in mps[i].inds if ix not in bnds))
+
+
+def _save_checkpoint(fname, mps, **data):
+    """Atomically save the site arrays of ``mps``, in 'lrp' order, along with
+    any other numeric ``data``, to ``fname`` in numpy's ``.npz`` format. The
+    file is written to a temporary file first then moved into place, so that
+    ``fname`` always holds a complete checkpoint.
+
+    Parameters
+    ----------
+    fname : str
+        The file to save to.
+    mps : MatrixProductState
+        The state to save.
+    data
+        Other arrays or scalars to save.
+
+    See Also
+    --------
+    _load_checkpoint
+    """
+    if any(isinstance(t.data, block_sparse.BlockSparseArray) for t in mps):
+        raise NotImplementedError("Can't checkpoint block-sparse states.")
+
+    arrays = {'site{}'.format(i): mps[i].transpose(*_lrp_inds(mps, i)).data
+              for i in range(mps.nsites)}
+
+    directory = os.path.dirname(os.path.abspath(fname))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, nsites=mps.nsites, **arrays, **data)
+        os.replace(tmp, fname)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _load_checkpoint(fname, mps=None):
+    """Load a checkpoint saved with :func:`_save_checkpoint`.
+
+    Parameters
+    ----------
+    fname : str
+        The file to load from.
+    mps : MatrixProductState, optional
+        If given, modify the site tensors of this state, inplace, to match
+        the saved state. It should have the same number of sites, but can
+        have any bond dimensions.
+
+    Returns
+    -------
+    arrays : list[numpy.ndarray]
+        The site arrays, in 'lrp' order.
+    data : dict
+        The other saved data.
+    """
+    with np.load(fname) as f:
+        data = dict(f.items())
+
+    n = int(data.pop('nsites'))
+    arrays = [data.pop('site{}'.format(i)) for i in range(n)]
+
+    if mps is not None:
+        if mps.nsites != n:
+            raise ValueError("The checkpoint in {} has {} sites, but the "
+                             "state has {}.".format(fname, n, mps.nsites))
+        for i, array in enumerate(arrays):
+            mps[i].modify(data=array, inds=_lrp_inds(mps, i))
+
+    return arrays, data
@@ -3,9 +3,13 @@
 import os
 import re
 import copy
+import json
 import uuid
 import math
 import string
+import hashlib
+import time
+import tempfile
 import weakref
 import operator
 import functools
@@ -19,15 +23,244 @@ import numpy as np
 import opt_einsum as oe
 import scipy.sparse.linalg as spla
 
-from ..core import qarray, prod, realify_scalar, vdot
+from ..core import qarray, prod, realify_item, vdot
 from ..linalg.base_linalg import norm_fro_dense
 from ..utils import functions_equal, has_cupy
 from . import decomp
+from . import block_sparse
+
+
+class ContractPathDiskCache:
+    """A persistent, on-disk, cache of contraction paths, so that separate
+    processes (e.g. many workers launched for the same DMRG/TEBD problem) can
+    skip the path search for contractions already seen. Each entry is keyed on
+    the contraction string, the shapes and any options, and stored as a small
+    JSON file in ``directory``. Files are written atomically so that several
+    processes can safely share the same directory.
+
+    Parameters
+    ----------
+    directory : str
+        Where to store the cached paths, created if it doesn't exist.
+    max_size : int, optional
+        The maximum total size in bytes of the cache. When exceeded, the least
+        recently used entries are evicted. Default: 64MB.
+    check_every : int, optional
+        The size of the directory is tracked by adding up the entries this
+        process writes, but other processes might also be writing to it, so
+        every ``check_every`` saves the directory is scanned to correct this.
+
+    Attributes
+    ----------
+    hits : int
+        The number of paths loaded from disk by this process.
+    misses : int
+        The number of paths that had to be searched for by this process.
+    evictions : int
+        The number of entries removed by this process to respect ``max_size``.
+    """
+
+    def __init__(self, directory, max_size=2**26, check_every=128):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = max_size
+        self.check_every = check_every
+        self._size_estimate = None
+        self._saves_since_check = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def _key(contract_str, shapes, kwargs):
+        opts = sorted((k, repr(v)) for k, v in kwargs.items())
+        raw = repr((contract_str, tuple(map(tuple, shapes)), opts))
+        return hashlib.sha1(raw.encode()).hexdigest(), raw
+
+    def _fname(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def load(self, contract_str, shapes, kwargs):
+        """Try and load the path for this contraction, returning ``None`` if
+        it is not in the cache.
+        """
+        key, raw = self._key(contract_str, shapes, kwargs)
+        fname = self._fname(key)
+        try:
+            with open(fname) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # missing, or concurrently evicted/corrupted -> treat as miss
+            return None
+
+        # guard against hash collisions
+        if entry.get('key') != raw:
+            return None
+
+        # mark as recently used for the LRU eviction
+        try:
+            os.utime(fname)
+        except OSError:
+            pass
+
+        return [tuple(c) for c in entry['path']]
+
+    def save(self, contract_str, shapes, kwargs, path):
+        """Atomically write the path for this contraction to the cache.
+        """
+        key, raw = self._key(contract_str, shapes, kwargs)
+        entry = json.dumps({'key': raw, 'path': [list(c) for c in path]})
+
+        # write to a unique temporary file then move into place
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(entry)
+            os.replace(tmp, self._fname(key))
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+
+        # only scan the whole directory if it might be too big, or if
+        #     other processes haven't been accounted for in a while
+        self._saves_since_check += 1
+        if self._size_estimate is not None:
+            self._size_estimate += len(entry)
+
+        if ((self._size_estimate is None) or
+                (self._size_estimate > self.max_size) or
+                (self._saves_since_check >= self.check_every)):
+            self._maybe_evict()
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                try:
+                    yield entry.path, entry.stat()
+                except OSError:
+                    pass
+
+    def size(self):
+        """The current total size, in bytes, of the cache on disk.
+        """
+        return sum(st.st_size for _, st in self._entries())
+
+    def _maybe_evict(self):
+        entries = tuple(self._entries())
+        total = sum(st.st_size for _, st in entries)
+
+        if total > self.max_size:
+            for fname, st in sorted(entries, key=lambda x: x[1].st_mtime):
+                if total <= self.max_size:
+                    break
+                try:
+                    os.remove(fname)
+                    self.evictions += 1
+                except OSError:
+                    # another process got there first
+                    pass
+                total -= st.st_size
+
+        self._size_estimate = total
+        self._saves_since_check = 0
+
+    def clear(self):
+        """Remove every entry from the cache directory.
+        """
+        for fname, _ in tuple(self._entries()):
+            try:
+                os.remove(fname)
+            except OSError:
+                pass
+        self._size_estimate = 0
+
+    def info(self):
+        """Get the hit/miss statistics of this cache.
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'size': self.size(),
+                'max_size': self.max_size, 'directory': self.directory}
+
+    def get_expression(self, contract_str, *shapes, **kwargs):
+        """Get the contraction expression, using the cached path if possible
+        and else finding the path and storing it.
+        """
+        path = self.load(contract_str, shapes, kwargs)
+
+        if path is not None:
+            self.hits += 1
+            opts = {**kwargs, 'optimize': path}
+            return oe.contract_expression(contract_str, *shapes, **opts)
+
+        self.misses += 1
+        expr = oe.contract_expression(contract_str, *shapes, **kwargs)
+        self.save(contract_str, shapes, kwargs,
+                  [c[0] for c in expr.contraction_list])
+        return expr
+
+    def __repr__(self):
+        return "<ContractPathDiskCache(directory='{}', hits={}, misses={})>" \
+            "".format(self.directory, self.hits, self.misses)
+
+
+_CONTRACT_PATH_CACHE = None
+
+
+def get_contract_path_cache():
+    """Get the current persistent contraction path cache, ``None`` if not set.
+
+    See Also
+    --------
+    set_contract_path_cache, ContractPathDiskCache
+    """
+    return _CONTRACT_PATH_CACHE
+
+
+def set_contract_path_cache(directory=None, max_size=2**26):
+    """Set (or unset if ``directory=None``) a persistent, on-disk cache of
+    contraction paths, which can be shared between processes. This can also be
+    set using the environment variable ``QUIMB_CONTRACT_PATH_CACHE``.
+
+    Parameters
+    ----------
+    directory : str or None
+        Where to store the paths, ``None`` to turn off the disk cache.
+    max_size : int, optional
+        Maximum size in bytes of the cache before old entries are evicted.
+
+    Returns
+    -------
+    ContractPathDiskCache or None
+
+    See Also
+    --------
+    get_contract_path_cache, ContractPathDiskCache
+    """
+    global _CONTRACT_PATH_CACHE
+
+    if directory is None:
+        _CONTRACT_PATH_CACHE = None
+    else:
+        _CONTRACT_PATH_CACHE = ContractPathDiskCache(directory, max_size)
+
+    # in memory cache might now bypass the disk cache
+    _get_contract_expr_cached.cache_clear()
+
+    return _CONTRACT_PATH_CACHE
 
 
 def _get_contract_expr(contract_str, *shapes, **kwargs):
     # choose how large intermediate arrays can be
     kwargs.setdefault('memory_limit', -1)
+
+    # check for a persistent path cache (not possible with constant tensors)
+    if (_CONTRACT_PATH_CACHE is not None) and not kwargs.get('constants'):
+        return _CONTRACT_PATH_CACHE.get_expression(
+            contract_str, *shapes, **kwargs)
+
     return oe.contract_expression(contract_str, *shapes, **kwargs)
 
 
@@ -45,9 +278,37 @@ def get_contract_expr(contract_str, *shapes, cache=True, **kwargs):
     return _get_contract_expr_cached(contract_str, *shapes, **kwargs)
 
 
+if 'QUIMB_CONTRACT_PATH_CACHE' in os.environ:
+    set_contract_path_cache(os.environ['QUIMB_CONTRACT_PATH_CACHE'])
+
+
 _CONTRACT_BACKEND = 'numpy'
 _TENSOR_LINOP_BACKEND = 'cupy' if has_cupy() else 'numpy'
 
+# modules that implement the array functions for libraries, if different
+_BACKEND_MODULES = {'dask': 'dask.array'}
+# quimb's own array types implement them in their defining module
+_BACKEND_MODULES_EXACT = {'quimb.tensor.block_sparse'}
+
+
+@functools.lru_cache(128)
+def _infer_backend_cached(cls):
+    if issubclass(cls, np.ndarray) or (cls.__module__ == 'builtins'):
+        return 'numpy'
+    if cls.__module__ in _BACKEND_MODULES_EXACT:
+        return cls.__module__
+    lib = cls.__module__.split('.')[0]
+    return _BACKEND_MODULES.get(lib, lib)
+
+
+def infer_backend(array):
+    """Get the name of the module implementing ``tensordot``, ``einsum`` etc.
+    for ``array``, i.e. a valid ``opt_einsum`` backend - ``'numpy'`` for
+    numpy arrays (and subclasses) or scalars, ``'dask.array'`` for dask
+    arrays, ``'sparse'`` for pydata/sparse arrays and so on.
+    """
+    return _infer_backend_cached(array.__class__)
+
 
 def get_contract_backend():
     """Get the default backend used for tensor contractions, via 'opt_einsum'.
@@ -109,16 +370,13 @@ def set_union(sets):
     return set.union(*sets)
 
 
-class OrderedCounter(collections.Counter, collections.OrderedDict):
-    pass
-
-
 def _gen_output_inds(all_inds):
     """Generate the output, i.e. unique, indices from the set ``inds``. Raise
     if any index found more than twice.
     """
-    cnts = OrderedCounter(all_inds)
-    for ind, freq in cnts.items():
+    cnts = frequencies(all_inds)
+    for ind in unique(all_inds):
+        freq = cnts[ind]
         if freq > 2:
             raise ValueError("The index {} appears more "
                              "than twice!".format(ind))
@@ -126,14 +384,27 @@ def _gen_output_inds(all_inds):
             yield ind
 
 
+_EINSUM_SYMBOLS = []
+
+
+def _get_symbols(n):
+    """Get a list of (at least) the first ``n`` einsum symbols, these are
+    generated once and then cached.
+    """
+    if len(_EINSUM_SYMBOLS) < n:
+        _EINSUM_SYMBOLS.extend(
+            map(oe.get_symbol, range(len(_EINSUM_SYMBOLS), n)))
+    return _EINSUM_SYMBOLS
+
+
 def _maybe_map_indices_to_alphabet(a_ix, i_ix, o_ix):
     """``einsum`` need characters a-z,A-Z or equivalent numbers.
     Do this early, and allow *any* index labels.
 
     Parameters
     ----------
-    a_ix : set
-        All of the input indices.
+    a_ix : sequence
+        All of the unique input indices.
     i_ix : sequence of sequence
         The input indices per tensor.
     o_ix : list of int
@@ -144,15 +415,74 @@ def _maybe_map_indices_to_alphabet(a_ix, i_ix, o_ix):
     contract_str : str
         The string to feed to einsum/contract.
     """
-    amap = {ix: oe.get_symbol(i) for i, ix in enumerate(a_ix)}
-    in_str = ("".join(amap[i] for i in ix) for ix in i_ix)
-    out_str = "".join(amap[o] for o in o_ix)
+    amap = dict(zip(a_ix, _get_symbols(len(a_ix))))
+    in_str = ",".join("".join(map(amap.__getitem__, ix)) for ix in i_ix)
+    out_str = "".join(map(amap.__getitem__, o_ix))
+
+    return in_str + "->" + out_str
+
+
+@functools.lru_cache(4096)
+def _pairwise_tensordot_plan(inds_a, inds_b, output_inds):
+    """Work out how to contract two tensors with indices ``inds_a`` and
+    ``inds_b`` using a single ``tensordot``, possibly followed by a transpose.
+
+    Returns
+    -------
+    None or (axes_a, axes_b, perm, o_ix)
+        ``None`` if the contraction can't be performed this way, e.g. due to
+        traces or hyper-indices, else the axes to contract, the permutation
+        to apply afterwards (``None`` if not needed) and the output indices.
+    """
+    if (len(set(inds_a)) != len(inds_a)) or (len(set(inds_b)) != len(inds_b)):
+        return None
+
+    shared = set(inds_a) & set(inds_b)
+    axes_a = tuple(i for i, ix in enumerate(inds_a) if ix in shared)
+    axes_b = tuple(inds_b.index(inds_a[i]) for i in axes_a)
+
+    # the natural output order of tensordot, also the default order
+    free = (*(ix for ix in inds_a if ix not in shared),
+            *(ix for ix in inds_b if ix not in shared))
+
+    if output_inds is None:
+        return axes_a, axes_b, None, free
+
+    if (len(output_inds) != len(free)) or (set(output_inds) != set(free)):
+        return None
+
+    if output_inds == free:
+        return axes_a, axes_b, None, output_inds
+
+    perm = tuple(map(free.index, output_inds))
+    return axes_a, axes_b, perm, output_inds
+
+
+def _tensor_contract_pairwise(t1, t2, output_inds=None):
+    """Contract two numpy tensors directly with ``tensordot``, or return
+    ``None`` if that is not possible.
+    """
+    if output_inds is not None:
+        output_inds = tuple(output_inds)
 
-    return ",".join(in_str) + "->" + out_str
+    plan = _pairwise_tensordot_plan(t1.inds, t2.inds, output_inds)
+    if plan is None:
+        return None
+
+    axes_a, axes_b, perm, o_ix = plan
+    o_array = np.tensordot(t1.data, t2.data, (axes_a, axes_b))
+    if perm is not None:
+        o_array = o_array.transpose(perm)
+
+    if not o_ix:
+        return realify_item(o_array)
+
+    return Tensor(data=o_array, inds=o_ix, tags=t1.tags | t2.tags)
 
 
 def tensor_contract(*tensors, output_inds=None, get=None,
-                    backend=None, **contract_opts):
+                    backend=None, max_size=None, executor=None,
+                    **contract_opts):
     """Efficiently contract multiple tensors, combining their tags.
 
     Parameters
@@ -168,6 +498,15 @@ def tensor_contract(*tensors, output_inds=None, get=None,
     backend  {'numpy', 'cupy', 'tensorflow', 'theano', ...}, optional
         Which backend to use to perform the contraction. Must be a valid
         ``opt_einsum`` backend with the relevant library installed.
+    max_size : int, optional
+        If given, the maximum size of any intermediate tensor. Inner indices
+        are then sliced over until the contraction satisfies this, see
+        :func:`~quimb.tensor.tensor_core.tensor_contract_sliced`.
+    executor : executor, optional
+        A ``concurrent.futures`` style pool to perform independent
+        sub-contractions with - either the slices if ``max_size`` is given,
+        else separate branches of the contraction tree, see
+        :func:`~quimb.tensor.tensor_core.tensor_contract_parallel`.
 
     Returns
     -------
@@ -176,6 +515,38 @@ def tensor_contract(*tensors, output_inds=None, get=None,
     if backend is None:
         backend = _CONTRACT_BACKEND
 
+        # e.g. dask or sparse arrays need their own library to be contracted
+        for t in tensors:
+            if isinstance(t.data, np.ndarray):
+                continue
+            data_backend = infer_backend(t.data)
+            if data_backend != 'numpy':
+                backend = data_backend
+                break
+
+    if (max_size is not None) and (get is None):
+        return tensor_contract_sliced(
+            *tensors, max_size=max_size, output_inds=output_inds,
+            backend=backend, executor=executor, **contract_opts)
+
+    if (executor is not None) and (get is None):
+        return tensor_contract_parallel(
+            *tensors, executor=executor, output_inds=output_inds,
+            backend=backend, **contract_opts)
+
+    # whilst any hooks are registered, time each stage of the contraction
+    hooked = bool(_CONTRACT_HOOKS) and (get is None)
+    timer = time.perf_counter if hooked else _no_timer
+
+    # fast path for two numpy tensors -> no need for a contraction path
+    if ((len(tensors) == 2) and (get is None) and (backend == 'numpy') and
+            (not contract_opts) and (not hooked) and
+            all(isinstance(t.data, np.ndarray) for t in tensors)):
+        o = _tensor_contract_pairwise(*tensors, output_inds=output_inds)
+        if o is not None:
+            return o
+
+    t0 = timer()
     i_ix = tuple(t.inds for t in tensors)  # input indices per tensor
     a_ix = tuple(concat(i_ix))  # list of all input indices
 
@@ -187,6 +558,7 @@ def tensor_contract(*tensors, output_inds=None, get=None,
 
     # possibly map indices into the range needed by opt- einsum
     contract_str = _maybe_map_indices_to_alphabet([*unique(a_ix)], i_ix, o_ix)
+    t1 = timer()
 
     if get == 'path':
         ops = (t.data for t in tensors)
@@ -200,21 +572,641 @@ def tensor_contract(*tensors, output_inds=None, get=None,
         return expression
 
     # perform the contraction
-    shapes = (t.shape for t in tensors)
+    shapes = tuple(t.shape for t in tensors)
+    if hooked:
+        cache_hits = _contract_cache_hits()
     expression = get_contract_expr(contract_str, *shapes, **contract_opts)
+    t2 = timer()
     o_array = expression(*(t.data for t in tensors), backend=backend)
+    t3 = timer()
+
+    if not o_ix:
+        result = realify_item(o_array)
+    else:
+        # unison of all tags
+        o_tags = set_union(t.tags for t in tensors)
+        result = Tensor(data=o_array, inds=o_ix, tags=o_tags)
+
+    if hooked:
+        t4 = timer()
+        _call_contract_hooks(
+            expression, contract_str, shapes,
+            cache=_contract_cache_source(cache_hits, contract_opts),
+            times={'map_inds': t1 - t0, 'expression': t2 - t1,
+                   'contract': t3 - t2, 'tensor': t4 - t3, 'total': t4 - t0})
+
+    return result
+
+
+# --------------------------- sliced contraction ---------------------------- #
+
+def _remove_symbols(contract_str, symbols):
+    """Remove every occurence of each of ``symbols`` from ``contract_str``.
+    """
+    for symbol in symbols:
+        contract_str = contract_str.replace(symbol, '')
+    return contract_str
+
+
+def find_slice_symbols(contract_str, shapes, max_size, **contract_opts):
+    """Greedily find the inner indices of the contraction ``contract_str`` to
+    slice over such that no intermediate tensor is larger than ``max_size``.
+    At each step the largest index of the current largest intermediate is
+    sliced, then the contraction path is recomputed.
+
+    Parameters
+    ----------
+    contract_str : str
+        The einsum equation, with explicit output.
+    shapes : sequence of tuple[int]
+        The shapes of each input.
+    max_size : int
+        The maximum allowed size of an intermediate tensor.
+    contract_opts
+        Supplied to :func:`~quimb.tensor.tensor_core.get_contract_expr`.
+
+    Returns
+    -------
+    sliced : tuple[str]
+        The symbols to slice over, in the order chosen.
+    sliced_str : str
+        The equation of each sub-contraction.
+    """
+    lhs, out = contract_str.split('->')
+    size_dict = {ix: d for ixs, shape in zip(lhs.split(','), shapes)
+                 for ix, d in zip(ixs, shape)}
+
+    sliced = []
+    while True:
+        sliced_str = _remove_symbols(contract_str, sliced)
+        sliced_shapes = [tuple(size_dict[ix] for ix in term)
+                         for term in sliced_str.split('->')[0].split(',')]
+        expr = get_contract_expr(sliced_str, *sliced_shapes, **contract_opts)
+
+        largest, largest_ix = 0, ''
+        for contraction in expr.contraction_list:
+            ixs = contraction[2].split('->')[1]
+            size = oe.helpers.compute_size_by_dict(ixs, size_dict)
+            if size > largest:
+                largest, largest_ix = size, ixs
+
+        if largest <= max_size:
+            return tuple(sliced), sliced_str
+
+        candidates = [ix for ix in largest_ix if ix not in out]
+        if not candidates:
+            raise ValueError(
+                "Can't reduce the largest intermediate, of size {}, below "
+                "max_size={} by slicing inner indices only.".format(
+                    largest, max_size))
+
+        sliced.append(max(candidates, key=size_dict.__getitem__))
+
+
+def _contract_slices(sliced_str, arrays, locs, slice_values, backend,
+                     contract_opts):
+    """Perform and sum the contractions for every sliced index value
+    in ``slice_values``. ``locs`` gives, for each array and each axis,
+    the position in each slice value of that axis, else ``None``.
+    """
+    result = None
+
+    for values in slice_values:
+        sliced_arrays = [
+            a[tuple(slice(None) if k is None else values[k] for k in loc)]
+            for a, loc in zip(arrays, locs)
+        ]
+
+        expr = get_contract_expr(sliced_str, *(a.shape for a in sliced_arrays),
+                                 **contract_opts)
+        x = expr(*sliced_arrays, backend=backend)
+
+        result = x if result is None else result + x
+
+    return result
+
+
+def tensor_contract_sliced(*tensors, max_size, output_inds=None, backend=None,
+                           executor=None, slices_per_task=None,
+                           **contract_opts):
+    """Contract ``tensors`` whilst keeping every intermediate tensor smaller
+    than ``max_size``, by slicing over (i.e. explicitly summing over the
+    values of) some of the inner indices. Each slice is an independent
+    contraction, which can be performed in parallel with ``executor``.
+
+    Parameters
+    ----------
+    tensors : sequence of Tensor
+        The tensors to contract.
+    max_size : int
+        The maximum size of any intermediate tensor.
+    output_inds : sequence, optional
+        If given, the desired order of output indices.
+    backend : str, optional
+        Which backend to use to perform the contraction.
+    executor : executor, optional
+        A ``concurrent.futures`` style pool to submit groups of slices to.
+    slices_per_task : int, optional
+        How many slices to sum per submitted task, the default is to split
+        the slices into four tasks per worker of ``executor``.
+    contract_opts
+        Supplied to :func:`~quimb.tensor.tensor_core.get_contract_expr`.
+
+    Returns
+    -------
+    scalar or Tensor
+
+    See Also
+    --------
+    tensor_contract, find_slice_symbols
+    """
+    if backend is None:
+        backend = _CONTRACT_BACKEND
+
+    i_ix = tuple(t.inds for t in tensors)
+    a_ix = tuple(concat(i_ix))
+    o_ix = (tuple(_gen_output_inds(a_ix)) if output_inds is None else
+            output_inds)
+    contract_str = _maybe_map_indices_to_alphabet([*unique(a_ix)], i_ix, o_ix)
+
+    shapes = tuple(t.shape for t in tensors)
+    sliced, sliced_str = find_slice_symbols(contract_str, shapes, max_size,
+                                            **contract_opts)
+
+    size_dict = {ix: d for ixs, shape in
+                 zip(contract_str.split('->')[0].split(','), shapes)
+                 for ix, d in zip(ixs, shape)}
+    slice_values = tuple(itertools.product(
+        *(range(size_dict[ix]) for ix in sliced)))
+
+    # for each array and axis, where to find the sliced value if any
+    locs = tuple(
+        tuple(sliced.index(ix) if ix in sliced else None for ix in term)
+        for term in contract_str.split('->')[0].split(','))
+
+    arrays = tuple(t.data for t in tensors)
+
+    if executor is None:
+        o_array = _contract_slices(sliced_str, arrays, locs, slice_values,
+                                   backend, contract_opts)
+    else:
+        if slices_per_task is None:
+            ntasks = 4 * _get_executor_num_workers(executor)
+            slices_per_task = max(1, math.ceil(len(slice_values) / ntasks))
+
+        # send the explicit path so that remote workers needn't search for it
+        sliced_shapes = [tuple(d for d, k in zip(a.shape, loc) if k is None)
+                         for a, loc in zip(arrays, locs)]
+        expr = get_contract_expr(sliced_str, *sliced_shapes, **contract_opts)
+        path = tuple(c[0] for c in expr.contraction_list)
+        worker_opts = {**contract_opts, 'optimize': path}
+
+        fs = [executor.submit(_contract_slices, sliced_str, arrays, locs,
+                              chunk, backend, worker_opts)
+              for chunk in partition_all(slices_per_task, slice_values)]
+
+        o_array = functools.reduce(operator.add, (f.result() for f in fs))
 
     if not o_ix:
-        if isinstance(o_array, np.ndarray):
-            o_array = np.asscalar(o_array)
-        return realify_scalar(o_array)
+        return realify_item(o_array)
 
-    # unison of all tags
     o_tags = set_union(t.tags for t in tensors)
+    return Tensor(data=o_array, inds=o_ix, tags=o_tags)
+
+
+# ------------------------- parallel contraction ---------------------------- #
+
+def _contract_arrays(contract_str, arrays, backend, contract_opts):
+    """Contract ``arrays`` according to ``contract_str`` - a module level
+    function so that it can be sent to process and MPI pools.
+    """
+    expr = get_contract_expr(contract_str, *(a.shape for a in arrays),
+                             **contract_opts)
+    return expr(*arrays, backend=backend)
+
+
+def _get_executor_num_workers(executor):
+    """Try and find how many workers ``executor`` has, defaulting to the
+    number of cpus.
+    """
+    for attr in ('_max_workers', '_num_workers', 'size'):
+        num_workers = getattr(executor, attr, None)
+        if isinstance(num_workers, int):
+            return num_workers
+    return os.cpu_count() or 1
+
+
+def _contraction_tree(contraction_list, num_inputs):
+    """Convert an ``opt_einsum`` contraction list into a tree, with the inputs
+    labelled ``0, ..., num_inputs - 1`` and each intermediate labelled by the
+    next integer, returning the children of each intermediate and the root.
+    """
+    ids = list(range(num_inputs))
+    children = {}
+
+    for contract_inds, *_ in contraction_list:
+        node = num_inputs + len(children)
+        # opt_einsum pops operands in descending position order
+        children[node] = tuple(ids.pop(i) for i in
+                               sorted(contract_inds, reverse=True))
+        ids.append(node)
+
+    root, = ids
+    return children, root
+
+
+def _tree_leaves(children, node):
+    if node not in children:
+        return (node,)
+    return tuple(concat(_tree_leaves(children, c) for c in children[node]))
+
+
+def tensor_contract_parallel(*tensors, executor, output_inds=None,
+                             backend=None, num_tasks=None, **contract_opts):
+    """Contract ``tensors``, farming independent branches of the contraction
+    tree out to ``executor``. The tree is repeatedly split at its largest
+    branch until there are ``num_tasks`` independent sub-contractions, which
+    are performed in parallel and then contracted together locally. This is
+    most effective for balanced trees, or networks made of disconnected
+    pieces.
 
+    Parameters
+    ----------
+    tensors : sequence of Tensor
+        The tensors to contract.
+    executor : executor
+        A ``concurrent.futures`` style pool, e.g. from
+        :func:`~quimb.get_thread_pool`, a ``ProcessPoolExecutor`` or
+        :func:`~quimb.linalg.mpi_launcher.get_mpi_pool`.
+    output_inds : sequence, optional
+        If given, the desired order of output indices.
+    backend : str, optional
+        Which backend to use to perform the contraction.
+    num_tasks : int, optional
+        How many sub-contractions to aim for, defaults to the number of
+        workers of ``executor``.
+    contract_opts
+        Supplied to :func:`~quimb.tensor.tensor_core.get_contract_expr`.
+
+    Returns
+    -------
+    scalar or Tensor
+
+    See Also
+    --------
+    tensor_contract, tensor_contract_sliced
+    """
+    if backend is None:
+        backend = _CONTRACT_BACKEND
+
+    if num_tasks is None:
+        num_tasks = _get_executor_num_workers(executor)
+
+    i_ix = tuple(t.inds for t in tensors)
+    a_ix = tuple(concat(i_ix))
+    o_ix = (tuple(_gen_output_inds(a_ix)) if output_inds is None else
+            output_inds)
+    contract_str = _maybe_map_indices_to_alphabet([*unique(a_ix)], i_ix, o_ix)
+    lhs, out = contract_str.split('->')
+    terms = lhs.split(',')
+
+    expr = get_contract_expr(contract_str, *(t.shape for t in tensors),
+                             **contract_opts)
+    children, root = _contraction_tree(expr.contraction_list, len(tensors))
+
+    # split the largest branch until there are enough independent pieces
+    frontier = [root]
+    while len(frontier) < num_tasks:
+        splittable = [node for node in frontier if node in children]
+        if not splittable:
+            break
+        node = max(splittable, key=lambda x: len(_tree_leaves(children, x)))
+        frontier.remove(node)
+        frontier.extend(children[node])
+
+    ix_counts = collections.Counter(concat(terms))
+    ix_counts.update(out)
+
+    fs, new_terms, local_arrays = [], [], []
+    for node in frontier:
+        leaves = _tree_leaves(children, node)
+
+        if len(leaves) == 1:
+            new_terms.append(terms[leaves[0]])
+            local_arrays.append(tensors[leaves[0]].data)
+            continue
+
+        # keep any index appearing outside of this branch
+        sub_terms = [terms[i] for i in leaves]
+        sub_counts = collections.Counter(concat(sub_terms))
+        sub_out = "".join(ix for ix in unique(concat(sub_terms))
+                          if ix_counts[ix] > sub_counts[ix])
+        sub_str = ",".join(sub_terms) + "->" + sub_out
+
+        fs.append(executor.submit(_contract_arrays, sub_str,
+                                  tuple(tensors[i].data for i in leaves),
+                                  backend, contract_opts))
+        new_terms.append(sub_out)
+        local_arrays.append(None)
+
+    # gather the results and perform the remaining contraction locally
+    results = iter([f.result() for f in fs])
+    arrays = [next(results) if x is None else x for x in local_arrays]
+    final_str = ",".join(new_terms) + "->" + out
+    o_array = _contract_arrays(final_str, arrays, backend, contract_opts)
+
+    if not o_ix:
+        return realify_item(o_array)
+
+    o_tags = set_union(t.tags for t in tensors)
     return Tensor(data=o_array, inds=o_ix, tags=o_tags)
 
 
+# -------------------------- batched contraction ---------------------------- #
+
+def tensor_contract_batched(tensor_lists, output_inds=None, backend=None,
+                            **contract_opts):
+    """Contract many networks with identical structure but different data in
+    a single vectorized pass. The arrays for each position are stacked along
+    a new batch dimension and a single (cached) expression contracts them
+    all at once. Any tensor that is the same object throughout the batch is
+    not stacked, but broadcast.
+
+    Parameters
+    ----------
+    tensor_lists : sequence of sequence of Tensor
+        The networks to contract, each a sequence of tensors with matching
+        indices and shapes, in the same order.
+    output_inds : sequence, optional
+        If given, the desired order of output indices.
+    backend : str, optional
+        Which backend to use to perform the contraction.
+    contract_opts
+        Supplied to :func:`~quimb.tensor.tensor_core.get_contract_expr`.
+
+    Returns
+    -------
+    numpy.ndarray or list[Tensor]
+        If the contractions produce scalars, an array of them - with the
+        dtype of the contraction, i.e. no small imaginary parts are dropped -
+        else a list of the resulting tensors.
+
+    See Also
+    --------
+    tensor_contract
+    """
+    if backend is None:
+        backend = _CONTRACT_BACKEND
+
+    tensor_lists = tuple(map(tuple, tensor_lists))
+    if not tensor_lists:
+        raise ValueError("Need at least one network to contract.")
+    first = tensor_lists[0]
+
+    for ts in tensor_lists[1:]:
+        if (len(ts) != len(first)) or any(
+                (t.inds != t0.inds) or (t.shape != t0.shape)
+                for t, t0 in zip(ts, first)):
+            raise ValueError("All networks must have the same number of "
+                             "tensors, with matching indices and shapes.")
+
+    i_ix = tuple(t.inds for t in first)
+    a_ix = tuple(concat(i_ix))
+    o_ix = (tuple(_gen_output_inds(a_ix)) if output_inds is None else
+            tuple(output_inds))
+    u_ix = [*unique(a_ix)]
+    contract_str = _maybe_map_indices_to_alphabet(u_ix, i_ix, o_ix)
+
+    # add a new symbol for the batch dimension to each stacked term
+    lhs, out = contract_str.split('->')
+    batch_ix = oe.get_symbol(len(u_ix))
+
+    shared = [all(t is ts[0] for t in ts) for ts in zip(*tensor_lists)]
+    if all(shared):
+        # need at least one term to carry the batch dimension
+        shared[0] = False
+
+    terms, arrays = [], []
+    for term, ts, is_shared in zip(lhs.split(','), zip(*tensor_lists), shared):
+        if is_shared:
+            terms.append(term)
+            arrays.append(ts[0].data)
+        else:
+            terms.append(batch_ix + term)
+            arrays.append(np.stack([t.data for t in ts]))
+
+    batched_str = ",".join(terms) + "->" + batch_ix + out
+    expr = get_contract_expr(batched_str, *(a.shape for a in arrays),
+                             **contract_opts)
+    o_array = expr(*arrays, backend=backend)
+
+    if not o_ix:
+        return o_array
+
+    return [Tensor(data=x, inds=o_ix, tags=set_union(t.tags for t in ts))
+            for x, ts in zip(o_array, tensor_lists)]
+
+
+# --------------------- contraction instrumentation ------------------------ #
+
+_CONTRACT_HOOKS = []
+
+
+def add_contract_hook(fn):
+    """Register ``fn`` to be called with a ``dict`` of information after every
+    full ``tensor_contract`` call. The keys of the dict are:
+
+        - 'contract_str': the einsum equation used.
+        - 'shapes': the shapes of the input tensors.
+        - 'flops': the estimated number of operations of the contraction.
+        - 'largest_intermediate': the size of the largest tensor produced.
+        - 'cache': whether the expression came from the in 'memory' cache,
+          the 'disk' path cache, was a 'miss', or is 'uncached'.
+        - 'times': dict of wall times for each of the stages 'map_inds',
+          'expression', 'contract' and 'tensor', and the 'total'.
+
+    Whilst any hooks are registered, ``tensor_contract`` has a small extra
+    overhead, and always goes through ``opt_einsum`` - i.e. the direct
+    ``tensordot`` path for pairs of tensors is skipped so that it is recorded
+    like any other contraction. Sliced (``max_size``) and parallel
+    (``executor``) contractions are *not* recorded, since they are made of
+    many sub-contractions with no single expression.
+
+    See Also
+    --------
+    remove_contract_hook, ContractProfiler
+    """
+    _CONTRACT_HOOKS.append(fn)
+
+
+def remove_contract_hook(fn):
+    """Remove the contraction hook ``fn``.
+
+    See Also
+    --------
+    add_contract_hook, ContractProfiler
+    """
+    try:
+        _CONTRACT_HOOKS.remove(fn)
+    except ValueError:
+        pass
+
+
+def _contract_expr_costs(expression, contract_str, shapes):
+    """Estimate the flops and largest intermediate size of the contraction
+    that ``expression``, for ``contract_str`` and ``shapes``, performs.
+    """
+    lhs = contract_str.split('->')[0].split(',')
+    size_dict = {ix: d for ixs, shape in zip(lhs, shapes)
+                 for ix, d in zip(ixs, shape)}
+
+    flops = 0
+    largest = 0
+    for _, idx_removed, einsum_str, _, _ in expression.contraction_list:
+        terms, out = einsum_str.split('->')
+        idx_contract = set(terms.replace(',', ''))
+        flops += oe.helpers.flop_count(idx_contract, bool(idx_removed),
+                                       terms.count(',') + 1, size_dict)
+        largest = max(largest, oe.helpers.compute_size_by_dict(out, size_dict))
+
+    return flops, largest
+
+
+def _no_timer():
+    return 0.0
+
+
+def _contract_cache_hits():
+    """The current number of hits of the in memory and on disk expression
+    caches.
+    """
+    disk = _CONTRACT_PATH_CACHE
+    return (_get_contract_expr_cached.cache_info().hits,
+            None if disk is None else disk.hits)
+
+
+def _contract_cache_source(cache_hits, contract_opts):
+    """Work out where the expression just got came from, given the cache
+    hits, ``cache_hits``, from before getting it.
+    """
+    if not contract_opts.get('cache', True) or contract_opts.get('constants'):
+        return 'uncached'
+
+    mem_hits, disk_hits = cache_hits
+    if _get_contract_expr_cached.cache_info().hits > mem_hits:
+        return 'memory'
+
+    disk = _CONTRACT_PATH_CACHE
+    if (disk is not None) and (disk_hits is not None) and \
+            (disk.hits > disk_hits):
+        return 'disk'
+
+    return 'miss'
+
+
+def _call_contract_hooks(expression, contract_str, shapes, cache, times):
+    """Report a contraction to every registered hook.
+    """
+    flops, largest = _contract_expr_costs(expression, contract_str, shapes)
+
+    info = {
+        'contract_str': contract_str,
+        'shapes': shapes,
+        'flops': flops,
+        'largest_intermediate': largest,
+        'cache': cache,
+        'times': times,
+    }
+
+    for hook in tuple(_CONTRACT_HOOKS):
+        hook(info)
+
+
+class ContractProfiler:
+    """Context manager that records information about every call to
+    ``tensor_contract`` made within it, e.g. in order to find those
+    contractions dominating a DMRG or TEBD run::
+
+        >>> with ContractProfiler() as prof:
+        ...     dmrg.solve()
+        >>> prof.summary()[:3]  # the three most expensive contractions
+
+    See :func:`~quimb.tensor.tensor_core.add_contract_hook` for the
+    information in each record.
+
+    Attributes
+    ----------
+    records : list[dict]
+        The information about each contraction, in the order they happened.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, info):
+        self.records.append(info)
+
+    def __enter__(self):
+        add_contract_hook(self)
+        return self
+
+    def __exit__(self, *_):
+        remove_contract_hook(self)
+
+    def summary(self, sort_by='total'):
+        """Aggregate the records by unique contraction.
+
+        Parameters
+        ----------
+        sort_by : {'total', 'calls', 'flops', 'largest_intermediate'}
+            Which quantity to sort the contractions by, descending.
+
+        Returns
+        -------
+        list[dict]
+            One entry per unique contraction string and shapes, with the
+            number of 'calls', the cumulative 'times' of each stage, the
+            'flops' and 'largest_intermediate' of a single call, and the
+            count of each type of expression 'cache' status.
+        """
+        stats = collections.OrderedDict()
+
+        for r in self.records:
+            key = (r['contract_str'], r['shapes'])
+            if key not in stats:
+                stats[key] = {
+                    'contract_str': r['contract_str'], 'shapes': r['shapes'],
+                    'flops': r['flops'], 'calls': 0,
+                    'largest_intermediate': r['largest_intermediate'],
+                    'times': dict.fromkeys(r['times'], 0.0),
+                    'cache': collections.Counter(),
+                }
+            s = stats[key]
+            s['calls'] += 1
+            s['cache'][r['cache']] += 1
+            for stage, t in r['times'].items():
+                s['times'][stage] += t
+
+        def key(s):
+            if sort_by == 'total':
+                return s['times']['total']
+            return s[sort_by]
+
+        return sorted(stats.values(), key=key, reverse=True)
+
+    def to_json(self, fname=None):
+        """Export the records as JSON, optionally writing to ``fname``.
+        """
+        log = json.dumps(self.records)
+        if fname is not None:
+            with open(fname, 'w') as f:
+                f.write(log)
+        return log
+
+    def __repr__(self):
+        return "<ContractProfiler(records={})>".format(len(self.records))
+
+
 # generate a random base to avoid collisions on difference processes ...
 r_bs_str = str(uuid.uuid4())[:6]
 # but then make the list orderable to help contraction caching
@@ -261,6 +1253,14 @@ def tensor_split(T, left_inds, method='svd', max_bond=None, absorb='both',
             - 'eigh': full eigen-decomposition, tensor must he hermitian.
             - 'eigsh': iterative eigen-decomposition, tensor must he hermitian.
             - 'cholesky': full cholesky decomposition, tensor must be positive.
+            - 'rsvd': randomized svd, allows truncation.
+
+        Dask arrays are decomposed natively with 'svd', 'qr', 'lq' and,
+        given ``max_bond``, 'svds', 'isvd' and 'rsvd' (all using
+        ``svd_compressed``). ``sparse`` arrays can only be split with 'svds'
+        or 'eigsh' given ``max_bond``, producing dense factors. Other methods
+        raise an error for these arrays rather than densifying them, whereas
+        any other non-numpy array is first converted to numpy.
 
     max_bond: None or int
         If integer, the maxmimum number of singular values to keep, regardless
@@ -308,15 +1308,6 @@ def tensor_split(T, left_inds, method='svd', max_bond=None, absorb='both',
 
     TT = T.transpose(*left_inds, *right_inds)
 
-    left_dims = TT.shape[:len(left_inds)]
-    right_dims = TT.shape[len(left_inds):]
-
-    array = TT.data.reshape(prod(left_dims), prod(right_dims))
-
-    if get == 'values':
-        return {'svd': decomp._svdvals,
-                'eig': decomp._svdvals_eig}[method](array)
-
     opts = {}
     if method not in ('qr', 'lq'):
         # Convert defaults and settings to numeric type for numba funcs
@@ -326,21 +1317,49 @@ def tensor_split(T, left_inds, method='svd', max_bond=None, absorb='both',
         opts['cutoff_mode'] = {'abs': 1, 'rel': 2,
                                'sum2': 3, 'rsum2': 4}[cutoff_mode]
 
-    left, right = {
-        'svd': decomp._svd,
-        'eig': decomp._eig,
-        'qr': decomp._qr,
-        'lq': decomp._lq,
-        'eigh': decomp._eigh,
-        'cholesky': decomp._cholesky,
-        'isvd': decomp._isvd,
-        'svds': decomp._svds,
-        'rsvd': decomp._rsvd,
-        'eigsh': decomp._eigsh,
-    }[method](array, **opts)
-
-    left = left.reshape(*left_dims, -1)
-    right = right.reshape(-1, *right_dims)
+    if isinstance(TT.data, block_sparse.BlockSparseArray):
+        if get == 'values':
+            return block_sparse.singular_values(TT.data, len(left_inds))
+
+        # each charge sector of the new bond is decomposed separately
+        left, right = block_sparse.split(TT.data, len(left_inds),
+                                         method=method, **opts)
+
+    else:
+        left_dims = TT.shape[:len(left_inds)]
+        right_dims = TT.shape[len(left_inds):]
+
+        array = TT.data.reshape((prod(left_dims), prod(right_dims)))
+
+        if get == 'values':
+            if not isinstance(array, np.ndarray):
+                # e.g. dask or sparse arrays
+                return decomp._svdvals_generic(method, array)
+            return {'svd': decomp._svdvals,
+                    'eig': decomp._svdvals_eig}[method](array)
+
+        split_fn = {
+            'svd': decomp._svd,
+            'eig': decomp._eig,
+            'qr': decomp._qr,
+            'lq': decomp._lq,
+            'eigh': decomp._eigh,
+            'cholesky': decomp._cholesky,
+            'isvd': decomp._isvd,
+            'svds': decomp._svds,
+            'rsvd': decomp._rsvd,
+            'eigsh': decomp._eigsh,
+        }[method]
+
+        if isinstance(array, np.ndarray):
+            left, right = split_fn(array, **opts)
+        else:
+            # e.g. dask or sparse arrays
+            left, right = decomp._decomp_generic(split_fn, method, array,
+                                                 **opts)
+
+        left = left.reshape((*left_dims, -1))
+        right = right.reshape((-1, *right_dims))
 
     if get == 'arrays':
         return left, right
@@ -589,9 +1608,13 @@ class Tensor(object):
         be converted into a ``set``.
     """
 
+    # networks can contain very many small tensors, so avoid a per-instance
+    # ``__dict__`` and only track owners once actually owned
+    __slots__ = ('_data', '_inds', '_tags', '_owners')
+
     def __init__(self, data, inds, tags=None):
         # a new or copied Tensor always has no owners
-        self.owners = {}
+        self._owners = None
 
         # Short circuit for copying Tensors
         if isinstance(data, Tensor):
@@ -615,8 +1638,12 @@ class Tensor(object):
         """
         if deep:
             return copy.deepcopy(self)
-        else:
-            return Tensor(self, None)
+
+        # bypass ``__init__``, the data and inds are already checked
+        t = Tensor.__new__(Tensor)
+        t._data, t._inds, t._tags = self._data, self._inds, self._tags.copy()
+        t._owners = None
+        return t
 
     __copy__ = copy
 
@@ -632,30 +1659,53 @@ class Tensor(object):
     def tags(self):
         return self._tags
 
+    @property
+    def owners(self):
+        """Mapping of the TensorNetworks viewing this tensor, like
+        ``{hash(tn): (weakref.ref(tn), tid), ...}``.
+        """
+        if self._owners is None:
+            return {}
+        return {hash(ref): (ref, tid) for ref, tid in self._owners if ref()}
+
     def add_owner(self, tn, tid):
         """Add ``tn`` as owner of this Tensor - it's tag and ind maps will
         be updated whenever this tensor is retagged or reindexed.
         """
-        self.owners[hash(tn)] = (weakref.ref(tn), tid)
+        self._add_owner_ref(weakref.ref(tn), tid)
+
+    def _add_owner_ref(self, ref, tid):
+        """Add the owner with weak reference ``ref``, so that a network adding
+        many tensors need only make it once.
+        """
+        # N.B. tensors rarely have more than one or two owners, so a short
+        # list of pairs is much lighter than a dict, and ``weakref.ref``
+        # returns the same reference object for each alive ``tn``
+        if not self._owners:
+            self._owners = [(ref, tid)]
+        else:
+            # replace any previous entry for ``tn`` and trim dead owners
+            self._owners = [o for o in self._owners
+                            if (o[0] is not ref) and o[0]()]
+            self._owners.append((ref, tid))
 
     def remove_owner(self, tn):
         """Remove ``tn`` as owner of this Tensor.
         """
-        try:
-            del self.owners[hash(tn)]
-        except KeyError:
-            pass
+        if self._owners is not None:
+            self._owners = [o for o in self._owners if o[0]() is not tn]
 
     def check_owners(self):
         """Check if this tensor is 'owned' by any alive TensorNetworks. Also
         trim any weakrefs to dead TensorNetwork.
         """
+        if not self._owners:
+            return False
+
         # first parse out dead owners
-        for k in tuple(self.owners):
-            if not self.owners[k][0]():
-                del self.owners[k]
+        self._owners = [o for o in self._owners if o[0]()]
 
-        return len(self.owners) > 0
+        return len(self._owners) > 0
 
     def modify(self, data=None, inds=None, tags=None):
         """Overwrite the data of this tensor in place.
@@ -675,7 +1725,7 @@ class Tensor(object):
         if inds is not None:
             # if this tensor has owners, update their ``ind_map``.
             if self.check_owners():
-                for ref, tid in self.owners.values():
+                for ref, tid in self._owners:
                     ref()._modify_tensor_inds(self.inds, inds, tid)
 
             self._inds = tuple(inds)
@@ -683,7 +1733,7 @@ class Tensor(object):
         if tags is not None:
             # if this tensor has owners, update their ``tag_map``.
             if self.check_owners():
-                for ref, tid in self.owners.values():
+                for ref, tid in self._owners:
                     ref()._modify_tensor_tags(self.tags, tags, tid)
 
             self._tags = tags2set(tags)
@@ -791,7 +1841,7 @@ class Tensor(object):
         current_ind_map = {ind: i for i, ind in enumerate(tn.inds)}
         out_shape = tuple(current_ind_map[i] for i in output_inds)
 
-        tn.modify(data=tn.data.transpose(*out_shape), inds=output_inds)
+        tn.modify(data=tn.data.transpose(out_shape), inds=output_inds)
         return tn
 
     transpose_ = functools.partialmethod(transpose, inplace=True)
@@ -954,13 +2004,22 @@ class Tensor(object):
         # transpose tensor to bring groups of fused inds to the beginning
         tn.transpose_(*concat(fused_inds), *unfused_inds)
 
-        # for each set of fused dims, group into product, then add remaining
-        dims = iter(tn.shape)
-        dims = [prod(next(dims) for _ in fs) for fs in fused_inds] + list(dims)
+        if isinstance(tn.data, block_sparse.BlockSparseArray):
+            # reshaping is ambiguous with size 1 dimensions, which can still
+            # carry charge, so supply the groups of axes explicitly
+            axes = iter(range(tn.ndim))
+            groups = ([[next(axes) for _ in fs] for fs in fused_inds] +
+                      [[ax] for ax in axes])
+            data = block_sparse.fuse(tn.data, groups)
+        else:
+            # for each set of fused dims, group into product, then add rest
+            dims = iter(tn.shape)
+            dims = ([prod(next(dims) for _ in fs) for fs in fused_inds] +
+                    list(dims))
+            data = tn.data.reshape(tuple(dims))
 
         # create new tensor with new + remaining indices
-        tn.modify(data=tn.data.reshape(*dims),
-                  inds=(*new_fused_inds, *unfused_inds))
+        tn.modify(data=data, inds=(*new_fused_inds, *unfused_inds))
         return tn
 
     fuse_ = functools.partialmethod(fuse, inplace=True)
@@ -988,7 +2047,9 @@ class Tensor(object):
     def norm(self):
         """Frobenius norm of this tensor.
         """
-        return norm_fro_dense(self.data.reshape(-1))
+        if isinstance(self.data, np.ndarray):
+            return norm_fro_dense(self.data.reshape(-1))
+        return (abs(self.data)**2).sum()**0.5
 
     def symmetrize(self, ind1, ind2, inplace=False):
         """Hermitian symmetrize this tensor for indices ``ind1`` and ``ind2``.
@@ -1072,11 +2133,13 @@ class Tensor(object):
         TensorNetwork((self,)).graph(*args, **kwargs)
 
     def __getstate__(self):
-        # This allows pickling, since the copy has no weakrefs.
-        return self.copy().__dict__
+        # This allows pickling, since the state has no weakrefs.
+        return self._data, self._inds, self._tags.copy()
 
-    def __setstate(self, state):
-        self.__dict__ = state.copy()
+    def __setstate__(self, state):
+        self._data, self._inds, tags = state
+        self._tags = tags.copy()
+        self._owners = None
 
     def __repr__(self):
         return "Tensor(shape={}, inds={}, tags={})".format(
@@ -1196,7 +2259,8 @@ class TNLinearOperator(spla.LinearOperator):
             self._tensors = tuple(tns)
 
             if ldims is None or rdims is None:
-                ix_sz = dict(zip(concat((t.inds, t.shape) for t in tns)))
+                ix_sz = dict(zip(concat(t.inds for t in tns),
+                                 concat(t.shape for t in tns)))
                 ldims = tuple(ix_sz[i] for i in left_inds)
                 rdims = tuple(ix_sz[i] for i in right_inds)
 
@@ -1331,6 +2395,58 @@ class TNLinearOperator(spla.LinearOperator):
         )
 
 
+class BlockSparseTNLinearOperator(spla.LinearOperator):
+    r"""Like :class:`~quimb.tensor.tensor_core.TNLinearOperator`, but for a
+    tensor network with block-sparse data, acting only on the space of
+    symmetry allowed blocks of arrays like ``like``. Vectors in this space are
+    the flattened blocks, see :func:`~quimb.tensor.block_sparse.to_vector`
+    and :func:`~quimb.tensor.block_sparse.from_vector`.
+
+    Parameters
+    ----------
+    tns : sequence of Tensors or TensorNetwork
+        A representation of the operator.
+    left_inds : sequence of str
+        The 'left' inds of the effective operator network.
+    right_inds : sequence of str
+        The 'right' inds of the effective operator network, ordered the same
+        way as ``left_inds``.
+    like : BlockSparseArray
+        A block-sparse array, with indices ordered as ``right_inds``, which
+        defines the charges, flows and total charge of the vector space.
+    """
+
+    def __init__(self, tns, left_inds, right_inds, like):
+        if isinstance(tns, TensorNetwork):
+            self._tensors = tns.tensors
+        else:
+            self._tensors = tuple(tns)
+
+        self.left_inds, self.right_inds = left_inds, right_inds
+        self.like = like
+
+        d = sum(prod(like.block_shape(k)) for k in like.allowed_keys())
+        dtype = np.result_type(like.dtype, *(t.dtype for t in self._tensors))
+        super().__init__(dtype=dtype, shape=(d, d))
+
+    def _matvec(self, vec):
+        iT = Tensor(block_sparse.from_vector(vec, self.like),
+                    inds=self.right_inds)
+        oT = tensor_contract(*self._tensors, iT, output_inds=self.left_inds)
+        return block_sparse.to_vector(oT.data, self.like)
+
+    def to_dense(self):
+        """Get the dense matrix representation of this operator, restricted
+        to the allowed space.
+        """
+        return np.stack([self._matvec(v) for v in
+                         np.eye(self.shape[1], dtype=self.dtype)], axis=1)
+
+    @property
+    def A(self):
+        return self.to_dense()
+
+
 # --------------------------------------------------------------------------- #
 #                            Tensor Network Class                             #
 # --------------------------------------------------------------------------- #
@@ -1398,8 +2514,24 @@ class TensorNetwork(object):
     ind_map : dict
         Like ``tag_map`` but for indices. So ``ind_map[ind]]`` returns the
         tensor ids of those tensors with ``ind``.
+
+    Notes
+    -----
+    Copies of a network initially share ``tag_map`` and ``ind_map`` with the
+    original, only making their own copies when one side is about to modify
+    them. Likewise each set of tids is only copied the first time it is
+    changed after sharing, and modified in place from then on. These maps,
+    and the sets within them, should thus only be changed via the methods of
+    this class.
     """
 
+    # whether ``tag_map`` and ``ind_map`` might be shared with another network
+    _maps_shared = False
+    # the tags and inds whose sets of tids have been copied since the maps
+    # were last shared, or ``None`` if the maps have never been shared
+    _owned_tags = None
+    _owned_inds = None
+
     def __init__(self, ts, *,
                  virtual=False,
                  structure=None,
@@ -1414,12 +2546,22 @@ class TensorNetwork(object):
             self.nsites = ts.nsites
             self.sites = ts.sites
             self.structure_bsz = ts.structure_bsz
-            self.tag_map = valmap(lambda tid: tid.copy(), ts.tag_map)
-            self.ind_map = valmap(lambda tid: tid.copy(), ts.ind_map)
-            self.tensor_map = {}
+            # share the tag and ind maps until either network modifies them
+            self.tag_map = ts.tag_map
+            self.ind_map = ts.ind_map
+            self._maps_shared = ts._maps_shared = True
+            self._owned_tags, ts._owned_tags = set(), set()
+            self._owned_inds, ts._owned_inds = set(), set()
+            ref = weakref.ref(self)
+            tensor_map = self.tensor_map = {}
             for tid, t in ts.tensor_map.items():
-                self.tensor_map[tid] = t if virtual else t.copy()
-                self.tensor_map[tid].add_owner(self, tid)
+                if virtual:
+                    t._add_owner_ref(ref, tid)
+                else:
+                    # a fresh copy has no other owners
+                    t = t.copy()
+                    t._owners = [(ref, tid)]
+                tensor_map[tid] = t
             return
 
         # parameters
@@ -1501,27 +2643,53 @@ class TensorNetwork(object):
 
     __copy__ = copy
 
+    def _unshare_maps(self):
+        """Make sure ``tag_map`` and ``ind_map`` are not shared with any other
+        network, before modifying them. Since the sets of tids within are
+        copied on first modification (see ``_add_tid``), shallow copies
+        suffice.
+        """
+        if self._maps_shared:
+            self.tag_map = self.tag_map.copy()
+            self.ind_map = self.ind_map.copy()
+            self._maps_shared = False
+
     @staticmethod
-    def _add_tid(xs, x_map, tid):
-        """Add tid to the relevant map.
+    def _add_tid(xs, x_map, tid, owned=None):
+        """Add tid to the relevant map. ``owned`` is the set of entries
+        already copied since ``x_map`` was shared, if it ever was.
         """
         for x in xs:
-            if x in x_map:
+            if x not in x_map:
+                x_map[x] = {tid}
+                if owned is not None:
+                    owned.add(x)
+            elif (owned is None) or (x in owned):
                 x_map[x].add(tid)
             else:
-                x_map[x] = {tid}
+                # set might be shared with another network -> copy it once
+                x_map[x] = x_map[x] | {tid}
+                owned.add(x)
 
     @staticmethod
-    def _remove_tid(xs, x_map, tid):
-        """Remove tid from the relevant map.
+    def _remove_tid(xs, x_map, tid, owned=None):
+        """Remove tid from the relevant map. ``owned`` is the set of entries
+        already copied since ``x_map`` was shared, if it ever was.
         """
         for x in xs:
             try:
                 tids = x_map[x]
-                tids.discard(tid)
+                if (owned is None) or (x in owned):
+                    tids.discard(tid)
+                else:
+                    # set might be shared with another network -> copy it once
+                    tids = x_map[x] = tids - {tid}
+                    owned.add(x)
                 if not tids:
                     # tid was last tensor -> delete entry
                     del x_map[x]
+                    if owned is not None:
+                        owned.discard(x)
             except KeyError:
                 # tid already removed from x entry - e.g. repeated index
                 pass
@@ -1534,13 +2702,19 @@ class TensorNetwork(object):
             tid = rand_uuid(base="_T")
 
         # add tensor to the main index
-        T = tensor if virtual else tensor.copy()
+        if virtual:
+            T = tensor
+            T.add_owner(self, tid)
+        else:
+            # a fresh copy has no other owners
+            T = tensor.copy()
+            T._owners = [(weakref.ref(self), tid)]
         self.tensor_map[tid] = T
-        T.add_owner(self, tid)
 
         # add its tid to the relevant tags and inds, or create new entries
-        self._add_tid(T.tags, self.tag_map, tid)
-        self._add_tid(T.inds, self.ind_map, tid)
+        self._unshare_maps()
+        self._add_tid(T.tags, self.tag_map, tid, self._owned_tags)
+        self._add_tid(T.inds, self.ind_map, tid, self._owned_inds)
 
     def add_tensor_network(self, tn, virtual=False, check_collisions=True,
                            inner_inds=None):
@@ -1573,13 +2747,20 @@ class TensorNetwork(object):
                 self.add_tensor(tsr, virtual=virtual, tid=tid)
 
         else:  # directly add tensor/tag indexes
+            ref = weakref.ref(self)
             for tid, tsr in tn.tensor_map.items():
-                T = tsr if virtual else tsr.copy()
-                self.tensor_map[tid] = T
-                T.add_owner(self, tid)
+                if virtual:
+                    tsr._add_owner_ref(ref, tid)
+                else:
+                    tsr = tsr.copy()
+                    tsr._owners = [(ref, tid)]
+                self.tensor_map[tid] = tsr
 
+            # N.B. this creates new maps
             self.tag_map = merge_with(set_union, self.tag_map, tn.tag_map)
             self.ind_map = merge_with(set_union, self.ind_map, tn.ind_map)
+            self._maps_shared = False
+            self._owned_tags = self._owned_inds = None
 
     def add(self, t, virtual=False, check_collisions=True, inner_inds=None):
         """Add Tensor, TensorNetwork or sequence thereof to self.
@@ -1620,12 +2801,18 @@ class TensorNetwork(object):
         return self
 
     def _modify_tensor_tags(self, old, new, tid):
-        self._remove_tid((o for o in old if o not in new), self.tag_map, tid)
-        self._add_tid((n for n in new if n not in old), self.tag_map, tid)
+        self._unshare_maps()
+        self._remove_tid((o for o in old if o not in new), self.tag_map, tid,
+                         self._owned_tags)
+        self._add_tid((n for n in new if n not in old), self.tag_map, tid,
+                      self._owned_tags)
 
     def _modify_tensor_inds(self, old, new, tid):
-        self._remove_tid((o for o in old if o not in new), self.ind_map, tid)
-        self._add_tid((n for n in new if n not in old), self.ind_map, tid)
+        self._unshare_maps()
+        self._remove_tid((o for o in old if o not in new), self.ind_map, tid,
+                         self._owned_inds)
+        self._add_tid((n for n in new if n not in old), self.ind_map, tid,
+                      self._owned_inds)
 
     def calc_nsites(self):
         """Calculate how many tags there are which match ``structure``.
@@ -1672,8 +2859,9 @@ class TensorNetwork(object):
         t = self.tensor_map.pop(tid)
 
         # remove the tid from the tag and ind maps
-        self._remove_tid(t.tags, self.tag_map, tid)
-        self._remove_tid(t.inds, self.ind_map, tid)
+        self._unshare_maps()
+        self._remove_tid(t.tags, self.tag_map, tid, self._owned_tags)
+        self._remove_tid(t.inds, self.ind_map, tid, self._owned_inds)
 
         # remove this tensornetwork as an owner
         t.remove_owner(self)
@@ -2418,7 +3606,10 @@ class TensorNetwork(object):
         tensor_add_bond(T1, T2)
 
         bnd, = bonds(T1, T2)
+        self._unshare_maps()
         self.ind_map[bnd] = {tid1, tid2}
+        if self._owned_inds is not None:
+            self._owned_inds.add(bnd)
 
     def cut_bond(self, left_tags, right_tags, left_ind, right_ind):
         """Cut the bond between the tensors specified by ``left_tags`` and
@@ -2652,7 +3843,11 @@ class TensorNetwork(object):
         inplace : bool, optional
             Whether to perform the contraction inplace.
         opts
-            Passed to ``tensor_contract``.
+            Passed to ``tensor_contract``. E.g. supply ``max_size`` to bound
+            the size of intermediate tensors by slicing over inner indices,
+            and/or ``executor`` - e.g. a ``concurrent.futures`` pool or
+            :func:`~quimb.linalg.mpi_launcher.get_mpi_pool` - to perform
+            independent sub-contractions in parallel.
 
         Returns
         -------
@@ -3052,8 +4247,8 @@ class TensorNetwork(object):
     def __setstate__(self, state):
         # This allows picklings, by restoring the returned TN as owner
         self.__dict__ = state.copy()
-        for t in self.__dict__['tensor_map'].values():
-            t.add_owner(self, tid=rand_uuid(base="_T"))
+        for tid, t in self.__dict__['tensor_map'].items():
+            t.add_owner(self, tid)
 
     def __str__(self):
         return "{}([{}{}{}]{}{})".format(
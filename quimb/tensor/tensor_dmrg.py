@@ -1,8 +1,10 @@
 """DMRG-like variational algorithms, but in tensor network language.
 """
 
+import os
 import itertools
 import numpy as np
+import scipy.sparse.linalg as spla
 
 from ..utils import progbar
 from ..core import prod
@@ -12,8 +14,12 @@ from .tensor_core import (
     TensorNetwork,
     tensor_contract,
     TNLinearOperator,
+    BlockSparseTNLinearOperator,
     _asarray,
+    _get_executor_num_workers,
 )
+from .tensor_1d import _lrp_inds, _save_checkpoint, _load_checkpoint
+from . import block_sparse
 
 
 def get_default_opts(cyclic=False):
@@ -27,9 +33,20 @@ def get_default_opts(cyclic=False):
         Method used to compress sites after update.
     bond_compress_cutoff_mode : {'sum2', 'abs', 'rel'}
         How to perform compression truncation.
+    bond_expand_method : {'rand', 'subspace'}
+        How DMRG1 grows the bond dimension. 'rand' pads every bond with
+        random noise before each sweep, 'subspace' enriches each bond after
+        its site is updated with the action of the hamiltonian on the local
+        state, and then truncates it (the 'subspace expansion' of Hubig et
+        al., Phys. Rev. B 91, 155115 (2015)).
     bond_expand_rand_strength : float
         In DMRG1, strength of randomness to expand bonds with. Needed to avoid
         singular matrices after expansion.
+    bond_expand_subspace_alpha : float
+        In DMRG1, with ``bond_expand_method='subspace'``, the maximum amount
+        of the enrichment to mix into each bond. After the first two sweeps
+        the change in energy of the last sweep is used if smaller, so that
+        the expansion switches off as the energy converges.
     local_eig_tol : float
         Relative tolerance to solve inner eigenproblem to, larger = quicker but
         more unstable, default: 1e-3. Note this can be much looser than the
@@ -50,6 +67,12 @@ def get_default_opts(cyclic=False):
         Eigensovler tpye if ``local_eig_backend='slepc'``.
     local_eig_norm_dense : bool
         Force dense representation of the effective norm.
+    reuse_environments : bool
+        For OBC, when a sweep reverses the direction of the last one, turn
+        around the previous ``MovingEnvironment`` rather than forming a new
+        one, only recomputing environments that involve modified sites. Sites
+        modified with in-place changes to their data arrays should be flagged
+        with :meth:`~quimb.tensor.tensor_dmrg.DMRG.invalidate_envs`.
     periodic_segment_size : float or int
         How large (as a proportion if float) to make the 'segments' in periodic
         DMRG. During a sweep everything outside this (the 'long way round') is
@@ -83,7 +106,9 @@ def get_default_opts(cyclic=False):
         'default_sweep_sequence': 'R',
         'bond_compress_method': 'svd',
         'bond_compress_cutoff_mode': 'rel' if cyclic else 'sum2',
+        'bond_expand_method': 'rand',
         'bond_expand_rand_strength': 1e-6,
+        'bond_expand_subspace_alpha': 0.1,
         'local_eig_tol': 1e-3,
         'local_eig_ncv': 4,
         'local_eig_backend': None,
@@ -91,6 +116,7 @@ def get_default_opts(cyclic=False):
         'local_eig_EPSType': None,
         'local_eig_ham_dense': None,
         'local_eig_norm_dense': None,
+        'reuse_environments': True,
         'periodic_segment_size': 1 / 2,
         'periodic_compress_method': 'isvd',
         'periodic_compress_norm_eps': 1e-6,
@@ -234,6 +260,10 @@ class MovingEnvironment:
         self.n = tn.nsites
         self.structure = tn.structure
 
+        # the data of each site when it was last contracted into a left or
+        #     right environment, so that stale environments can be detected
+        self._site_data = {}
+
         if self.cyclic:
             self.eps = eps
             self.method = method
@@ -288,8 +318,9 @@ class MovingEnvironment:
                 self.envs[i] = self.envs[i + 1].copy(virtual=True)
                 self.envs[i] |= self.tnc.select(i)
                 self.envs[i] ^= ('_RIGHT', self.site_tag(i + self.bsz))
+                self._record_site(i + self.bsz)
 
-            self.envs[i] |= self.tnc['_LEFT']
+            self.envs[start] |= self.tnc['_LEFT']
             self.pos = start
 
         elif begin == 'right':
@@ -303,8 +334,9 @@ class MovingEnvironment:
                 self.envs[i] = self.envs[i - 1].copy(virtual=True)
                 self.envs[i] |= self.tnc.select(i + self.bsz - 1)
                 self.envs[i] ^= ('_LEFT', self.site_tag(i - 1))
+                self._record_site(i - 1)
 
-            self.envs[i] |= self.tnc['_RIGHT']
+            self.envs[stop - 1] |= self.tnc['_RIGHT']
             self.pos = stop - 1
 
         else:
@@ -366,6 +398,100 @@ class MovingEnvironment:
             self.tnc['_LEFT'] /= norm
             self.tnc['_RIGHT'] /= norm
 
+    def _get_site_data(self, i):
+        tids = self.tnc._get_tids_from_tags(i)
+        return {tid: (self.tnc.tensor_map[tid].data,
+                      self.tnc.tensor_map[tid].inds) for tid in tids}
+
+    def _record_site(self, i):
+        self._site_data[i % self.n] = self._get_site_data(i)
+
+    def invalidate(self, sites=None):
+        """Mark the environments involving ``sites`` (default: all) as stale,
+        so that :meth:`turn_around` recomputes them. Changes made through
+        :meth:`~quimb.tensor.tensor_core.Tensor.modify` are detected
+        automatically, this is needed only if the data of a tensor is
+        modified in-place, e.g. ``T.data[...] *= 2``.
+        """
+        if sites is None:
+            self._site_data.clear()
+        else:
+            for i in sites:
+                self._site_data.pop(i % self.n, None)
+
+    def _site_changed(self, i):
+        """Whether any tensor at site ``i`` has been modified since the site
+        was last contracted into an environment. Only new data arrays or
+        indices are detected, see :meth:`invalidate`.
+        """
+        old = self._site_data.get(i % self.n)
+        new = self._get_site_data(i)
+        return (old is None) or (old.keys() != new.keys()) or any(
+            (new[tid][0] is not data) or (new[tid][1] != inds)
+            for tid, (data, inds) in old.items())
+
+    def _insert_left_env(self, i):
+        """Contract the left env of site ``i - 1`` with that site, and insert
+        it into the env of site ``i``.
+        """
+        new_left = self.envs[i - 1].select(
+            ['_LEFT', self.site_tag(i - 1)], which='any')
+        self.envs[i] |= new_left ^ all
+        self._record_site(i - 1)
+
+    def _insert_right_env(self, i):
+        """Contract the right env of site ``i + bsz`` with that site, and
+        insert it into the env of site ``i``.
+        """
+        new_right = self.envs[i + 1].select(
+            ['_RIGHT', self.site_tag(i + self.bsz)], which='any')
+        self.envs[i] |= new_right ^ all
+        self._record_site(i + self.bsz)
+
+    def turn_around(self):
+        """Reverse the direction this (open boundary) environment sweeps in,
+        having reached the end of a sweep. Rather than starting again, this
+        reuses the environments formed along the way, only recomputing those
+        that depend on sites modified since they were contracted.
+        """
+        if self.cyclic:
+            raise NotImplementedError("Can only turn around open boundary "
+                                      "``MovingEnvironment`` instances.")
+
+        start, stop = self.segment.start, self.segment.stop
+        end = {'left': stop - 1, 'right': start}[self.begin]
+        if self.pos != end:
+            raise ValueError("Can only turn around at the end of a sweep, "
+                             "i.e. at site {}.".format(end))
+
+        if self.begin == 'left':
+            # left envs are kept up to the first modified site
+            stale = next((i + 1 for i in range(start, stop - 1)
+                          if self._site_changed(i)), stop)
+            for i in range(stale, stop):
+                self.envs[i].delete('_LEFT')
+                self._insert_left_env(i)
+
+            # and the right envs will be formed by moving left
+            for i in range(start, stop - 1):
+                self.envs[i].delete('_RIGHT')
+
+            self.begin = 'right'
+
+        else:
+            stale = next((i - self.bsz for i in
+                          reversed(range(start + self.bsz,
+                                         stop - 1 + self.bsz))
+                          if self._site_changed(i)), start - 1)
+            for i in reversed(range(start, stale + 1)):
+                self.envs[i].delete('_RIGHT')
+                self._insert_right_env(i)
+
+            for i in range(start + 1, stop):
+                self.envs[i].delete('_LEFT')
+
+            self.begin = 'left'
+
     def move_right(self):
         i = (self.pos + 1) % self.n
 
@@ -380,11 +506,7 @@ class MovingEnvironment:
         i0 = self.segment.start
 
         if i >= i0 + 1:
-            # insert the updated left env from previous step
-            # contract left env with updated site just to left
-            new_left = self.envs[i - 1].select(
-                ['_LEFT', self.site_tag(i - 1)], which='any')
-            self.envs[i] |= new_left ^ all
+            self._insert_left_env(i)
 
     def move_left(self):
         i = (self.pos - 1) % self.n
@@ -400,11 +522,7 @@ class MovingEnvironment:
         iN = self.segment.stop
 
         if i <= iN - 2:
-            # insert the updated right env from previous step
-            # contract right env with updated site just to right
-            new_right = self.envs[i + 1].select(
-                ['_RIGHT', self.site_tag(i + self.bsz)], which='any')
-            self.envs[i] |= new_right ^ all
+            self._insert_right_env(i)
 
     def move_to(self, i):
         """Move this effective environment to site ``i``.
@@ -441,6 +559,142 @@ def get_cyclic_canonizer(k, b, inv_tol=1e-10):
     return cyclic_canonizer
 
 
+class EffHamLinearOperator(spla.LinearOperator):
+    r"""A linear operator for the effective hamiltonian of a few sites of a
+    1D tensor network, i.e. a chain of tensors, for example::
+
+        +--     --+           a' s1' s2' b'
+        |    |    |   |        \  |   |  /
+        L----W1---W2---R   =    L-W1--W2-R
+        |    |    |   |        /  |   |  \
+        +--     --+           a  s1  s2  b
+
+    with exactly one of ``left_inds`` and one of ``right_inds`` on each
+    tensor. Unlike :class:`~quimb.tensor.tensor_core.TNLinearOperator`, the
+    contraction order is fixed - each tensor of the chain is absorbed into
+    the vector(s) in turn, which is optimal for this structure - and each
+    step is a single (batched) matrix multiplication into a workspace
+    buffer, which is allocated once per number of vectors and reused.
+
+    Parameters
+    ----------
+    tensors : sequence of Tensor or TensorNetwork
+        The tensors forming the chain, in any order.
+    left_inds : sequence of str
+        The 'left', output, indices of the operator.
+    right_inds : sequence of str
+        The 'right', input, indices of the operator, contracted with the
+        vector(s).
+
+    See Also
+    --------
+    TNLinearOperator
+    """
+
+    def __init__(self, tensors, left_inds, right_inds):
+        if isinstance(tensors, TensorNetwork):
+            tensors = tensors.tensors
+        tensors = tuple(tensors)
+        self.left_inds, self.right_inds = tuple(left_inds), tuple(right_inds)
+
+        lix, rix = set(self.left_inds), set(self.right_inds)
+        where = {}
+        for k, t in enumerate(tensors):
+            for ix in t.inds:
+                where.setdefault(ix, []).append(k)
+
+        def bonds(k):
+            return [ix for ix in tensors[k].inds if ix not in lix | rix]
+
+        for k, t in enumerate(tensors):
+            if (len(set(t.inds) & lix) != 1 or len(set(t.inds) & rix) != 1 or
+                    len(bonds(k)) > 2):
+                raise ValueError("Each tensor should have exactly one left "
+                                 "index, one right index and at most two "
+                                 "bonds, i.e. form a chain.")
+
+        # walk along the chain from one end
+        order = [next((k for k in range(len(tensors)) if len(bonds(k)) < 2),
+                      0)]
+        chain = [None]
+        while len(order) < len(tensors):
+            ix, = (ix for ix in bonds(order[-1]) if ix != chain[-1])
+            k, = (k for k in where[ix] if k != order[-1])
+            order.append(k)
+            chain.append(ix)
+        chain.append(None)
+
+        self._mats, udims, ldims, uinds, linds = [], [], [], [], []
+        for j, k in enumerate(order):
+            t = tensors[k]
+            u, = (ix for ix in t.inds if ix in rix)
+            l, = (ix for ix in t.inds if ix in lix)
+            bl, br = chain[j], chain[j + 1]
+
+            # reshape each tensor into a (bond_in * u, l * bond_out) matrix
+            inds = tuple(ix for ix in (bl, u, l, br) if ix is not None)
+            data = t.transpose(*inds).data
+            dl = 1 if bl is None else t.ind_size(bl)
+            self._mats.append(data.reshape(dl * t.ind_size(u), -1))
+
+            uinds.append(u)
+            linds.append(l)
+            udims.append(t.ind_size(u))
+            ldims.append(t.ind_size(l))
+
+        self._udims, self._ldims = tuple(udims), tuple(ldims)
+        self._uperm = tuple(map(self.right_inds.index, uinds))
+        self._lperm = tuple(map(linds.index, self.left_inds))
+        self.ldims = tuple(ldims[j] for j in self._lperm)
+        self.rdims = tuple(map(dict(zip(uinds, udims)).__getitem__,
+                               self.right_inds))
+        self._buffers = {}
+
+        super().__init__(dtype=np.result_type(*self._mats),
+                         shape=(prod(self.ldims), prod(self.rdims)))
+
+    def _get_buffers(self, nv, dtype):
+        """Get the workspace arrays for acting on ``nv`` vectors.
+        """
+        key = (nv, dtype)
+        if key not in self._buffers:
+            bufs = [np.empty((nv, *self._udims), dtype=dtype)]
+            size_l, size_u = nv, prod(self._udims)
+            for mat, du, dl in zip(self._mats, self._udims, self._ldims):
+                size_u //= du
+                bufs.append(np.empty((size_l, mat.shape[1], size_u),
+                                     dtype=dtype))
+                size_l *= dl
+            self._buffers[key] = bufs
+        return self._buffers[key]
+
+    def _matmat(self, mat):
+        nv = mat.shape[1]
+        dtype = np.result_type(self.dtype, mat)
+        x, *outs = self._get_buffers(nv, dtype)
+
+        # vectors first, then the right indices in chain order
+        np.copyto(x, mat.reshape(*self.rdims, nv).transpose(
+            -1, *self._uperm))
+
+        for A, out in zip(self._mats, outs):
+            P, n, Q = out.shape
+            if Q == 1:
+                np.matmul(x.reshape(P, -1), A, out=out.reshape(P, n))
+            else:
+                np.matmul(A.T, x.reshape(P, -1, Q), out=out)
+            x = out
+
+        # left indices in the requested order, then vectors
+        y = np.empty((self.shape[0], nv), dtype=dtype)
+        np.copyto(y.reshape(*self.ldims, nv), x.reshape(
+            nv, *self._ldims).transpose(*(1 + j for j in self._lperm), 0))
+        return y
+
+    def _matvec(self, vec):
+        return self._matmat(vec.reshape(-1, 1)).ravel()
+
+
 # --------------------------------------------------------------------------- #
 #                                  DMRG Base                                  #
 # --------------------------------------------------------------------------- #
@@ -543,6 +797,19 @@ class DMRG:
         self._set_bond_dim_seq(bond_dims)
         self._set_cutoff_seq(cutoffs)
 
+        # whether to work only with the symmetry allowed blocks of tensors
+        self.block_sparse = any(
+            isinstance(t.data, block_sparse.BlockSparseArray)
+            for t in ham.tensors)
+        if self.block_sparse:
+            if (bsz != 2) or self.cyclic:
+                raise NotImplementedError("Block-sparse DMRG is only "
+                                          "supported for DMRG2 with OBC.")
+            if p0 is None:
+                raise ValueError("A block-sparse hamiltonian needs a block-"
+                                 "sparse initial state ``p0``, which sets the "
+                                 "charge sector to search in.")
+
         # create internal states and ham
         if p0 is not None:
             self._k = p0.copy()
@@ -560,6 +827,8 @@ class DMRG:
         # want to contract this multiple times while
         #   manipulating k/b -> make virtual
         self.TN_energy = self._b | self.ham | self._k
+        self.ME_eff_ham = None
+        self._last_sweep = '0'
         self.energies = []
         self.local_energies = []
         self.total_energies = []
@@ -575,14 +844,21 @@ class DMRG:
 
         self.opts = get_default_opts(self.cyclic)
 
-    def _set_bond_dim_seq(self, bond_dims):
+    def _set_bond_dim_seq(self, bond_dims, skip=0):
         bds = (bond_dims,) if isinstance(bond_dims, int) else tuple(bond_dims)
         self._bond_dim0 = bds[0]
+        # keep track of the position in the sequence for checkpointing
+        self._bond_dim_seq, self._bond_dims_used = bds, skip
         self._bond_dims = itertools.chain(bds, itertools.repeat(bds[-1]))
+        for _ in range(skip):
+            next(self._bond_dims)
 
-    def _set_cutoff_seq(self, cutoffs):
+    def _set_cutoff_seq(self, cutoffs, skip=0):
         bds = (cutoffs,) if isinstance(cutoffs, float) else tuple(cutoffs)
+        self._cutoff_seq, self._cutoffs_used = bds, skip
         self._cutoffs = itertools.chain(bds, itertools.repeat(bds[-1]))
+        for _ in range(skip):
+            next(self._cutoffs)
 
     @property
     def energy(self):
@@ -605,6 +881,66 @@ class DMRG:
         elif (direction == 'left') and ((i > 0) or self.cyclic):
             self._k.right_canonize_site(i, bra=self._b)
 
+    def _expand_after_1site_update(self, direction, i, **compress_opts):
+        r"""Enrich the bond between site ``i``, having updated it, and the
+        next site of the sweep, with the hamiltonian acting on the local
+        state, then compress it. E.g. for ``direction='right'``::
+
+              i  i+1           i  i+1             i   i+1
+            >-o--<-       >-o==0-<-        >-o-<-
+            | |  |   -->  L-H-+| |    -->  | |  |
+                          | | P
+                          >-o-/
+
+        where the expansion ``P`` has bond the product of the MPS and MPO
+        bonds, and ``0`` is padding. Also serves to move the orthogonality
+        center along.
+        """
+        if self.cyclic:
+            raise NotImplementedError("Subspace expansion is only supported "
+                                      "for OBC.")
+
+        j, env_tag = {'right': (i + 1, '_LEFT'),
+                      'left': (i - 1, '_RIGHT')}[direction]
+        if not 0 <= j < self.n:
+            return
+
+        k, b = self._k, self._b
+        bond = k.bond(i, j)
+
+        # the hamiltonian acting on the local state, with the environment on
+        #     the side opposite site ``j``, and its bond to ``j`` left open
+        P = tensor_contract(*self._eff_ham.select_tensors(env_tag),
+                            self.ham[i], k[i])
+        P.reindex_(dict(zip(b[i].inds, k[i].inds)))
+        P.fuse_({bond: (self.ham.bond(i, j), bond)})
+        P.transpose_(*k[i].inds)
+
+        alpha = self.opts['bond_expand_subspace_alpha']
+        if len(self.energies) > 1:
+            alpha = min(alpha, abs(self.energies[-2] - self.energies[-1]))
+
+        ax = k[i].inds.index(bond)
+        Ti = Tensor(np.concatenate((k[i].data, alpha * P.data), axis=ax),
+                    inds=k[i].inds)
+
+        pads = [(0, 0)] * k[j].ndim
+        pads[k[j].inds.index(bond)] = (0, P.ind_size(bond))
+        Tj = Tensor(np.pad(k[j].data, pads, mode='constant'), inds=k[j].inds)
+
+        # compress the enlarged bond, leaving site i isometric
+        lix = tuple(ix for ix in k[i].inds if ix != bond)
+        Q, R = Ti.split(lix, get='tensors', right_inds=(bond,),
+                        absorb='right', **compress_opts)
+        R = (R @ Tj).reindex({R.inds[0]: bond})
+
+        Q.transpose_like_(k[i])
+        R.transpose_like_(k[j])
+
+        for site, T in ((i, Q), (j, R)):
+            k[site].modify(data=T.data)
+            b[site].modify(data=T.data.conj())
+
     def _eigs(self, A, B=None, v0=None):
         """Find single eigenpair, using all the internal settings.
         """
@@ -630,7 +966,7 @@ class DMRG:
         if Heff is None:
             site_en = "N/A"
         else:
-            site_en = np.asscalar(loc_gs.H @ (Heff @ loc_gs))
+            site_en = (loc_gs.H @ (Heff @ loc_gs)).item()
 
         print("Sweep {} -- fullE={} effcE={} siteE={}"
               "".format(sweep_num, full_en, effv_en, site_en))
@@ -661,6 +997,19 @@ class DMRG:
 
         # choose a rough value at which dense effective ham should not be used
         dense = self.opts['local_eig_ham_dense']
+
+        if self.block_sparse:
+            # act only on the allowed blocks of the current local state
+            Heff = BlockSparseTNLinearOperator(
+                self._eff_ham['_HAM'], lix, uix,
+                like=self._local_block_sparse_state(i, uix))
+
+            # forming the dense operator costs one matvec per column
+            if dense or ((dense is None) and (Heff.shape[0] < 64)):
+                Heff = Heff.to_dense()
+
+            return Heff, None
+
         if dense is None:
             dense = prod(dims) < 800
 
@@ -671,8 +1020,11 @@ class DMRG:
         if dense:
             # contract remaining hamiltonian and get its dense representation
             Heff = (self._eff_ham ^ '_HAM')['_HAM'].to_dense(lix, uix)
-        else:
+        elif self.cyclic:
             Heff = TNLinearOperator(self._eff_ham['_HAM'], **dims_inds)
+        else:
+            # the environments and MPO tensors form a simple chain
+            Heff = EffHamLinearOperator(self._eff_ham['_HAM'], lix, uix)
 
         # form effective norm
         if self.cyclic:
@@ -702,6 +1054,13 @@ class DMRG:
 
         return Heff, Neff
 
+    def _local_block_sparse_state(self, i, uix):
+        """Get the data of the current, block-sparse, local state at sites
+        ``i, ..., i + bsz - 1``, with indices ordered as ``uix``.
+        """
+        ts = (self._k[j] for j in range(i, i + self.bsz))
+        return tensor_contract(*ts, output_inds=uix).data
+
     def post_check(self, i, Neff, loc_gs, loc_en, loc_gs_old):
         """Perform some checks on the output of the local eigensolve.
         """
@@ -717,7 +1076,7 @@ class DMRG:
             loc_en -= self.opts['periodic_nullspace_fudge_factor']**0.5
 
             # this is helpful for identifying badly behaved numerics
-            Neffnorm = np.asscalar(loc_gs.H @ (Neff @ loc_gs))
+            Neffnorm = (loc_gs.H @ (Neff @ loc_gs)).item()
             if abs(Neffnorm - 1) > 10 * self.opts['local_eig_tol']:
                 raise DMRGError("Effective norm diverged to {}, check "
                                 "that Neff is positive?".format(Neffnorm))
@@ -764,9 +1123,12 @@ class DMRG:
 
         tot_en = self._eff_ham ^ all
 
-        self._canonize_after_1site_update(direction, i)
+        if self.opts['bond_expand_method'] == 'subspace':
+            self._expand_after_1site_update(direction, i, **compress_opts)
+        else:
+            self._canonize_after_1site_update(direction, i)
 
-        return np.asscalar(loc_en), tot_en
+        return loc_en.item(), tot_en
 
     def _update_local_state_2site(self, i, direction, **compress_opts):
         r"""Find the 2-site effective tensor groundstate of::
@@ -788,7 +1150,11 @@ class DMRG:
         Heff, Neff = self.form_local_ops(i, dims, lix, uix)
 
         # get the old 2-site local groundstate to use as initial guess
-        loc_gs_old = self._k[i].contract(self._k[i + 1]).to_dense(uix)
+        if self.block_sparse:
+            loc_like = self._local_block_sparse_state(i, uix)
+            loc_gs_old = block_sparse.to_vector(loc_like)
+        else:
+            loc_gs_old = self._k[i].contract(self._k[i + 1]).to_dense(uix)
 
         # find the 2-site local groundstate and energy
         loc_en, loc_gs = self._eigs(Heff, B=Neff, v0=loc_gs_old)
@@ -797,7 +1163,10 @@ class DMRG:
         loc_en, loc_gs = self.post_check(i, Neff, loc_gs, loc_en, loc_gs_old)
 
         # split the two site local groundstate
-        T_AB = Tensor(loc_gs.A.reshape(dims), uix)
+        if self.block_sparse:
+            T_AB = Tensor(block_sparse.from_vector(loc_gs.A, loc_like), uix)
+        else:
+            T_AB = Tensor(loc_gs.A.reshape(dims), uix)
         L, R = T_AB.split(left_inds=uix_L, get='arrays', absorb=direction,
                           right_inds=uix_R, **compress_opts)
 
@@ -821,7 +1190,7 @@ class DMRG:
 
         tot_en = self._eff_ham ^ all
 
-        return np.asscalar(loc_en), tot_en
+        return loc_en.item(), tot_en
 
     def _update_local_state(self, i, **update_opts):
         """Move envs to site ``i`` and dispatch to the correct local updater.
@@ -903,9 +1272,13 @@ class DMRG:
             }
             self.ME_eff_norm = MovingEnvironment(self.TN_norm, **nm_opts)
 
-        # setup moving energy environment
-        en_opts = {**env_opts, 'eps': self.opts['periodic_compress_ham_eps']}
-        self.ME_eff_ham = MovingEnvironment(self.TN_energy, **en_opts)
+        # setup moving energy environment, or reuse the last one
+        if self._can_reuse_envs(begin):
+            self.ME_eff_ham.turn_around()
+        else:
+            en_opts = {**env_opts,
+                       'eps': self.opts['periodic_compress_ham_eps']}
+            self.ME_eff_ham = MovingEnvironment(self.TN_energy, **en_opts)
 
         # perform the sweep, collecting local and total energies
         local_ens, tot_ens = zip(*[
@@ -923,8 +1296,29 @@ class DMRG:
             self.bond_sizes_ham.append(self.ME_eff_ham.bond_sizes)
             self.bond_sizes_norm.append(self.ME_eff_norm.bond_sizes)
 
+        self._last_sweep = {'right': 'R', 'left': 'L'}[direction]
+
         return tot_ens[-1]
 
+    def invalidate_envs(self, sites=None):
+        """Mark the stored environments involving ``sites`` (default: all) as
+        stale, so that the next sweep recomputes them. This is needed only if
+        the data of the state or hamiltonian is modified in-place rather than
+        through :meth:`~quimb.tensor.tensor_core.Tensor.modify`.
+        """
+        if self.ME_eff_ham is not None:
+            self.ME_eff_ham.invalidate(sites)
+
+    def _can_reuse_envs(self, begin):
+        """Whether the energy environment from the last sweep can be turned
+        around for a sweep starting from ``begin``.
+        """
+        me = self.ME_eff_ham
+        if (me is None) or self.cyclic or not self.opts['reuse_environments']:
+            return False
+        end = {'left': me.segment.stop - 1, 'right': me.segment.start}
+        return (me.begin != begin) and (me.pos == end[me.begin])
+
     def sweep_right(self, canonize=True, verbosity=0, **update_opts):
         return self.sweep(direction='R', canonize=canonize,
                           verbosity=verbosity, **update_opts)
@@ -965,6 +1359,76 @@ class DMRG:
             return False
         return abs(self.energies[-2] - self.energies[-1]) < tol
 
+    # --------------------------- checkpointing ----------------------------- #
+
+    def save_checkpoint(self, fname, sweeps_done=0):
+        """Atomically save the current state, energies, sweep direction and
+        position in the bond dimension and cutoff sequences to ``fname``, in
+        numpy's ``.npz`` format.
+
+        Parameters
+        ----------
+        fname : str
+            The file to save to.
+        sweeps_done : int, optional
+            The number of sweeps completed by the current call to
+            :meth:`~quimb.tensor.tensor_dmrg.DMRG.solve`, such that resuming
+            it can skip these.
+        """
+        _save_checkpoint(
+            fname, self._k,
+            energies=np.asarray(self.energies),
+            local_energies=np.concatenate([[]] + list(self.local_energies)),
+            total_energies=np.concatenate([[]] + list(self.total_energies)),
+            sweep_lengths=np.array(list(map(len, self.local_energies)), int),
+            last_sweep=self._last_sweep,
+            sweeps_done=sweeps_done,
+            bond_dim_seq=np.asarray(self._bond_dim_seq),
+            bond_dims_used=self._bond_dims_used,
+            cutoff_seq=np.asarray(self._cutoff_seq),
+            cutoffs_used=self._cutoffs_used)
+
+    def load_checkpoint(self, fname):
+        """Restore the state and progress saved with
+        :meth:`~quimb.tensor.tensor_dmrg.DMRG.save_checkpoint`. This
+        ``DMRG`` instance should have been created with the same
+        hamiltonian.
+
+        Parameters
+        ----------
+        fname : str
+            The file to load from.
+
+        Returns
+        -------
+        sweeps_done : int
+            The number of sweeps completed by the call to ``solve`` that
+            saved the checkpoint.
+        """
+        arrays, data = _load_checkpoint(fname, self._k)
+        for i, array in enumerate(arrays):
+            self._b[i].modify(data=array.conj(), inds=_lrp_inds(self._b, i))
+
+        self.energies = list(data['energies'])
+        splits = np.cumsum(data['sweep_lengths'])[:-1]
+        self.local_energies = list(map(
+            tuple, np.split(data['local_energies'], splits)))
+        self.total_energies = list(map(
+            tuple, np.split(data['total_energies'], splits)))
+        if not len(data['sweep_lengths']):
+            self.local_energies, self.total_energies = [], []
+
+        self._set_bond_dim_seq(tuple(map(int, data['bond_dim_seq'])),
+                               skip=int(data['bond_dims_used']))
+        self._set_cutoff_seq(tuple(map(float, data['cutoff_seq'])),
+                             skip=int(data['cutoffs_used']))
+        self._last_sweep = str(data['last_sweep'])
+
+        # all the environments need to be formed from scratch
+        self.ME_eff_ham = None
+
+        return int(data['sweeps_done'])
+
     # -------------------------- main solve driver -------------------------- #
 
     def solve(self,
@@ -973,7 +1437,10 @@ class DMRG:
               cutoffs=None,
               sweep_sequence=None,
               max_sweeps=10,
-              verbosity=0):
+              verbosity=0,
+              checkpoint=None,
+              checkpoint_every=1,
+              resume=False):
         """Solve the system with a sequence of sweeps, up to a certain
         absolute tolerance in the energy or maximum number of sweeps.
 
@@ -992,6 +1459,18 @@ class DMRG:
             The maximum number of sweeps to perform.
         verbosity : {0, 1, 2}, optional
             How much information to print about progress.
+        checkpoint : str, optional
+            If given, a file to (atomically) save the state and progress to,
+            see :meth:`~quimb.tensor.tensor_dmrg.DMRG.save_checkpoint`.
+        checkpoint_every : int, optional
+            Save the checkpoint every this many sweeps, as well as after the
+            final sweep.
+        resume : bool, optional
+            If ``checkpoint`` exists, first load it and carry on from where
+            the call to ``solve`` that wrote it left off, skipping its
+            completed sweeps. The bond dimension and cutoff sequences are
+            restored from the checkpoint, rather than taken from
+            ``bond_dims`` and ``cutoffs``.
 
         Returns
         -------
@@ -1008,19 +1487,31 @@ class DMRG:
         if sweep_sequence is None:
             sweep_sequence = self.opts['default_sweep_sequence']
 
-        RLs = itertools.cycle(sweep_sequence)
-        previous_LR = '0'
+        if resume and (checkpoint is not None) and os.path.exists(checkpoint):
+            sweeps_done = self.load_checkpoint(checkpoint)
+            if self._check_convergence(tol):
+                return True
+        else:
+            sweeps_done = 0
+
+        RLs = itertools.islice(itertools.cycle(sweep_sequence),
+                               sweeps_done, None)
+        # carry on from the last sweep, e.g. of a previous call
+        previous_LR = self._last_sweep
+        converged = False
 
-        for _ in range(max_sweeps):
+        for sweep_i in range(sweeps_done, max_sweeps):
             # Get the next direction, bond dimension and cutoff
             LR, bd, ctf = next(RLs), next(self._bond_dims), next(self._cutoffs)
+            self._bond_dims_used += 1
+            self._cutoffs_used += 1
             self._print_pre_sweep(len(self.energies), LR,
                                   bd, ctf, verbosity=verbosity)
 
             # if last sweep was in opposite direction no need to canonize
             canonize = False if LR + previous_LR in {'LR', 'RL'} else True
             # need to manually expand bond dimension for DMRG1
-            if self.bsz == 1:
+            if (self.bsz == 1) and (self.opts['bond_expand_method'] == 'rand'):
                 self._k.expand_bond_dimension(
                     bd, bra=self._b,
                     rand_strength=self.opts['bond_expand_rand_strength'])
@@ -1042,6 +1533,12 @@ class DMRG:
             # check convergence
             converged = self._check_convergence(tol)
             self._print_post_sweep(converged, verbosity=verbosity)
+
+            if checkpoint is not None:
+                last = converged or (sweep_i == max_sweeps - 1)
+                if last or ((sweep_i + 1) % checkpoint_every == 0):
+                    self.save_checkpoint(checkpoint, sweeps_done=sweep_i + 1)
+
             if converged:
                 break
 
@@ -1078,6 +1575,438 @@ class DMRG2(DMRG):
                          which=which, p0=p0, bsz=2)
 
 
+# --------------------------------------------------------------------------- #
+#                          Real-space parallel DMRG                           #
+# --------------------------------------------------------------------------- #
+
+def _canonize_segment_pair(kets, bras, i, j):
+    """Move the orthogonality center of a segment from site ``i`` to the
+    neighbouring site ``j``, by QR decomposing ``kets[i]``.
+    """
+    T1, T2 = kets[i], kets[j]
+    rix, lix = T1.filter_bonds(T2)
+
+    Q, R = T1.split(lix, get='tensors', right_inds=rix, method='qr')
+    R = R @ T2
+
+    Q.transpose_like_(T1)
+    R.transpose_like_(T2)
+
+    for t, new in ((T1, Q), (T2, R)):
+        t.modify(data=new.data)
+    bras[i].modify(data=Q.data.conj())
+    bras[j].modify(data=R.data.conj())
+
+
+def _sweep_segment(kets, bras, hams, envs, direction, which='SA',
+                   eig_opts=None, dense=None, **compress_opts):
+    """Perform a single 2-site DMRG sweep over an isolated segment of a chain,
+    given the (fixed) environments either side of it. This is the unit of
+    work of :class:`~quimb.tensor.tensor_dmrg.DMRG2Parallel` and so only
+    takes and returns raw arrays, so as to be cheap to send to a worker.
+
+    Parameters
+    ----------
+    kets : sequence of (array, tuple[str])
+        The data and indices of the ket tensor at each site.
+    bras : sequence of tuple[str]
+        The indices of the bra tensor at each site, the data is assumed to be
+        the conjugate of the ket data.
+    hams : sequence of (array, tuple[str])
+        The data and indices of the operator tensor at each site.
+    envs : (None or (array, tuple[str]), None or (array, tuple[str]))
+        The left and right environment of the segment, if any.
+    direction : {'right', 'left'}
+        Which way to sweep. The segment is first canonized so that the
+        orthogonality center is at the opposite end.
+    which : {'SA', 'LA'}, optional
+        Whether to search for the smallest or largest eigenvectors.
+    eig_opts : dict, optional
+        Supplied to :func:`~quimb.linalg.base_linalg.eigh`.
+    dense : bool, optional
+        Whether to use a dense effective hamiltonian, by default only if its
+        size is less than 800.
+    compress_opts
+        Supplied to :func:`~quimb.tensor.tensor_core.tensor_split`.
+
+    Returns
+    -------
+    arrays : tuple[array]
+        The new data for each ket tensor.
+    local_energies : tuple[float]
+        The local energy found at each step of the sweep.
+    env : (array, tuple[str])
+        The environment of the last site swept to, i.e. of the last site if
+        sweeping right, including the left environment and the rest of the
+        segment, or of the first site if sweeping left.
+    """
+    n = len(kets)
+    site_tag = 'I{}'.format
+    eig_opts = {} if eig_opts is None else eig_opts
+
+    ks, bs, ts = [], [], []
+    for i, ((kdata, kinds), binds, (hdata, hinds)) in enumerate(
+            zip(kets, bras, hams)):
+        ks.append(Tensor(kdata, kinds, tags={site_tag(i), '_KET'}))
+        bs.append(Tensor(kdata.conj(), binds, tags={site_tag(i), '_BRA'}))
+        ts.append(Tensor(hdata, hinds, tags={site_tag(i), '_HAM'}))
+
+    # the environments are simply part of the operator at the end sites
+    for site, env in zip((0, n - 1), envs):
+        if env is not None:
+            ts.append(Tensor(*env, tags={site_tag(site), '_HAM'}))
+
+    tn = TensorNetwork((*bs, *ts, *ks), structure='I{}', nsites=n,
+                       virtual=True, check_collisions=False)
+
+    begin, sweep, centers = {
+        'right': ('left', range(0, n - 1), range(n - 1, 0, -1)),
+        'left': ('right', range(n - 2, -1, -1), range(0, n - 1)),
+    }[direction]
+
+    for i in centers:
+        _canonize_segment_pair(ks, bs, i, i + {'left': -1, 'right': 1}[begin])
+
+    me = MovingEnvironment(tn, begin=begin, bsz=2)
+
+    local_ens = []
+    for i in sweep:
+        me.move_to(i)
+        eff_ham = me()
+
+        u_bond_ind, = ks[i].bonds(ks[i + 1])
+        l_bond_ind, = bs[i].bonds(bs[i + 1])
+        uix_L = tuple(ix for ix in ks[i].inds if ix != u_bond_ind)
+        uix_R = tuple(ix for ix in ks[i + 1].inds if ix != u_bond_ind)
+        lix_L = tuple(ix for ix in bs[i].inds if ix != l_bond_ind)
+        lix_R = tuple(ix for ix in bs[i + 1].inds if ix != l_bond_ind)
+        uix, lix = uix_L + uix_R, lix_L + lix_R
+        dims = (*map(ks[i].ind_size, uix_L), *map(ks[i + 1].ind_size, uix_R))
+
+        if dense or ((dense is None) and (prod(dims) < 800)):
+            Heff = (eff_ham ^ '_HAM')['_HAM'].to_dense(lix, uix)
+        else:
+            Heff = TNLinearOperator(eff_ham['_HAM'], ldims=dims, rdims=dims,
+                                    left_inds=lix, right_inds=uix)
+
+        loc_gs_old = ks[i].contract(ks[i + 1]).to_dense(uix)
+        loc_en, loc_gs = eigh(Heff, k=1, which=which, v0=loc_gs_old,
+                              **eig_opts)
+
+        T_AB = Tensor(loc_gs.A.reshape(dims), uix)
+        L, R = T_AB.split(left_inds=uix_L, get='arrays', absorb=direction,
+                          right_inds=uix_R, **compress_opts)
+
+        ks[i].modify(data=L, inds=(*uix_L, u_bond_ind))
+        bs[i].modify(data=L.conj(), inds=(*lix_L, l_bond_ind))
+        ks[i + 1].modify(data=R, inds=(u_bond_ind, *uix_R))
+        bs[i + 1].modify(data=R.conj(), inds=(l_bond_ind, *lix_R))
+
+        local_ens.append(loc_en.item())
+
+    # the environment of the site at the end of the sweep, which includes
+    #     the (updated) rest of the segment, for a neighbouring segment
+    env = me().select(
+        {'right': ['_LEFT', site_tag(n - 2)],
+         'left': ['_RIGHT', site_tag(1)]}[direction], which='any') ^ all
+
+    # the splits might have permuted the indices
+    arrays = tuple(k.transpose(*kinds).data for k, (_, kinds) in zip(ks, kets))
+
+    return arrays, tuple(local_ens), (env.data, env.inds)
+
+
+def _bond_singular_values(T, ind):
+    """Get the singular values of bond ``ind`` of ``T``, assuming that the
+    rest of the network on that side is isometric, and that it is in the
+    basis of right singular vectors on the other side.
+    """
+    ax = T.inds.index(ind)
+    x = np.moveaxis(T.data, ax, 0).reshape(T.ind_size(ind), -1)
+    return np.linalg.norm(x, axis=1)
+
+
+def _scale_bond(T, ind, scale):
+    """Scale the bond ``ind`` of tensor ``T`` by the vector ``scale``.
+    """
+    shape = [1] * T.ndim
+    shape[T.inds.index(ind)] = -1
+    return T.data * scale.reshape(shape)
+
+
+class DMRG2Parallel(DMRG2):
+    r"""Real-space parallel two site DMRG, following Stoudenmire & White,
+    Phys. Rev. B 87, 155137 (2013). The chain is split into ``num_segments``
+    segments, each of which is swept independently, with the environments
+    of the rest of the chain held fixed, by a separate worker of
+    ``executor``. In between these the bonds joining neighbouring segments
+    are optimized, again in parallel.
+
+    On each boundary bond the state is kept in the form::
+
+        ... ->->->-s-V-s-<-<-<- ...
+            | | | |   | | | |
+
+    where ``s`` are the singular values of the bond, and ``V`` their
+    inverse, such that the environment each segment sees is (approximately)
+    orthonormal. Each call to :meth:`sweep` consists of two half steps, in
+    the first even segments are swept right and odd segments left, after
+    which the boundary between each pair is optimized, in the second the
+    directions and boundaries are swapped. Unlike normal DMRG the
+    environments of each segment can lag behind the rest of the chain,
+    this error vanishes as the algorithm converges, and the energy reported
+    after each sweep is always that of the full state.
+
+    Parameters
+    ----------
+    ham : MatrixProductOperator
+        The hamiltonian in MPO form, with open boundary conditions.
+    which : {'SA', 'LA'}, optional
+        Whether to search for smallest or largest real part eigenvectors.
+    bond_dims : int or sequence of ints.
+        The bond-dimension(s) of the MPS to optimize, see
+        :class:`~quimb.tensor.tensor_dmrg.DMRG`.
+    cutoffs : float or sequence of floats
+        The cutoff threshold(s) to use when compressing.
+    p0 : MatrixProductState, optional
+        If given, use as the initial state.
+    num_segments : int, optional
+        How many segments to split the chain into, each of which should have
+        at least two sites. Defaults to the number of workers of
+        ``executor``, or 2 if there is no executor.
+    executor : executor, optional
+        A ``concurrent.futures`` like pool, e.g. a ``ProcessPoolExecutor``
+        or the pool from :func:`~quimb.linalg.mpi_launcher.get_mpi_pool`, to
+        sweep the segments with. If not given the segments are swept one
+        after another in this process.
+    """
+
+    def __init__(self, ham, which='SA', bond_dims=None, cutoffs=1e-8, p0=None,
+                 num_segments=None, executor=None):
+
+        super().__init__(ham, which=which, bond_dims=bond_dims,
+                         cutoffs=cutoffs, p0=p0)
+
+        if self.cyclic or self.block_sparse:
+            raise NotImplementedError("Parallel DMRG is only supported for "
+                                      "dense hamiltonians with OBC.")
+
+        if num_segments is None:
+            num_segments = (2 if executor is None else
+                            _get_executor_num_workers(executor))
+        if self.n < 2 * num_segments:
+            raise ValueError("Need at least two sites per segment, but have "
+                             "{} sites and {} segments."
+                             "".format(self.n, num_segments))
+
+        self.executor = executor
+        bounds = np.linspace(0, self.n, num_segments + 1).astype(int)
+        self.segments = tuple(map(range, bounds[:-1], bounds[1:]))
+
+        # the singular values of each bond between segments, where the
+        #     first site of the segment to the right has their inverse
+        #     absorbed - only valid when not None
+        self._boundary_svals = None
+
+    def load_checkpoint(self, fname):
+        sweeps_done = super().load_checkpoint(fname)
+        self._boundary_svals = None
+        return sweeps_done
+
+    load_checkpoint.__doc__ = DMRG.load_checkpoint.__doc__
+
+    def _init_boundary_svals(self):
+        """Bring the state into right canonical form, with each boundary
+        bond in the basis of its singular vectors, record the singular
+        values and form the environments of each segment.
+        """
+        self._k.left_canonize(bra=self._b)
+
+        starts = {seg.start for seg in self.segments[1:]}
+        self._boundary_svals = {}
+
+        for i in range(self.n - 1, 0, -1):
+            self._k._right_decomp_site(i, bra=self._b, method='svd',
+                                       absorb='left')
+            if i in starts:
+                self._boundary_svals[i] = _bond_singular_values(
+                    self._k[i - 1], self._k.bond(i - 1, i))
+
+        # contract the left and right environments of every segment
+        self._segment_envs = [[None, None] for _ in self.segments]
+        for j in range(1, len(self.segments)):
+            self._segment_envs[j][0] = self._contract_env(
+                self.segments[j - 1], self._segment_envs[j - 1][0])
+        for j in reversed(range(len(self.segments) - 1)):
+            self._segment_envs[j][1] = self._contract_env(
+                reversed(self.segments[j + 1]), self._segment_envs[j + 1][1])
+
+    def _contract_env(self, sites, env=None):
+        """Contract the sites ``sites`` of the energy network, in order,
+        into the environment ``env``.
+        """
+        for i in sites:
+            ts = self.TN_energy.select_tensors(self._k.site_tag(i))
+            env = tensor_contract(*ts, *(() if env is None else (env,)))
+        return env
+
+    def _submit(self, fn, *args, **kwargs):
+        if self.executor is None:
+            return fn(*args, **kwargs)
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def _get_results(self, fs):
+        if self.executor is None:
+            return fs
+        return [f.result() for f in fs]
+
+    def _worker_args(self, sites, envs):
+        kets = [(self._k[i].data, self._k[i].inds) for i in sites]
+        bras = [self._b[i].inds for i in sites]
+        hams = [(self.ham[i].data, self.ham[i].inds) for i in sites]
+        envs = tuple(None if env is None else (env.data, env.inds)
+                     for env in envs)
+        return kets, bras, hams, envs
+
+    def _worker_opts(self, **update_opts):
+        eig_opts = {
+            'backend': self.opts['local_eig_backend'],
+            'EPSType': self.opts['local_eig_EPSType'],
+            'ncv': self.opts['local_eig_ncv'],
+            'tol': self.opts['local_eig_tol'],
+            'maxiter': self.opts['local_eig_maxiter'],
+            'fallback_to_scipy': True,
+        }
+        return {'which': self.which, 'eig_opts': eig_opts,
+                'dense': self.opts['local_eig_ham_dense'], **update_opts}
+
+    def _set_sites(self, sites, arrays):
+        for i, data in zip(sites, arrays):
+            self._k[i].modify(data=data)
+            self._b[i].modify(data=data.conj())
+
+    def _sweep_segments(self, phase, **worker_opts):
+        """Sweep every segment, in parallel, with even segments sweeping
+        right and odd segments left if ``phase == 0``, and vice versa.
+        Return the environments of the site each segment finishes at.
+        """
+        svals = self._boundary_svals
+
+        fs = []
+        for j, seg in enumerate(self.segments):
+            kets, bras, hams, (lenv, renv) = self._worker_args(
+                seg, self._segment_envs[j])
+
+            if seg.start in svals:
+                # move the boundary singular values into the segment, and
+                #     their inverse into its left environment
+                s = svals[seg.start]
+                kix = self._k.bond(seg.start - 1, seg.start)
+                bix = self._b.bond(seg.start - 1, seg.start)
+                T = self._k[seg.start]
+                kets[0] = (_scale_bond(T, kix, s), T.inds)
+                L = Tensor(*lenv)
+                L.modify(data=_scale_bond(L, kix, 1 / s))
+                L.modify(data=_scale_bond(L, bix, 1 / s))
+                lenv = (L.data, L.inds)
+
+            direction = 'right' if (j + phase) % 2 == 0 else 'left'
+            fs.append(self._submit(_sweep_segment, kets, bras, hams,
+                                   (lenv, renv), direction, **worker_opts))
+
+        local_ens, end_envs = [], []
+        for seg, (arrays, ens, env) in zip(self.segments,
+                                           self._get_results(fs)):
+            if seg.start in svals:
+                T = Tensor(arrays[0], self._k[seg.start].inds)
+                bix = self._k.bond(seg.start - 1, seg.start)
+                arrays = (_scale_bond(T, bix, 1 / svals[seg.start]),
+                          *arrays[1:])
+            self._set_sites(seg, arrays)
+            local_ens.extend(ens)
+            end_envs.append(Tensor(*env))
+
+        return local_ens, end_envs
+
+    def _update_boundaries(self, phase, end_envs, **worker_opts):
+        """Optimize the bonds between each segment that has swept right and
+        the segment to its right that has swept left, in parallel, then
+        update their singular values and pass the new environments across.
+        """
+        js = [j for j in range(len(self.segments) - 1) if (j + phase) % 2 == 0]
+
+        fs = []
+        for j in js:
+            i = self.segments[j + 1].start
+            kets, bras, hams, envs = self._worker_args(
+                (i - 1, i), (end_envs[j], end_envs[j + 1]))
+            # absorb the new singular values left -> ``V`` is identity
+            fs.append(self._submit(_sweep_segment, kets, bras, hams, envs,
+                                   'left', **worker_opts))
+
+        local_ens = []
+        for j, (arrays, ens, env) in zip(js, self._get_results(fs)):
+            i = self.segments[j + 1].start
+            self._set_sites((i - 1, i), arrays)
+            self._boundary_svals[i] = _bond_singular_values(
+                self._k[i - 1], self._k.bond(i - 1, i))
+
+            self._segment_envs[j][1] = Tensor(*env)
+            self._segment_envs[j + 1][0] = self._contract_env(
+                (i - 1,), end_envs[j])
+            local_ens.extend(ens)
+
+        return local_ens
+
+    def sweep(self, direction, canonize=True, verbosity=0, **update_opts):
+        r"""Perform a parallel sweep of every segment, in both directions,
+        and optimize every boundary between segments.
+
+        Parameters
+        ----------
+        direction : {'R', 'L'}
+            Whether the even segments sweep right (->) or left (<-) first.
+        canonize : bool, optional
+            Ignored, the segments are always canonized as needed.
+        verbosity : {0, 1, 2}, optional
+            Show a progress bar over the half steps of the sweep.
+        update_opts :
+            Supplied to :func:`~quimb.tensor.tensor_core.tensor_split` when
+            compressing each bond.
+
+        Returns
+        -------
+        energy : float
+            The energy of the full state after the sweep.
+        """
+        if self._boundary_svals is None:
+            self._init_boundary_svals()
+
+        phases = {'R': (0, 1), 'L': (1, 0)}[direction]
+        if verbosity:
+            phases = progbar(phases, ncols=80, total=2)
+
+        worker_opts = self._worker_opts(**update_opts)
+
+        local_ens = []
+        for phase in phases:
+            ens, end_envs = self._sweep_segments(phase, **worker_opts)
+            local_ens.extend(ens)
+            local_ens.extend(self._update_boundaries(phase, end_envs,
+                                                     **worker_opts))
+
+        if verbosity:
+            phases.close()
+
+        energy = (self.TN_energy ^ ...) / (self._k.H @ self._k)
+
+        self.local_energies.append(tuple(local_ens))
+        self.total_energies.append((energy,))
+        self._last_sweep = direction
+
+        return energy
+
+
 # --------------------------------------------------------------------------- #
 #                                    DMRGX                                    #
 # --------------------------------------------------------------------------- #
@@ -1134,6 +2063,7 @@ class DMRGX(DMRG):
             'bond_compress_method': 'svd',
             'bond_compress_cutoff_mode': 'sum2',
             'default_sweep_sequence': 'RRLL',
+            'bond_expand_method': 'rand',
             'bond_expand_rand_strength': 1e-9,
         }
 
@@ -495,6 +495,11 @@ class SpinHam:
         >>> mpo_ham
         <MatrixProductOperator(tensors=100, structure='I{}', nsites=100)>
 
+    Or a block-sparse version that conserves total ``Sz``, by giving the
+    charge - here ``2 * Sz`` - of each spin state:
+
+        >>> mpo_ham = builder.build_mpo(100, phys_charges=[3, 1, -1, -3])
+
     Build a NNI version of the hamiltonian for use with TEBD:
 
         >>> builder.build_nni(100)
@@ -605,9 +610,15 @@ class SpinHam:
             self.var_two_site_terms[sites] = terms
 
     def build_mpo(self, n, upper_ind_id='k{}', lower_ind_id='b{}',
-                  site_tag_id='I{}', tags=None, bond_name=""):
+                  site_tag_id='I{}', tags=None, bond_name="",
+                  phys_charges=None, symmetry='U1'):
         """Build an MPO instance of this spin hamiltonian of size ``n``. See
         also ``MatrixProductOperator``.
+
+        If ``phys_charges`` is given, e.g. ``[1, -1]`` for the ``2 * Sz``
+        values of a spin-1/2, build a block-sparse MPO conserving the
+        ``symmetry`` with those charges, see
+        :meth:`~quimb.tensor.tensor_1d.MatrixProductOperator.to_block_sparse`.
         """
         # cache the default term
         t_defs = {}
@@ -638,10 +649,15 @@ class SpinHam:
                     yield spin_ham_mpo_tensor(t1s, t2s, S=self.S,
                                               which=which, cyclic=self.cyclic)
 
-        return MatrixProductOperator(arrays=gen_tensors(), bond_name=bond_name,
-                                     upper_ind_id=upper_ind_id,
-                                     lower_ind_id=lower_ind_id,
-                                     site_tag_id=site_tag_id, tags=tags)
+        mpo = MatrixProductOperator(arrays=gen_tensors(), bond_name=bond_name,
+                                    upper_ind_id=upper_ind_id,
+                                    lower_ind_id=lower_ind_id,
+                                    site_tag_id=site_tag_id, tags=tags)
+
+        if phys_charges is not None:
+            mpo.to_block_sparse_(phys_charges, symmetry=symmetry)
+
+        return mpo
 
     def _get_spin_op(self, factor, *ss):
         if len(ss) == 1:
@@ -0,0 +1,332 @@
+"""Time dependent variational principle (TDVP) evolution of matrix product
+states with matrix product operator hamiltonians.
+"""
+import quimb as qu
+from ..linalg.base_linalg import expm_multiply
+from .tensor_core import Tensor, rand_uuid
+from .tensor_dmrg import (
+    MovingEnvironment,
+    EffHamLinearOperator,
+    parse_2site_inds_dims,
+)
+
+
+class TDVP:
+    r"""Class implementing the time dependent variational principle (TDVP)
+    for matrix product states [1], using the symmetric, second order,
+    projector splitting integrator. Each step consists of a sweep right then a
+    sweep left, in which the local tensors are evolved forwards in time by
+    half the time step::
+
+        >->->-/|\-<-<-<          /|\
+        | | |  |  | | |         / | \
+        H-H-H--H--H-H-H   -->  L--H--R   exp(-i dt/2 Heff)
+        | | | i|  | | |         \ | /
+        >->->-\|/-<-<-<          \|/
+
+    and the left over bond (``bsz=1``) or site (``bsz=2``) tensors are evolved
+    backwards in time, in the same way, before moving the orthogonality centre
+    on. Unlike :class:`~quimb.tensor.tensor_tebd.TEBD`, any, possibly long
+    range, hamiltonian given as an MPO can be used. The local evolutions are
+    performed with :func:`~quimb.linalg.base_linalg.expm_multiply_lanczos`.
+
+    [1] Jutho Haegeman, Christian Lubich, Ivan Oseledets, Bart Vandereycken
+    and Frank Verstraete, Unifying time evolution and optimization with
+    matrix product states, PRB 94, 165116 (2016)
+
+    Parameters
+    ----------
+    p0 : MatrixProductState
+        Initial state.
+    H : MatrixProductOperator
+        The hamiltonian, for example from
+        :meth:`~quimb.tensor.tensor_gen.SpinHam.build_mpo`.
+    dt : float, optional
+        Default time step.
+    t0 : float, optional
+        Initial time. Defaults to 0.0.
+    bsz : {2, 1}, optional
+        The number of sites to evolve at once. The single site integrator
+        conserves energy exactly and is cheaper, but cannot change the bond
+        dimensions of ``p0``, which should thus be large enough to start with.
+    split_opts : dict, optional
+        Compression options applied for splitting after the two site
+        evolutions, see :func:`~quimb.tensor.tensor_core.tensor_split`.
+    expm_opts : dict, optional
+        Supplied to :func:`~quimb.linalg.base_linalg.expm_multiply_lanczos`.
+
+    See Also
+    --------
+    TEBD, quimb.Evolution
+    """
+
+    def __init__(self, p0, H, dt=None, t0=0.0, bsz=2,
+                 split_opts=None, expm_opts=None, progbar=True):
+        if p0.cyclic or H.cyclic:
+            raise NotImplementedError("TDVP is only supported for OBC.")
+        if bsz not in (1, 2):
+            raise ValueError("``bsz`` should be 1 or 2.")
+
+        self.N = p0.nsites
+        self.bsz = bsz
+
+        # prepare initial state, orthogonality centre at the left
+        self._k = p0.copy()
+        self._k.canonize(0)
+        self._b = self._k.H
+        self.H = H.copy()
+        self._k.add_tag('_KET')
+        self._b.add_tag('_BRA')
+        self.H.add_tag('_HAM')
+        self._k.align_(self.H, self._b)
+
+        self.ME_eff_ham = MovingEnvironment(
+            self._b | self.H | self._k, begin='left', bsz=bsz)
+
+        self.t0 = self.t = t0
+        self.dt = dt
+
+        # misc other options
+        self.progbar = progbar
+        self.split_opts = {} if split_opts is None else dict(split_opts)
+        self.expm_opts = {} if expm_opts is None else dict(expm_opts)
+
+    @property
+    def pt(self):
+        """The MPS state of the system at the current time.
+        """
+        copy = self._k.copy()
+        copy.drop_tags('_KET')
+        return copy
+
+    def _evolve(self, tensors, lix, uix, x, tau):
+        """Evolve ``x`` by ``exp(-i tau Heff)``, with ``Heff`` the chain of
+        ``tensors`` mapping indices ``uix`` to ``lix``.
+        """
+        Heff = EffHamLinearOperator(tensors, lix, uix)
+        return expm_multiply(Heff, x.ravel(), backend='lanczos',
+                             t=-1.0j * tau, **self.expm_opts).reshape(x.shape)
+
+    def _set_site(self, i, T):
+        """Insert tensor ``T`` as the new site ``i``, in the ket and bra.
+        """
+        data = T.transpose(*self._k[i].inds).data
+        self._k[i].modify(data=data)
+        self._b[i].modify(data=data.conj())
+
+    def _evolve_site(self, i, tensors, tau):
+        """Evolve site ``i`` with the effective hamiltonian ``tensors``.
+        """
+        k, b = self._k, self._b
+        self._set_site(i, Tensor(
+            self._evolve(tensors, b[i].inds, k[i].inds, k[i].data, tau),
+            inds=k[i].inds))
+
+    def _split_site(self, i, j):
+        """Split site ``i``, just evolved, into an isometry, left in place,
+        and the tensor of its bond to neighbour ``j``, which is returned.
+        """
+        k = self._k
+        bond = k.bond(i, j)
+        other = tuple(ix for ix in k[i].inds if ix != bond)
+
+        if j > i:
+            Q, C = k[i].split(other, method='qr', get='arrays',
+                              right_inds=(bond,))
+            self._set_site(i, Tensor(Q, inds=(*other, bond)))
+        else:
+            C, Q = k[i].split((bond,), method='lq', get='arrays',
+                              right_inds=other)
+            self._set_site(i, Tensor(Q, inds=(bond, *other)))
+
+        return C
+
+    def _evolve_bond(self, i, j, C, L, R, tau):
+        r"""Evolve the bond tensor ``C`` between sites ``i`` and ``j``
+        backwards in time, then absorb it into site ``j``, e.g. for
+        ``j = i + 1``::
+
+             i    j
+            ->-C--<-  ,   /-C-\
+             |    |       L-+-R   exp(+i tau Keff)
+                          \   /
+
+        ``L`` and ``R`` are the environments either side of the bond.
+        """
+        k, b = self._k, self._b
+        bond, bix = k.bond(i, j), b.bond(i, j)
+
+        # the bond has different sizes either side of ``C``
+        tk, tb = rand_uuid(), rand_uuid()
+        if j > i:
+            L = L.reindex({bond: tk, bix: tb})
+            lix, uix = (tb, bix), (tk, bond)
+        else:
+            R = R.reindex({bond: tk, bix: tb})
+            lix, uix = (bix, tb), (bond, tk)
+
+        C = Tensor(self._evolve((L, R), lix, uix, C, -tau), inds=uix)
+        self._set_site(j, (C @ k[j]).reindex({tk: bond}))
+
+    def _sweep_1site(self, direction, tau):
+        me = self.ME_eff_ham
+        sweep, j = {
+            'right': (range(0, self.N), 1),
+            'left': (range(self.N - 1, -1, -1), -1),
+        }[direction]
+
+        for i in sweep:
+            me.move_to(i)
+            env = me()
+            self._evolve_site(i, env['_HAM'], tau)
+
+            if i + j not in range(self.N):
+                break
+
+            # move the env on once site i is isometric, then evolve the bond
+            C = self._split_site(i, i + j)
+            if direction == 'right':
+                R, = env.select_tensors('_RIGHT')
+                me.move_right()
+                L, = me().select_tensors('_LEFT')
+            else:
+                L, = env.select_tensors('_LEFT')
+                me.move_left()
+                R, = me().select_tensors('_RIGHT')
+            self._evolve_bond(i, i + j, C, L, R, tau)
+
+    def _sweep_2site(self, direction, tau):
+        k, b, me = self._k, self._b, self.ME_eff_ham
+        sweep, absorb = {
+            'right': (range(0, self.N - 1), 'right'),
+            'left': (range(self.N - 2, -1, -1), 'left'),
+        }[direction]
+
+        for i in sweep:
+            me.move_to(i)
+            env = me()
+
+            dims, lix_L, lix_R, lix, uix_L, uix_R, uix, l_bond, u_bond = \
+                parse_2site_inds_dims(k, b, i)
+
+            # evolve the 2-site tensor and split it
+            AB = (k[i] @ k[i + 1]).transpose(*uix).data
+            AB = Tensor(self._evolve(env['_HAM'], lix, uix, AB, tau), uix)
+            L, R = AB.split(left_inds=uix_L, get='arrays', absorb=absorb,
+                            right_inds=uix_R, **self.split_opts)
+
+            k[i].modify(data=L, inds=(*uix_L, u_bond))
+            b[i].modify(data=L.conj(), inds=(*lix_L, l_bond))
+            k[i + 1].modify(data=R, inds=(u_bond, *uix_R))
+            b[i + 1].modify(data=R.conj(), inds=(l_bond, *lix_R))
+
+            # evolve the site which is the next centre backwards
+            if direction == 'right' and i < self.N - 2:
+                Renv, = env.select_tensors('_RIGHT')
+                me.move_right()
+                Lenv, = me().select_tensors('_LEFT')
+                self._evolve_site(i + 1, (Lenv, self.H[i + 1], Renv), -tau)
+            elif direction == 'left' and i > 0:
+                Lenv, = env.select_tensors('_LEFT')
+                me.move_left()
+                Renv, = me().select_tensors('_RIGHT')
+                self._evolve_site(i, (Lenv, self.H[i], Renv), -tau)
+
+    def sweep(self, direction, tau):
+        """Perform a single sweep of local evolutions by time ``tau``.
+
+        Parameters
+        ----------
+        direction : {'right', 'left'}
+            Which direction to sweep. The orthogonality centre should start
+            at the opposite end, and finishes at this one.
+        tau : float
+            The time to evolve each site by.
+        """
+        begin = {'right': 'left', 'left': 'right'}[direction]
+
+        # reuse the environments formed by the last sweep
+        if self.ME_eff_ham.begin != begin:
+            self.ME_eff_ham.turn_around()
+
+        {1: self._sweep_1site,
+         2: self._sweep_2site}[self.bsz](direction, tau)
+
+    def step(self, dt=None, progbar=None):
+        """Perform a single, second order, step of time ``dt``.
+        """
+        dt = self.dt if dt is None else dt
+        self.sweep('right', dt / 2)
+        self.sweep('left', dt / 2)
+        self.t += dt
+
+        if progbar is not None:
+            progbar.cupdate(self.t)
+            self._set_progbar_desc(progbar)
+
+    TARGET_TOL = 1e-13  # tolerance to have 'reached' target time
+
+    def update_to(self, T, dt=None, progbar=None):
+        """Update the state to time ``T``.
+
+        Parameters
+        ----------
+        T : float
+            The time to evolve to.
+        dt : float, optional
+            Time step to use, defaults to ``self.dt``.
+        progbar : bool, optional
+            Manually turn the progress bar off.
+        """
+        dt = self.dt if dt is None else dt
+        if not dt:
+            raise ValueError("Must set ``dt``.")
+
+        if T < self.t - self.TARGET_TOL:
+            raise NotImplementedError
+
+        progbar = self.progbar if (progbar is None) else progbar
+        progbar = qu.utils.continuous_progbar(self.t, T) if progbar else None
+
+        while self.t < T - self.TARGET_TOL:
+            # take a smaller step if within one step of final time
+            self.step(dt=min(dt, T - self.t), progbar=progbar)
+
+        if progbar:
+            progbar.close()
+
+    def _set_progbar_desc(self, progbar):
+        msg = "t={:.4g}, max-bond={}".format(self.t, self._k.max_bond())
+        progbar.set_description(msg)
+
+    def at_times(self, ts, dt=None, progbar=None):
+        """Generate the time evolved state at each time in ``ts``.
+
+        Parameters
+        ----------
+        ts : sequence of float
+            The times to evolve to and yield the state at.
+        dt : float, optional
+            Time step to use, defaults to ``self.dt``.
+        progbar : bool, optional
+            Manually turn the progress bar off.
+
+        Yields
+        ------
+        pt : MatrixProductState
+            The state at each of the times in ``ts``. This is a copy of
+            internal state used, so inplace changes can be made to it.
+        """
+        ts = sorted(ts)
+
+        progbar = self.progbar if (progbar is None) else progbar
+        if progbar:
+            ts = qu.utils.progbar(ts)
+
+        for t in ts:
+            self.update_to(t, dt=dt, progbar=False)
+
+            if progbar:
+                self._set_progbar_desc(ts)
+
+            yield self.pt
@@ -1,6 +1,12 @@
+import os
+
 import numpy as np
 
 import quimb as qu
+from ..core import prod, get_thread_pool
+from . import decomp
+from .tensor_core import _get_executor_num_workers
+from .tensor_1d import _save_checkpoint, _load_checkpoint
 
 
 class NNI:
@@ -171,6 +177,89 @@ class NNI:
         return "<NNI(n={}, cyclic={})>".format(self.n, self.cyclic)
 
 
+def _merge_sweeps(sweeps):
+    """Combine consecutive sweeps in the same direction.
+    """
+    merged = []
+    for direction, dt_frac in sweeps:
+        if merged and merged[-1][0] == direction:
+            merged[-1] = (direction, merged[-1][1] + dt_frac)
+        else:
+            merged.append((direction, dt_frac))
+    return tuple(merged)
+
+
+def _strang_composition(taus):
+    """The sweeps of a composition of second order steps, each of fraction
+    ``tau`` of the time step.
+    """
+    return _merge_sweeps(
+        sweep for tau in taus
+        for sweep in (('right', tau / 2), ('left', tau), ('right', tau / 2)))
+
+
+def _suzuki_composition(taus, order):
+    """Suzuki's construction of a scheme of order ``order + 2`` from the
+    scheme of order ``order`` given by composing second order steps
+    ``taus``.
+    """
+    p = 1 / (4 - 4**(1 / (order + 1)))
+    outer = tuple(p * tau for tau in taus)
+    inner = tuple((1 - 4 * p) * tau for tau in taus)
+    return outer + outer + inner + outer + outer
+
+
+_SUZUKI4 = _suzuki_composition((1.0,), 2)
+_FR = 1 / (2 - 2**(1 / 3))
+_Y1, _Y2, _Y3 = -1.17767998417887, 0.235573213359357, 0.784513610477560
+_Y0 = 1 - 2 * (_Y1 + _Y2 + _Y3)
+_OM2 = 0.1931833275037836
+_OM4_RHO, _OM4_THETA, _OM4_LAMBDA = (
+    0.1786178958448091, -0.06626458266981843, 0.7123418310626056)
+
+# name: (order, error coefficient, sweeps). The error coefficients are the
+#     leading error of each scheme relative to the default scheme of the same
+#     order, estimated numerically for random nearest neighbour hamiltonians
+TROTTER_SCHEMES = {
+    # second order, Strang
+    2: (2, 1.0, _strang_composition((1.0,))),
+    # fourth order, Suzuki's fractal
+    4: (4, 1.0, _strang_composition(_SUZUKI4)),
+    # sixth order, Suzuki's fractal
+    6: (6, 1.0, _strang_composition(_suzuki_composition(_SUZUKI4, 4))),
+    # second order, Omelyan's minimum error
+    'omelyan2': (2, 0.089, (
+        ('right', _OM2), ('left', 1 / 2), ('right', 1 - 2 * _OM2),
+        ('left', 1 / 2), ('right', _OM2))),
+    # fourth order, Forest-Ruth
+    'forest-ruth': (4, 8.3, _strang_composition((_FR, 1 - 2 * _FR, _FR))),
+    # fourth order, Omelyan's optimized
+    'omelyan4': (4, 0.91, (
+        ('right', _OM4_RHO), ('left', _OM4_LAMBDA), ('right', _OM4_THETA),
+        ('left', 1 / 2 - _OM4_LAMBDA),
+        ('right', 1 - 2 * (_OM4_THETA + _OM4_RHO)),
+        ('left', 1 / 2 - _OM4_LAMBDA), ('right', _OM4_THETA),
+        ('left', _OM4_LAMBDA), ('right', _OM4_RHO))),
+    # sixth order, Yoshida's solution A
+    'yoshida6': (6, 77.0, _strang_composition(
+        (_Y3, _Y2, _Y1, _Y0, _Y1, _Y2, _Y3))),
+}
+
+
+def _parse_split_opts(split_opts):
+    """Fill in ``split_opts`` with the same defaults as ``tensor_split``, and
+    convert them to the form of the numba functions in ``decomp``.
+    """
+    opts = {'method': 'svd', 'cutoff': 1e-10, 'cutoff_mode': 'sum2',
+            'max_bond': None, **split_opts}
+    return opts['method'], {
+        'cutoff': {None: -1.0}.get(opts['cutoff'], opts['cutoff']),
+        'cutoff_mode': {'abs': 1, 'rel': 2,
+                        'sum2': 3, 'rsum2': 4}[opts['cutoff_mode']],
+        'max_bond': {None: -1}.get(opts['max_bond'], opts['max_bond']),
+    }
+
+
 class TEBD:
     """Class implementing Time Evolving Block Decimation (TEBD) [1].
 
@@ -196,6 +285,23 @@ class TEBD:
     split_opts : dict, optional
         Compression options applied for splitting after gate application, see
         :func:`~quimb.tensor.tensor_core.tensor_split`.
+    progbar : bool, optional
+        Whether to show a progress bar when evolving.
+    fused : bool, optional
+        Whether to perform the sweeps of gates with a fused kernel that works
+        directly on the arrays of each site, rather than with
+        :meth:`~quimb.tensor.tensor_1d.MatrixProductState.gate_split`.
+        Only used for OBC, numpy arrays and the 'svd' or 'eig' split methods.
+
+    Notes
+    -----
+    The ``order`` of the methods which evolve the state can be any key of
+    ``TROTTER_SCHEMES``, which maps names to tuples of the order, relative
+    error coefficient and sequence of ``(direction, dt_frac)`` sweeps of each
+    splitting scheme. As well as the integer orders 2, 4 and 6 (Strang and
+    Suzuki's fractal compositions), there are ``'omelyan2'``,
+    ``'forest-ruth'``, ``'omelyan4'`` and ``'yoshida6'``. New schemes can be
+    added to the dictionary.
 
     See Also
     --------
@@ -203,7 +309,7 @@ class TEBD:
     """
 
     def __init__(self, p0, H, dt=None, tol=None, t0=0.0,
-                 split_opts=None, progbar=True):
+                 split_opts=None, progbar=True, fused=True):
         # prepare initial state
         self._pt = p0.copy()
         self._pt.canonize(0)
@@ -236,6 +342,8 @@ class TEBD:
         # misc other options
         self.progbar = progbar
         self.split_opts = {} if split_opts is None else dict(split_opts)
+        self.fused = fused
+        self._buffers = {}
 
     @property
     def pt(self):
@@ -248,10 +356,12 @@ class TEBD:
         return self._err
 
     def choose_time_step(self, tol, T, order):
-        """Trotter error is ``~ (T / dt) * dt^(order + 1)``. Invert to
-        find desired time step, and scale by norm of interaction term.
+        """Trotter error is ``~ C * (T / dt) * dt^(order + 1)``, where ``C``
+        is the error coefficient of the splitting scheme. Invert to find
+        desired time step, and scale by norm of interaction term.
         """
-        return (tol / (T * self._ham_norm)) ** (1 / order)
+        order, coeff, _ = TROTTER_SCHEMES[order]
+        return (tol / (coeff * T * self._ham_norm)) ** (1 / order)
 
     def get_gate(self, dt_frac, sites=None):
         """Get the unitary (exponentiated) gate for fraction of timestep
@@ -317,6 +427,16 @@ class TEBD:
 
         # ------------------------------------------------------------------- #
 
+        self._apply_sweep(direction, dt_frac)
+
+    def _apply_sweep(self, direction, dt_frac):
+        """Actually apply the even (``direction='right'``) or odd
+        (``direction='left'``) gates for time ``dt_frac * self._dt``.
+        """
+        if self._can_fuse():
+            self._sweep_fused(direction, dt_frac)
+            return
+
         if direction == 'right':
             # Apply even gates:
             #
@@ -353,33 +473,113 @@ class TEBD:
             # one extra canonicalization not included in last split
             self._pt.right_canonize_site(1)
 
-    def _step_order2(self, tau=1, **sweep_opts):
-        """Perform a single, second order step.
+    def _can_fuse(self):
+        return (self.fused and not self.cyclic and
+                self.split_opts.get('method', 'svd') in ('svd', 'eig') and
+                all(isinstance(t.data, np.ndarray) for t in self._pt))
+
+    def _get_buffer(self, name, shape, dtype):
+        """Get a workspace array, reusing the memory of the last one with the
+        same ``name`` if it was big enough.
+        """
+        size = prod(shape)
+        buf = self._buffers.get(name)
+        if (buf is None) or (buf.size < size) or (buf.dtype != dtype):
+            buf = self._buffers[name] = np.empty(size, dtype=dtype)
+        return buf[:size].reshape(shape)
+
+    def _gate_split_fused(self, A, B, G, absorb):
+        """Apply gate ``G`` to the two site arrays ``A`` and ``B``, which have
+        shapes ``(left_bond, d, bond)`` and ``(bond, d, right_bond)``, then
+        split and truncate the result back into two such arrays.
         """
-        self.sweep('right', tau / 2, **sweep_opts)
-        self.sweep('left', tau, **sweep_opts)
-        self.sweep('right', tau / 2, **sweep_opts)
+        (bl, d, _), (_, _, br) = A.shape, B.shape
+        dtype = np.result_type(A, B, G)
+
+        AB = self._get_buffer('AB', (bl * d, d * br), dtype)
+        np.matmul(A.reshape(bl * d, -1), B.reshape(-1, d * br), out=AB)
+
+        # the gate broadcasts over the left and right bonds
+        GAB = self._get_buffer('GAB', (bl, d * d, br), dtype)
+        np.matmul(G, AB.reshape(bl, d * d, br), out=GAB)
+
+        method, opts = _parse_split_opts(self.split_opts)
+        split_fn = {'svd': decomp._svd, 'eig': decomp._eig}[method]
+        left, right = split_fn(GAB.reshape(bl * d, d * br), **opts,
+                               absorb={'left': -1, 'right': 1}[absorb])
 
-    def _step_order4(self, **sweep_opts):
-        """Perform a single, fourth order step.
+        return left.reshape(bl, d, -1), right.reshape(-1, d, br)
+
+    def _sweep_fused(self, direction, dt_frac):
+        """Like the gate by gate sweep, but working directly with the arrays
+        of each site, rather than tensors.
         """
-        tau1 = tau2 = 1 / (4 * 4**(1 / 3))
-        tau3 = 1 - 2 * tau1 - 2 * tau2
-        self._step_order2(tau1, **sweep_opts)
-        self._step_order2(tau2, **sweep_opts)
-        self._step_order2(tau3, **sweep_opts)
-        self._step_order2(tau2, **sweep_opts)
-        self._step_order2(tau1, **sweep_opts)
+        N = self.N
+        Ts = [self._pt[i] for i in range(N)]
+
+        # get the data of each site as (left bond, physical, right bond)
+        Ms, perms = [], []
+        for i, T in enumerate(Ts):
+            bl = (set(Ts[i - 1].inds) & set(T.inds)).pop() if i > 0 else None
+            br = (set(Ts[i + 1].inds) & set(T.inds)).pop() if i < N - 1 \
+                else None
+            inds = (bl, self._pt.site_ind(i), br)
+            perm = tuple(T.inds.index(ix) for ix in inds if ix is not None)
+            shape = tuple(T.ind_size(ix) if ix else 1 for ix in inds)
+            Ms.append(T.data.transpose(perm).reshape(shape))
+            perms.append(perm)
+
+        def get_gate(i):
+            return np.asarray(self.get_gate(dt_frac, (i, i + 1)))
+
+        if direction == 'right':
+            for i in range(0, N - 1, 2):
+                if i > 0:
+                    # left canonize site i - 1
+                    bl, d, br = Ms[i - 1].shape
+                    Q, R = decomp._qr(Ms[i - 1].reshape(bl * d, br))
+                    Ms[i - 1] = Q.reshape(bl, d, -1)
+                    Ms[i] = (R @ Ms[i].reshape(br, -1)).reshape(
+                        -1, *Ms[i].shape[1:])
+
+                Ms[i], Ms[i + 1] = self._gate_split_fused(
+                    Ms[i], Ms[i + 1], get_gate(i), absorb='right')
+
+        elif direction == 'left':
+            for i in reversed(range(1, N - 1, 2)):
+                if i + 2 < N:
+                    # right canonize site i + 2
+                    bl, d, br = Ms[i + 2].shape
+                    L, Q = decomp._lq(Ms[i + 2].reshape(bl, d * br))
+                    Ms[i + 2] = Q.reshape(-1, d, br)
+                    Ms[i + 1] = (Ms[i + 1].reshape(-1, bl) @ L).reshape(
+                        *Ms[i + 1].shape[:2], -1)
+
+                Ms[i], Ms[i + 1] = self._gate_split_fused(
+                    Ms[i], Ms[i + 1], get_gate(i), absorb='left')
+
+            # one extra canonicalization not included in last split
+            bl, d, br = Ms[1].shape
+            L, Q = decomp._lq(Ms[1].reshape(bl, d * br))
+            Ms[1] = Q.reshape(-1, d, br)
+            Ms[0] = (Ms[0].reshape(-1, bl) @ L).reshape(1, Ms[0].shape[1], -1)
+
+        # reinsert the data with its original index order
+        Ms[0], Ms[-1] = Ms[0][0, ...], Ms[-1][..., 0]
+        for T, M, perm in zip(Ts, Ms, perms):
+            T.modify(data=M.transpose(np.argsort(perm)))
 
     def step(self, order=2, dt=None, progbar=None, **sweep_opts):
-        """Perform a single step of time ``self.dt``.
+        """Perform a single step of time ``self.dt``, with the splitting
+        scheme ``order``, a key of ``TROTTER_SCHEMES``.
         """
-        {2: self._step_order2,
-         4: self._step_order4}[order](dt=dt, **sweep_opts)
+        order, coeff, sweeps = TROTTER_SCHEMES[order]
+        for direction, dt_frac in sweeps:
+            self.sweep(direction, dt_frac, dt=dt, **sweep_opts)
 
         dt = self._dt if dt is None else dt
         self.t += dt
-        self._err += self._ham_norm * dt ** (order + 1)
+        self._err += coeff * self._ham_norm * dt ** (order + 1)
 
         if progbar is not None:
             progbar.cupdate(self.t)
@@ -402,9 +602,50 @@ class TEBD:
 
         return self._dt
 
+    def save_checkpoint(self, fname):
+        """Atomically save the current state, time, error estimate, time step
+        and any sweep queued for combination with the next step, to
+        ``fname`` in numpy's ``.npz`` format.
+
+        Parameters
+        ----------
+        fname : str
+            The file to save to.
+        """
+        queued = getattr(self, '_queued_sweep', None)
+        direction, dt_frac = queued if queued else ('', 0.0)
+        _save_checkpoint(fname, self._pt, t=self.t, err=self._err,
+                         dt=np.nan if self._dt is None else self._dt,
+                         queued_direction=direction, queued_dt_frac=dt_frac)
+
+    def load_checkpoint(self, fname):
+        """Restore the state and progress saved with
+        :meth:`~quimb.tensor.tensor_tebd.TEBD.save_checkpoint`. This ``TEBD``
+        instance should have been created with the same hamiltonian.
+
+        Parameters
+        ----------
+        fname : str
+            The file to load from.
+        """
+        _, data = _load_checkpoint(fname, self._pt)
+        self.t = float(data['t'])
+        self._err = float(data['err'])
+        dt = float(data['dt'])
+        self._dt = None if np.isnan(dt) else dt
+        # the cached gates depend on the time step
+        self._U_ints = {}
+
+        direction = str(data['queued_direction'])
+        if direction:
+            self._queued_sweep = [direction, float(data['queued_dt_frac'])]
+        else:
+            self._queued_sweep = None
+
     TARGET_TOL = 1e-13  # tolerance to have 'reached' target time
 
-    def update_to(self, T, dt=None, tol=None, order=4, progbar=None):
+    def update_to(self, T, dt=None, tol=None, order=4, progbar=None,
+                  checkpoint=None, checkpoint_every=1, resume=False):
         """Update the state to time ``T``.
 
         Parameters
@@ -415,11 +656,25 @@ class TEBD:
             Time step to use. Can't be set as well as ``tol``.
         tol : float, optional
             Tolerance for whole evolution. Can't be set as well as ``dt``.
-        order : int, optional
-            Trotter order to use.
+        order : int or str, optional
+            Trotter order, or splitting scheme, to use, see
+            ``TROTTER_SCHEMES``.
         progbar : bool, optional
             Manually turn the progress bar off.
+        checkpoint : str, optional
+            If given, a file to (atomically) save the state and progress to,
+            see :meth:`~quimb.tensor.tensor_tebd.TEBD.save_checkpoint`.
+        checkpoint_every : int, optional
+            Save the checkpoint every this many steps, as well as at ``T``.
+        resume : bool, optional
+            If ``checkpoint`` exists, first load it and carry on evolving
+            from the time it was saved at, with the same time step.
         """
+        if resume and (checkpoint is not None) and os.path.exists(checkpoint):
+            self.load_checkpoint(checkpoint)
+            # keep the time step the evolution was started with
+            dt, tol = self._dt, False
+
         if T < self.t - self.TARGET_TOL:
             raise NotImplementedError
 
@@ -429,6 +684,7 @@ class TEBD:
         progbar = self.progbar if (progbar is None) else progbar
         progbar = qu.utils.continuous_progbar(self.t, T) if progbar else None
 
+        num_steps = 0
         while self.t < T - self.TARGET_TOL:
             if (T - self.t < self._dt):
                 # set custom dt if within one step of final time
@@ -441,6 +697,12 @@ class TEBD:
 
             # perform a step!
             self.step(order=order, progbar=progbar, dt=dt, queue=queue)
+            num_steps += 1
+
+            if checkpoint is not None:
+                reached = self.t >= T - self.TARGET_TOL
+                if reached or (num_steps % checkpoint_every == 0):
+                    self.save_checkpoint(checkpoint)
 
         if progbar:
             progbar.close()
@@ -460,8 +722,9 @@ class TEBD:
             Time step to use. Can't be set as well as ``tol``.
         tol : float, optional
             Tolerance for whole evolution. Can't be set as well as ``dt``.
-        order : int, optional
-            Trotter order to use.
+        order : int or str, optional
+            Trotter order, or splitting scheme, to use, see
+            ``TROTTER_SCHEMES``.
         progbar : bool, optional
             Manually turn the progress bar off.
 
@@ -492,6 +755,220 @@ class TEBD:
             yield self.pt
 
 
+def _vidal_gate_bond(A, B, lam, G, cutoff, cutoff_mode, max_bond):
+    """Apply gate ``G`` to the two site arrays ``A`` and ``B`` of a state in
+    Hastings' form of the Vidal gauge, each with shape
+    ``(left_bond, d, right_bond)``, ``lam`` being the singular values of
+    the bond to the left of ``A``. Returns the new arrays and the new
+    singular values of the bond between them.
+    """
+    (bl, d, _), (_, _, br) = A.shape, B.shape
+
+    AB = (A.reshape(bl * d, -1) @ B.reshape(-1, d * br)).reshape(bl, d * d, br)
+    GAB = np.matmul(G, AB)
+    U, s, V = np.linalg.svd(
+        (lam.reshape(-1, 1, 1) * GAB).reshape(bl * d, d * br),
+        full_matrices=False)
+
+    n_chi = s.size
+    if cutoff > 0.0:
+        n_chi = decomp._trim_singular_vals(s, cutoff, cutoff_mode)
+        if max_bond > 0:
+            n_chi = min(n_chi, max_bond)
+    norm = decomp._renorm_singular_vals(s, n_chi) if n_chi < s.size else 1.0
+
+    # the new left array is found without dividing by ``lam``
+    V = V[:n_chi, :]
+    A = (GAB.reshape(bl * d, d * br) @ V.conj().T).reshape(bl, d, n_chi)
+    return A * norm, V.reshape(n_chi, d, br), s[:n_chi] * norm
+
+
+def _vidal_gate_bonds(updates, split_opts):
+    """Apply each of ``updates``, a sequence of ``(i, A, B, lam, G)``, with
+    :func:`_vidal_gate_bond`.
+    """
+    return [(i, *_vidal_gate_bond(A, B, lam, G, **split_opts))
+            for i, A, B, lam, G in updates]
+
+
+class TEBDParallel(TEBD):
+    r"""Time Evolving Block Decimation with the state kept in the Vidal gauge,
+    in which, since the gates of the even, or odd, bonds act on disjoint
+    pairs of sites, they can all be applied at once by the workers of
+    ``executor``. Each site array ``B`` is stored as the Vidal ``Gamma`` of
+    that site multiplied by the singular values ``lambda`` of the bond to its
+    right (Hastings' form [1]), which avoids ever having to divide by small
+    singular values::
+
+        -l-G-l-G-l-G-l-  ==  -l-B-B-B-
+           |   |   |            | | |
+
+    The state is only converted back into a
+    :class:`~quimb.tensor.tensor_1d.MatrixProductState` when it is needed,
+    e.g. by :attr:`pt`. Only OBC and the 'svd' split method are supported.
+
+    [1] M. B. Hastings, Light-cone matrix product, J. Math. Phys. 50, 095207
+    (2009)
+
+    Parameters
+    ----------
+    p0 : MatrixProductState
+        Initial state.
+    H : NNI or array_like
+        Dense hamiltonian representing the two body interaction.
+    dt : float, optional
+        Default time step, cannot be set as well as ``tol``.
+    tol : float, optional
+        Default target error for each evolution, cannot be set as well as
+        ``dt``.
+    t0 : float, optional
+        Initial time. Defaults to 0.0.
+    split_opts : dict, optional
+        Compression options applied for splitting after gate application, see
+        :func:`~quimb.tensor.tensor_core.tensor_split`.
+    progbar : bool, optional
+        Whether to show a progress bar when evolving.
+    executor : executor, optional
+        A ``concurrent.futures`` like pool to apply the gates with. If not
+        given, the thread pool from :func:`~quimb.get_thread_pool` is used.
+    num_threads : int, optional
+        The number of threads of the default pool, if ``num_threads=1`` the
+        gates are instead applied one after another in this thread.
+
+    See Also
+    --------
+    TEBD
+    """
+
+    def __init__(self, p0, H, dt=None, tol=None, t0=0.0, split_opts=None,
+                 progbar=True, executor=None, num_threads=None):
+        super().__init__(p0, H, dt=dt, tol=tol, t0=t0, split_opts=split_opts,
+                         progbar=progbar, fused=False)
+
+        if self.cyclic:
+            raise NotImplementedError("Parallel TEBD is only supported for "
+                                      "OBC.")
+
+        method, self._split_opts = _parse_split_opts(self.split_opts)
+        if method != 'svd':
+            raise ValueError("Parallel TEBD only supports the 'svd' split "
+                             "method.")
+
+        if (executor is None) and (num_threads != 1):
+            executor = get_thread_pool(num_threads)
+        self.executor = executor
+
+        self._init_vidal()
+
+    def _submit(self, fn, *args, **kwargs):
+        if self.executor is None:
+            return fn(*args, **kwargs)
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def _get_results(self, fs):
+        if self.executor is None:
+            return fs
+        return [f.result() for f in fs]
+
+    def _init_vidal(self):
+        """Convert ``self._pt``, with its orthogonality centre at site 0, to
+        the Vidal gauge, by a sweep of SVDs.
+        """
+        N, Ts = self.N, [self._pt[i] for i in range(self.N)]
+
+        # get the data of each site as (left bond, physical, right bond)
+        Ms, self._perms = [], []
+        for i, T in enumerate(Ts):
+            bl = (set(Ts[i - 1].inds) & set(T.inds)).pop() if i > 0 else None
+            br = (set(Ts[i + 1].inds) & set(T.inds)).pop() if i < N - 1 \
+                else None
+            inds = (bl, self._pt.site_ind(i), br)
+            perm = tuple(T.inds.index(ix) for ix in inds if ix is not None)
+            shape = tuple(T.ind_size(ix) if ix else 1 for ix in inds)
+            Ms.append(T.data.transpose(perm).reshape(shape))
+            self._perms.append(perm)
+
+        # ``self._lams[i]`` are the singular values of the bond left of site i
+        self._Bs, self._lams = [], [np.ones(1)]
+        X = Ms[0]
+        for i in range(N - 1):
+            bl, d, br = X.shape
+            _, s, V = np.linalg.svd((self._lams[i].reshape(-1, 1, 1) * X)
+                                    .reshape(bl * d, br), full_matrices=False)
+            self._Bs.append((X.reshape(bl * d, br) @ V.conj().T)
+                            .reshape(bl, d, -1))
+            self._lams.append(s)
+            d, br = Ms[i + 1].shape[1:]
+            X = (V @ Ms[i + 1].reshape(-1, d * br)).reshape(-1, d, br)
+        self._Bs.append(X)
+
+    def _sync_pt(self):
+        """Insert the site arrays back into ``self._pt``.
+        """
+        Bs = list(self._Bs)
+        Bs[0], Bs[-1] = Bs[0][0, ...], Bs[-1][..., 0]
+        for i, (B, perm) in enumerate(zip(Bs, self._perms)):
+            self._pt[i].modify(data=B.transpose(np.argsort(perm)))
+
+    @property
+    def pt(self):
+        """The MPS state of the system at the current time.
+        """
+        self._sync_pt()
+        return self._pt.copy()
+
+    @property
+    def lambdas(self):
+        """The singular values of each bond, ``lambdas[i]`` being those of the
+        bond between sites ``i`` and ``i + 1``.
+        """
+        return [lam.copy() for lam in self._lams[1:]]
+
+    def _apply_sweep(self, direction, dt_frac):
+        """Apply all the even (``direction='right'``) or odd
+        (``direction='left'``) gates at once.
+        """
+        start = {'right': 0, 'left': 1}[direction]
+        updates = [
+            (i, self._Bs[i], self._Bs[i + 1], self._lams[i],
+             np.asarray(self.get_gate(dt_frac, (i, i + 1))))
+            for i in range(start, self.N - 1, 2)
+        ]
+
+        # one chunk of bonds per worker
+        if self.executor is None:
+            num_chunks = 1
+        else:
+            num_chunks = _get_executor_num_workers(self.executor)
+        chunks = [updates[k::num_chunks] for k in range(num_chunks)]
+
+        fs = [self._submit(_vidal_gate_bonds, chunk, self._split_opts)
+              for chunk in chunks if chunk]
+
+        for results in self._get_results(fs):
+            for i, A, B, s in results:
+                self._Bs[i], self._Bs[i + 1], self._lams[i + 1] = A, B, s
+
+    def save_checkpoint(self, fname):
+        """Atomically save the current state and progress to ``fname``, see
+        :meth:`~quimb.tensor.tensor_tebd.TEBD.save_checkpoint`.
+        """
+        self._sync_pt()
+        super().save_checkpoint(fname)
+
+    def load_checkpoint(self, fname):
+        """Restore the state and progress saved with
+        :meth:`~quimb.tensor.tensor_tebd.TEBDParallel.save_checkpoint`.
+        """
+        super().load_checkpoint(fname)
+        self._init_vidal()
+
+    def _set_progbar_desc(self, progbar):
+        max_bond = max(lam.size for lam in self._lams)
+        msg = "t={:.4g}, max-bond={}".format(self.t, max_bond)
+        progbar.set_description(msg)
+
+
 def OTOC_local(psi0, H, H_back, ts, i, A, j=None, B=None,
                initial_eigenstate='check', **tebd_opts):
     """ The out-of-time-ordered correlator (OTOC) generating by two local
@@ -23,7 +23,7 @@ setup(
     license='Apache',
     packages=find_packages(exclude=['deps', 'tests*']),
     install_requires=[
-        'numpy>=1.12',
+        'numpy>=1.17',
         'scipy>=1.0.0',
         'numba>=0.39',
         'psutil>=4.3.1',
@@ -80,6 +80,14 @@ class TestParametrizations:
         assert G.dtype == dtype
         assert qu.issparse(G) is sparse
 
+    @pytest.mark.parametrize("xyz", ['X', 'Y', 'Z'])
+    def test_rotations(self, xyz):
+        phis = np.random.uniform(-3, 3, size=(3, 4))
+        Rs = qu.rotations(phis, xyz)
+        assert Rs.shape == (3, 4, 2, 2)
+        for phi, R in zip(phis.flat, Rs.reshape(-1, 2, 2)):
+            assert_allclose(R, qu.rotation(phi, xyz))
+
 
 class TestHamHeis:
     def test_ham_heis_2(self):
@@ -312,6 +312,18 @@ class TestExpm:
             assert isinstance(p, sp.csr_matrix)
 
 
+class TestExpmMultiply:
+    @pytest.mark.parametrize("t", [-0.1j, -4.0j, -0.5])
+    @pytest.mark.parametrize("sparse", [True, False])
+    def test_lanczos(self, t, sparse):
+        a = qu.rand_herm(100, sparse=sparse, density=0.1)
+        v = qu.rand_ket(100)
+        x = qu.expm_multiply(a, v, backend='lanczos', t=t, krylov_dim=10)
+        y = qu.expm(t * a.A if sparse else t * a) @ v
+        assert x.shape == v.shape
+        assert_allclose(x, y, atol=1e-10)
+
+
 class TestSqrtm:
     @pytest.mark.parametrize("sparse", [True, False])
     @pytest.mark.parametrize("herm", [True, False])
@@ -0,0 +1,202 @@
+import pytest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from quimb.tensor import (
+    Tensor,
+    BlockSparseArray,
+    MPS_neel_state,
+    MPS_computational_state,
+    MPO_ham_heis,
+    SpinHam,
+)
+from quimb.tensor import block_sparse
+
+
+def rand_block_sparse(charges, flows, charge=0, symmetry='U1',
+                      dtype=float):
+    x = BlockSparseArray.zeros(charges, flows, charge, symmetry, dtype=dtype)
+    for block in x.blocks.values():
+        block[...] = np.random.randn(*block.shape)
+        if np.issubdtype(dtype, np.complexfloating):
+            block += 1j * np.random.randn(*block.shape)
+    return x
+
+
+class TestBlockSparseArray:
+
+    @pytest.mark.parametrize('symmetry', ['U1', 'Z2', 'Z3'])
+    def test_from_dense_round_trip(self, symmetry):
+        charges = ([0, 1, 1, 2], [0, 1, 2], [1, 0, 1, 2, 2])
+        x = rand_block_sparse(charges, (1, 1, -1), symmetry=symmetry)
+        assert x.nnz < x.size
+        d = x.to_dense()
+        y = BlockSparseArray.from_dense(d, charges, (1, 1, -1),
+                                        symmetry=symmetry, tol=1e-12)
+        assert_allclose(y.to_dense(), d)
+        assert_allclose(y.norm(), np.linalg.norm(d))
+
+        with pytest.raises(ValueError):
+            BlockSparseArray.from_dense(np.random.randn(4, 3, 5), charges,
+                                        (1, 1, -1), symmetry=symmetry,
+                                        tol=1e-12)
+
+    def test_conj_and_transpose(self):
+        x = rand_block_sparse(([0, 1], [0, 1, 2]), (1, -1), charge=-1,
+                              dtype=complex)
+        xc = x.conj()
+        assert xc.flows == (-1, 1)
+        assert xc.charge == 1
+        assert_allclose(xc.to_dense(), x.to_dense().conj())
+        assert_allclose(x.T.to_dense(), x.to_dense().T)
+
+    @pytest.mark.parametrize('symmetry', ['U1', 'Z2'])
+    def test_tensordot(self, symmetry):
+        ca, cb, cc, cd = [0, 1, 1], [0, 1], [1, 0, 2, 1], [0, 1, 2]
+        x = rand_block_sparse((ca, cb, cc), (1, 1, -1), symmetry=symmetry)
+        y = rand_block_sparse((cc, cb, cd), (1, -1, 1), charge=1,
+                              symmetry=symmetry)
+        z = block_sparse.tensordot(x, y, ((1, 2), (1, 0)))
+        assert z.charge == 1
+        assert_allclose(z.to_dense(), np.tensordot(
+            x.to_dense(), y.to_dense(), ((1, 2), (1, 0))))
+
+        with pytest.raises(ValueError):
+            block_sparse.tensordot(x, x, ((1,), (1,)))
+
+    @pytest.mark.parametrize('method', ['svd', 'qr', 'lq'])
+    def test_split(self, method):
+        charges = ([0, 1, 1, 2], [0, 1, 2], [1, 0, 1, 2, 2])
+        x = rand_block_sparse(charges, (1, 1, -1), charge=1)
+        left, right = block_sparse.split(x, 2, method=method)
+        assert left.charge == 0
+        assert right.charge == 1
+        assert_allclose(block_sparse.tensordot(left, right, 1).to_dense(),
+                        x.to_dense())
+
+    def test_split_global_truncation(self):
+        charges = ([0, 1, 1, 2, 2, 2], [0, 1, 2, 0], [1, 0, 1, 2, 2])
+        x = rand_block_sparse(charges, (1, 1, -1))
+        d = x.to_dense().reshape(24, 5)
+        s = np.linalg.svd(d, compute_uv=False)
+
+        left, right = block_sparse.split(x, 2, cutoff=1e-10, max_bond=3)
+        assert left.shape[-1] == 3
+        approx = block_sparse.tensordot(left, right, 1).to_dense()
+        # same error as dense truncation to the largest singular values
+        assert_allclose(np.linalg.norm(approx), np.linalg.norm(s))
+        assert_allclose(np.linalg.svd(approx.reshape(24, 5),
+                                      compute_uv=False)[:3],
+                        s[:3] * np.linalg.norm(s) / np.linalg.norm(s[:3]))
+
+    @pytest.mark.parametrize('symmetry', ['U1', 'Z2'])
+    def test_reshape_fuses(self, symmetry):
+        charges = ([0, 1, 1], [0, 1], [1, 0, 2], [0, 2], [1])
+        x = rand_block_sparse(charges, (1, -1, 1, -1, 1), charge=1,
+                              symmetry=symmetry)
+        y = x.reshape(6, 3, 2)
+        assert y.flows == (1, 1, -1)
+        assert y.charge == x.charge
+        assert_allclose(y.to_dense(), x.to_dense().reshape(6, 3, 2))
+        # the fused array is still symmetric
+        z = BlockSparseArray.from_dense(y.to_dense(), y.charges, y.flows,
+                                        y.charge, symmetry, tol=1e-12)
+        assert_allclose(z.to_dense(), y.to_dense())
+
+        with pytest.raises(NotImplementedError):
+            x.reshape(2, 9, 2)
+
+    def test_singular_values(self):
+        charges = ([0, 1, 1, 2], [0, 1, 2], [1, 0, 1, 2, 2])
+        x = rand_block_sparse(charges, (1, 1, -1))
+        assert_allclose(block_sparse.singular_values(x, 2),
+                        np.linalg.svd(x.to_dense().reshape(12, 5),
+                                      compute_uv=False))
+
+    def test_vector_round_trip(self):
+        x = rand_block_sparse(([0, 1, 1], [0, 1], [1, 0, 2]), (1, 1, -1))
+        del x.blocks[next(iter(x.blocks))]
+        v = block_sparse.to_vector(x)
+        assert v.size == sum(b.size for b in BlockSparseArray.zeros(
+            x.charges, x.flows).blocks.values())
+        assert_allclose(block_sparse.from_vector(v, x).to_dense(),
+                        x.to_dense())
+
+
+class TestBlockSparseTensors:
+
+    def test_contract_and_split(self):
+        x = rand_block_sparse(([0, 1, 1], [0, 1], [1, 0, 2]), (1, 1, -1))
+        y = rand_block_sparse(([1, 0, 2], [0, 1, 2]), (1, -1), charge=1)
+        a, b = Tensor(x, inds='abc'), Tensor(y, inds='cd')
+        c = a @ b
+        assert isinstance(c.data, BlockSparseArray)
+        assert_allclose(c.data.to_dense(),
+                        np.tensordot(x.to_dense(), y.to_dense(), 1))
+        assert_allclose(a.H @ a, np.linalg.norm(x.to_dense())**2)
+        assert_allclose(a.norm(), np.linalg.norm(x.to_dense()))
+
+        tn = c.split(['d', 'a'], cutoff=0.0)
+        assert_allclose((tn ^ all).transpose(*c.inds).data.to_dense(),
+                        c.data.to_dense())
+
+        s = c.split(['d', 'a'], get='values')
+        assert_allclose(s, np.linalg.svd(
+            c.transpose('d', 'a', 'b').data.to_dense().reshape(9, 2),
+            compute_uv=False))
+
+    @pytest.mark.parametrize('use_pm', [False, True])
+    def test_mpo_to_block_sparse(self, use_pm):
+        builder = SpinHam()
+        if use_pm:
+            builder += 0.5, '+', '-'
+            builder += 0.5, '-', '+'
+        else:
+            # mixed charge bond channels which are split
+            builder += 1.0, 'X', 'X'
+            builder += 1.0, 'Y', 'Y'
+        builder += 1.0, 'Z', 'Z'
+        builder -= 0.3, 'Z'
+
+        H = builder.build_mpo(6)
+        Hb = builder.build_mpo(6, phys_charges=[1, -1])
+        assert all(isinstance(t.data, BlockSparseArray) for t in Hb)
+
+        Hd = Hb.copy()
+        for t in Hd:
+            t.modify(data=t.data.to_dense())
+        assert_allclose(Hd.to_dense(), H.to_dense(), atol=1e-12)
+
+    def test_mps_to_block_sparse(self):
+        p = MPS_neel_state(6).to_block_sparse([1, -1])
+        assert p[5].data.charge == 0
+        p = MPS_computational_state('110111').to_block_sparse([0, 1], )
+        assert p[5].data.charge == 5
+        p = MPS_computational_state('110111').to_block_sparse(
+            [0, 1], symmetry='Z2')
+        assert p[5].data.charge == 1
+        assert_allclose(p.H @ p, 1.0)
+
+    def test_mps_needs_definite_charge(self):
+        p = MPS_computational_state('0101') + MPS_computational_state('0111')
+        with pytest.raises(ValueError):
+            p.to_block_sparse([0, 1])
+        p = p.to_block_sparse([0, 1], charge=3)
+        assert_allclose(p.H @ p, 1.0)
+
+    def test_mpo_expectation(self):
+        H = MPO_ham_heis(8)
+        Hb = MPO_ham_heis(8, phys_charges=[1, -1])
+        p = MPS_neel_state(8)
+        pb = p.to_block_sparse([1, -1])
+        xb, x = Hb.apply(pb), H.apply(p)
+        assert_allclose(xb.H @ xb, x.H @ x)
+        for t in xb:
+            t.modify(data=t.data.to_dense())
+        assert_allclose(xb.to_dense(), x.to_dense(), atol=1e-12)
+
+        H2b = Hb.apply(Hb)
+        for t in H2b:
+            t.modify(data=t.data.to_dense())
+        assert_allclose(H2b.to_dense(), H.apply(H).to_dense(), atol=1e-12)
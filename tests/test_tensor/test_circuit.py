@@ -0,0 +1,145 @@
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+import quimb as qu
+import quimb.tensor as qtn
+from quimb.tensor import circuit
+from quimb.tensor.circuit import (
+    fuse_gates,
+    get_gate_array,
+    build_gate_arrays,
+    parse_qasm,
+    parse_qasm_stream,
+    parse_qasm_file_stream,
+)
+
+
+def rand_qasm(n, depth, seed=42):
+    rng = np.random.RandomState(seed)
+    lines = [str(n)]
+    for _ in range(depth):
+        for i in range(n):
+            g = rng.choice(['H', 'T', 'X_1_2', 'Y_1_2', 'RZ', 'RX'])
+            if g in ('RZ', 'RX'):
+                lines.append("{} {} {}".format(g, rng.uniform(0, 6), i))
+            else:
+                lines.append("{} {}".format(g, i))
+        for i in range(n - 1):
+            if rng.rand() < 0.5:
+                g = rng.choice(['CZ', 'CNOT', 'CY'])
+                a, b = (i, i + 1) if rng.rand() < 0.5 else (i + 1, i)
+                lines.append("{} {} {}".format(g, a, b))
+    return "\n".join(lines) + "\n"
+
+
+class TestCircuit:
+
+    def test_parse_qasm_stream(self, tmpdir):
+        qasm = rand_qasm(5, 3)
+        info = parse_qasm_stream(iter(qasm.splitlines()))
+        assert info['n'] == 5
+        assert not isinstance(info['gates'], list)
+        assert list(info['gates']) == parse_qasm(qasm)['gates']
+
+        fname = str(tmpdir.join('circ.qasm'))
+        with open(fname, 'w') as f:
+            f.write(qasm)
+        info = parse_qasm_file_stream(fname, strip_round=True)
+        assert next(info['gates']) == parse_qasm(qasm)['gates'][0][1:]
+
+    @pytest.mark.parametrize('progbar', [False, True])
+    def test_from_qasm_file(self, tmpdir, progbar):
+        qasm = rand_qasm(5, 3)
+        fname = str(tmpdir.join('circ.qasm'))
+        with open(fname, 'w') as f:
+            f.write(qasm)
+
+        qc = qtn.Circuit.from_qasm(qasm)
+        qcf = qtn.Circuit.from_qasm_file(fname, progbar=progbar)
+        assert qcf.gates == qc.gates
+        assert_allclose(qcf.psi.to_dense(), qc.psi.to_dense())
+
+        # bounded memory: no record of the gates, fused in chunks
+        qcf = qtn.Circuit.from_qasm_file(fname, record_gates=False,
+                                         lazy=True, lazy_chunk_size=7)
+        assert qcf.gates == []
+        assert len(qcf._pending_gates) < 7
+        assert_allclose(qcf.psi.to_dense(), qc.psi.to_dense(), atol=1e-12)
+
+    def test_fuse_gates(self):
+        X, Z = qu.pauli('X'), qu.pauli('Z')
+        gates = [(X, (0,), 'X'), (Z, (1,), 'Z'), (qu.CNOT(), (0, 1), 'CNOT'),
+                 (X, (1,), 'X'), (qu.CNOT(), (1, 0), 'CNOT'),
+                 (Z, (2,), 'Z'), (X, (2,), 'X')]
+        fused = fuse_gates(gates)
+        assert [f[1] for f in fused] == [(0, 1), (2,)]
+        assert fused[0][2] == ('X', 'Z', 'CNOT', 'X', 'CNOT')
+        sw = qu.swap()
+        expected = sw @ qu.CNOT() @ sw @ (qu.eye(2) & X) @ qu.CNOT() @ (X & Z)
+        assert_allclose(fused[0][0], expected)
+        assert_allclose(fused[1][0], X @ Z)
+
+    @pytest.mark.parametrize('gate_opts', [{}, {'contract': True}])
+    def test_lazy_matches_eager(self, gate_opts):
+        psi0 = qtn.MPS_computational_state('000000')
+        qasm = rand_qasm(6, 4)
+        qc = qtn.Circuit.from_qasm(qasm, psi0=psi0, gate_opts=gate_opts)
+        qcl = qtn.Circuit.from_qasm(qasm, psi0=psi0, gate_opts=gate_opts,
+                                    lazy=True)
+        assert len(qcl.gates) == len(qc.gates)
+        psi, psil = qc.psi, qcl.psi
+        if gate_opts:
+            # every gate is contracted into the state either way
+            assert len(psil.tensors) == len(psi.tensors)
+        else:
+            # fused gates leave fewer tensors
+            assert len(psil.tensors) < len(psi.tensors)
+        assert_allclose(psil.to_dense(), psi.to_dense(), atol=1e-12)
+
+    @pytest.mark.parametrize('lazy', [False, True])
+    def test_amplitudes(self, lazy):
+        qc = qtn.Circuit.from_qasm(rand_qasm(7, 3), lazy=lazy)
+        psi = qc.psi.to_dense().ravel()
+
+        bitstrings = np.random.randint(0, 2, size=(20, 7))
+        idxs = [int(''.join(map(str, b)), 2) for b in bitstrings]
+        assert_allclose(qc.amplitudes(bitstrings), psi[idxs])
+        assert qc.amplitude('0110100') == pytest.approx(psi[0b0110100])
+
+        with pytest.raises(ValueError):
+            qc.amplitudes(['0110'])
+
+        # gates are grouped by the qubits they act on, not their light cone
+        columns = qc._get_columns()
+        assert max(len(ts) for ts, _, _ in columns) < len(qc.psi.tensors) / 4
+
+        # the columns are kept until another gate is applied
+        assert qc._get_columns() is columns
+        qc.apply_gate('H', 3)
+        assert qc._get_columns() is not columns
+        psi = qc.psi.to_dense().ravel()
+        assert_allclose(qc.amplitudes(bitstrings), psi[idxs])
+
+    def test_gate_array_cache(self, monkeypatch):
+        monkeypatch.setattr(circuit, 'GATE_CACHE_MAXSIZE', 3)
+        G = get_gate_array('rx', '0.3')
+        assert get_gate_array('RX', 0.3) is G
+        assert_allclose(G, qu.Rx(0.3))
+        with pytest.raises(ValueError):
+            G[0, 0] = 2.0
+
+        # least recently used is evicted
+        for theta in (0.1, 0.2, 0.3, 0.4):
+            get_gate_array('RZ', theta)
+        assert get_gate_array('RX', 0.3) is not G
+
+    @pytest.mark.parametrize('gate_id', ['RX', 'RY', 'RZ'])
+    def test_build_gate_arrays(self, gate_id):
+        thetas = np.random.uniform(0, 6, size=10)
+        Gs = build_gate_arrays(gate_id, thetas)
+        assert Gs.shape == (10, 2, 2)
+        for theta, G in zip(thetas, Gs):
+            assert_allclose(G, qu.rotation(theta, gate_id[1]))
+            # the cached gate is a view of the batch
+            assert np.shares_memory(get_gate_array(gate_id, theta), Gs)
@@ -328,6 +328,32 @@ class TestMatrixProductState:
         mzs = [p.magnetization(i) for i in range(len(binary))]
         assert_allclose(mzs, 0.5 - np.array(binary))
 
+    @pytest.mark.parametrize("dtype", ['float64', 'complex128'])
+    def test_sample(self, dtype):
+        n = 6
+        p = MPS_rand_state(n, 5, dtype=dtype)
+        p[2].modify(data=p[2].data * 3)
+        pd = p.to_dense().ravel()
+        ex_probs = abs(pd)**2 / np.sum(abs(pd)**2)
+
+        arrays = [t.data for t in p]
+        state = np.random.get_state()[1].copy()
+        configs, probs = p.sample(50000, seed=42, batch_size=20000)
+        assert configs.shape == (50000, n)
+        # neither the MPS nor the global random state should change
+        assert all(t.data is x for t, x in zip(p, arrays))
+        assert_allclose(np.random.get_state()[1], state)
+        assert_allclose(p.sample(100, seed=7)[0], p.sample(100, seed=7)[0])
+        idxs = configs @ 2**np.arange(n - 1, -1, -1)
+        assert_allclose(probs, ex_probs[idxs])
+        freqs = np.bincount(idxs, minlength=2**n) / 50000
+        assert_allclose(freqs, ex_probs, atol=0.01)
+
+        p = MPS_computational_state('0110')
+        configs, probs = p.sample_(10)
+        assert_allclose(configs, [[0, 1, 1, 0]] * 10)
+        assert_allclose(probs, 1.0)
+
     @pytest.mark.parametrize("rescale", [False, True])
     @pytest.mark.parametrize(
         "keep", [(2, 3, 4, 6, 8),
@@ -1,5 +1,7 @@
 import pytest
 import operator
+import functools
+import pickle
 
 import numpy as np
 from numpy.testing import assert_allclose
@@ -9,14 +11,21 @@ import quimb as qu
 from quimb.tensor import (
     bonds,
     tensor_contract,
+    tensor_contract_sliced,
+    tensor_contract_parallel,
+    tensor_contract_batched,
+    infer_backend,
     tensor_direct_product,
     Tensor,
     TensorNetwork,
     rand_tensor,
     MPS_rand_state,
     TNLinearOperator1D,
+    set_contract_path_cache,
+    ContractProfiler,
 )
 from quimb.tensor.decomp import _trim_singular_vals
+from quimb.tensor.tensor_core import ContractPathDiskCache
 
 
 def test__trim_singular_vals():
@@ -162,6 +171,20 @@ class TestBasicTensorOperations:
         assert d.inds == (4,)
         assert d.tags == {'red', 'blue'}
 
+    @pytest.mark.parametrize("method", ['full', 'sliced', 'parallel'])
+    @pytest.mark.parametrize("dtype", ['float64', 'complex128'])
+    def test_contract_to_python_scalar(self, method, dtype):
+        contract = {
+            'full': tensor_contract,
+            'sliced': functools.partial(tensor_contract_sliced, max_size=4),
+            'parallel': functools.partial(tensor_contract_parallel,
+                                          executor=qu.get_thread_pool(2)),
+        }[method]
+        a = rand_tensor((2, 3), inds='ab', dtype=dtype)
+        b = Tensor(np.ones((2, 3)), inds='ab')
+        for x in (a @ b, contract(a, b)):
+            assert type(x) in (float, complex)
+
     def test_contract_with_legal_characters(self):
         a = Tensor(np.random.randn(2, 3, 4), inds='abc',
                    tags='red')
@@ -189,6 +212,47 @@ class TestBasicTensorOperations:
         assert c.shape == (2, 5)
         assert c.inds == ('-1', '42.42')
 
+    @pytest.mark.parametrize('output_inds', [None, 'adeb', 'bdae', 'eadb'])
+    def test_contract_pairwise(self, output_inds):
+        a = rand_tensor((2, 3, 4, 5), inds='acbf', tags='A')
+        b = rand_tensor((6, 3, 5, 7), inds='dcfe', tags='B')
+        c = tensor_contract(a, b, output_inds=output_inds)
+        if output_inds is None:
+            assert c.inds == ('a', 'b', 'd', 'e')
+        else:
+            assert c.inds == tuple(output_inds)
+        assert c.tags == {'A', 'B'}
+        x = np.einsum('acbf,dcfe->' + ''.join(c.inds), a.data, b.data)
+        assert_allclose(c.data, x)
+
+    def test_contract_pairwise_fallbacks(self):
+        # traces, hyper indices and scalars
+        a = rand_tensor((3, 3, 4), inds='aab')
+        b = rand_tensor((4, 5), inds='bc')
+        assert_allclose(tensor_contract(a, b).data,
+                        np.einsum('aab,bc->c', a.data, b.data))
+        a = rand_tensor((3, 4), inds='ab')
+        b = rand_tensor((4, 3), inds='ba')
+        c = tensor_contract(a, b, output_inds='a')
+        assert_allclose(c.data, np.einsum('ab,ba->a', a.data, b.data))
+        assert_allclose(tensor_contract(a, b), np.einsum('ab,ba', a.data,
+                                                         b.data))
+
+    def test_contract_with_many_inds(self):
+        # more indices than the 52 ascii letters
+        shape = (2, 3, *[1] * 28)
+        a, b, c, d = (np.random.randn(*shape) for _ in range(4))
+        x = tensor_contract(Tensor(a, range(30)), Tensor(b, range(30)),
+                            Tensor(c, range(30, 60)), Tensor(d, range(30, 60)))
+        assert_allclose(x, np.vdot(a, b) * np.vdot(c, d))
+
+    def test_contract_index_appearing_thrice(self):
+        a = rand_tensor((2, 3), inds='ab')
+        b = rand_tensor((3, 4), inds='bc')
+        c = rand_tensor((3, 5), inds='bd')
+        with pytest.raises(ValueError):
+            tensor_contract(a, b, c)
+
     def test_fuse(self):
         a = Tensor(np.random.rand(2, 3, 4, 5), 'abcd', tags={'blue'})
         b = a.fuse({'bra': ['a', 'c'], 'ket': 'bd'})
@@ -240,6 +304,22 @@ class TestBasicTensorOperations:
         assert not a.check_owners()
         assert not b.check_owners()
 
+    def test_slots_and_pickle(self):
+        a = rand_tensor((2, 2), ('a', 'b'), tags={'X', 'Y'})
+        assert not hasattr(a, '__dict__')
+        tn = TensorNetwork((a,), virtual=True)
+        for b in (pickle.loads(pickle.dumps(a)), a.copy(deep=True)):
+            assert not b.check_owners()
+            assert b.inds == a.inds
+            assert b.tags == a.tags
+            assert b.tags is not a.tags
+            assert_allclose(b.data, a.data)
+        tn2 = pickle.loads(pickle.dumps(tn))
+        t, = tn2.tensors
+        t.reindex_({'a': 'c'})
+        assert 'c' in tn2.ind_map
+        assert 'a' in tn.ind_map
+
 
 class TestTensorFunctions:
     @pytest.mark.parametrize('method', ['svd', 'eig', 'isvd', 'svds'])
@@ -394,6 +474,55 @@ class TestTensorNetwork:
         tn2['t1'].data[:] /= 2
         assert_allclose(tn1['t1'].data, tn2['t1'].data)
 
+    def test_copy_virtual_shares_maps_until_modified(self):
+        a = rand_tensor((2, 3, 4), inds='abc', tags='t0')
+        b = rand_tensor((2, 3, 4), inds='abd', tags='t1')
+        tn1 = TensorNetwork((a, b))
+        tn2 = tn1.copy(virtual=True)
+        assert tn2.tag_map is tn1.tag_map
+        assert tn2.ind_map is tn1.ind_map
+        # adding to one network should leave the other unaffected
+        tn2 |= rand_tensor((4,), inds='d', tags='t2')
+        assert 't2' in tn2.tag_map
+        assert 't2' not in tn1.tag_map
+        assert len(tn2.ind_map['d']) == 2
+        assert len(tn1.ind_map['d']) == 1
+        # as should modifying a tensor viewed by both
+        tn3 = tn1.copy(virtual=True)
+        tn4 = tn1.copy()
+        tn3['t0'].retag_({'t0': 'T0'})
+        assert 'T0' in tn1.tag_map and 'T0' in tn3.tag_map
+        assert 'T0' not in tn4.tag_map
+        tn3.delete('T0')
+        assert 'T0' in tn1.tag_map
+        assert 'a' in tn3.ind_map and len(tn3.ind_map['a']) == 1
+        assert len(tn1.ind_map['a']) == 2
+
+    def test_copy_virtual_copies_each_set_once(self):
+        tn1 = TensorNetwork([rand_tensor((2,), inds='a', tags='X')])
+        tn2 = tn1.copy(virtual=True)
+        tn2 |= rand_tensor((2,), inds='a', tags='X')
+        tids = tn2.tag_map['X']
+        assert tids is not tn1.tag_map['X']
+        # later changes modify the now unshared set in place
+        tn2 |= rand_tensor((2,), inds='a', tags='X')
+        assert tn2.tag_map['X'] is tids
+        assert len(tids) == 3
+        # and the record of the copied sets doesn't outlive their entries
+        for i in range(10):
+            tn2 |= rand_tensor((2,), inds=['b{}'.format(i)], tags='Y')
+            tn2.delete('Y')
+        assert len(tn2._owned_inds) == 1
+        assert len(tn1.tag_map['X']) == 1
+        # until the maps are shared again
+        tn3 = tn2.copy(virtual=True)
+        tn2.delete('X')
+        assert 'X' not in tn2.tag_map
+        assert len(tn3.tag_map['X']) == 3
+        tn3.add_tag('Y')
+        assert 'Y' not in tn2.tag_map
+        assert len(tn3.tag_map['Y']) == 3
+
     def test_copy_deep(self):
         a = rand_tensor((2, 3, 4), inds='abc', tags='t0')
         b = rand_tensor((2, 3, 4), inds='abd', tags='t1')
@@ -902,3 +1031,271 @@ class TestTensorNetworkAsLinearOperator:
         s2 = spla.svds(B)[1]
 
         assert_allclose(s1, s2)
+
+
+class TestContractPathCache:
+
+    def test_disk_cache_hit_and_miss(self, tmpdir):
+        cache = set_contract_path_cache(str(tmpdir))
+        try:
+            tn = MPS_rand_state(6, 4)
+            x1 = tn.H @ tn
+            assert cache.misses > 0
+            nmiss = cache.misses
+
+            # simulate a new process by clearing the in-memory cache
+            cache = set_contract_path_cache(str(tmpdir))
+            x2 = tn.H @ tn
+            assert cache.misses == 0
+            assert cache.hits == nmiss
+            assert_allclose(x1, x2)
+            assert cache.info()['size'] > 0
+        finally:
+            set_contract_path_cache(None)
+
+    def test_disk_cache_eviction(self, tmpdir):
+        cache = set_contract_path_cache(str(tmpdir), max_size=1)
+        try:
+            ts = (rand_tensor((3, 3), inds=ix) for ix in ('ab', 'bc', 'cd'))
+            tensor_contract(*ts)
+            assert cache.evictions > 0
+            assert cache.size() <= 1
+        finally:
+            set_contract_path_cache(None)
+
+    def test_disk_cache_scans_rarely(self, tmpdir, monkeypatch):
+        cache = ContractPathDiskCache(str(tmpdir), check_every=4)
+        scans = []
+        scan = cache._maybe_evict
+        monkeypatch.setattr(cache, '_maybe_evict',
+                            lambda: scans.append(1) or scan())
+
+        for i in range(9):
+            cache.save('ab,bc->ac', [(i + 1, 2), (2, 3)], {}, [(0, 1)])
+        # once to find the initial size, then every 4 saves
+        assert len(scans) == 3
+        assert cache.size() == cache._size_estimate
+
+        # exceeding the estimated size triggers a scan
+        cache.max_size = cache._size_estimate
+        cache.save('ab,bc->ac', [(10, 2), (2, 3)], {}, [(0, 1)])
+        assert len(scans) == 4
+        assert cache.size() <= cache.max_size
+
+
+class TestContractProfiler:
+
+    def test_records(self):
+        tn = MPS_rand_state(5, 3)
+        with ContractProfiler() as prof:
+            x1 = tn.H @ tn
+            x2 = tn.H @ tn
+
+        assert_allclose(x1, x2)
+        assert len(prof.records) >= 2
+        r = prof.records[-1]
+        assert r['cache'] == 'memory'
+        assert r['flops'] > 0
+        assert r['largest_intermediate'] > 0
+        assert set(r['times']) == {'map_inds', 'expression', 'contract',
+                                   'tensor', 'total'}
+
+        summary = prof.summary()
+        assert summary[0]['calls'] >= 1
+        assert isinstance(prof.to_json(), str)
+
+        # check hook is removed
+        n = len(prof.records)
+        tn.H @ tn
+        assert len(prof.records) == n
+
+    def test_doesnt_change_caching(self, tmpdir):
+        from quimb.tensor.tensor_core import _get_contract_expr_cached
+
+        cache = set_contract_path_cache(str(tmpdir))
+        try:
+            a = rand_tensor((2, 3), inds='ab')
+            b = rand_tensor((3, 4), inds='bc')
+            c = rand_tensor((4, 5), inds='cd')
+            with ContractProfiler() as prof:
+                tensor_contract(a, b, c, cache=False)
+
+            r, = prof.records
+            assert r['cache'] == 'uncached'
+            assert r['flops'] > 0
+            assert _get_contract_expr_cached.cache_info().currsize == 0
+            assert (cache.hits, cache.misses) == (0, 1)
+        finally:
+            set_contract_path_cache(None)
+
+
+class TestSlicedContraction:
+
+    @pytest.mark.parametrize('executor', [None, 'threads'])
+    def test_contract_sliced_matches(self, executor):
+        p = MPS_rand_state(6, 4, dtype=complex)
+        tn = p.H & p
+        x1 = tn ^ all
+
+        if executor == 'threads':
+            executor = qu.get_thread_pool(2)
+
+        x2 = tn.contract(all, max_size=16, executor=executor)
+        assert_allclose(x1, x2)
+
+    def test_contract_sliced_output_inds(self):
+        a = rand_tensor((4, 5, 6), inds='abc')
+        b = rand_tensor((5, 6, 7), inds='bcd')
+        c = rand_tensor((7, 3), inds='de')
+        x1 = tensor_contract(a, b, c, output_inds='ea')
+        x2 = tensor_contract_sliced(a, b, c, output_inds='ea', max_size=12)
+        assert x2.inds == ('e', 'a')
+        assert_allclose(x1.data, x2.data)
+
+    def test_contract_sliced_too_small(self):
+        a = rand_tensor((4, 5), inds='ab')
+        b = rand_tensor((5, 6), inds='bc')
+        with pytest.raises(ValueError):
+            tensor_contract(a, b, max_size=10)
+
+
+class TestBatchedContraction:
+
+    def test_contract_batched_scalars(self):
+        p = MPS_rand_state(5, 3, dtype=complex)
+        tn = p.H & p
+        tns = []
+        for _ in range(4):
+            tni = tn.copy()
+            for t in tni:
+                t.modify(data=np.random.randn(*t.shape))
+            tns.append(tni.tensors)
+
+        xs = tensor_contract_batched(tns)
+        assert xs.shape == (4,)
+        assert_allclose(xs, [tensor_contract(*ts) for ts in tns])
+
+    def test_contract_batched_output_inds(self):
+        a = rand_tensor((2, 3), inds='ab', tags='A')
+        bs = [rand_tensor((3, 4), inds='bc', tags='B') for _ in range(3)]
+        ys = tensor_contract_batched([(a, b) for b in bs], output_inds='ca')
+        for y, b in zip(ys, bs):
+            assert y.inds == ('c', 'a')
+            assert y.tags == {'A', 'B'}
+            assert_allclose(y.data, tensor_contract(a, b,
+                                                    output_inds='ca').data)
+
+    def test_contract_batched_mismatch(self):
+        a = rand_tensor((2, 3), inds='ab')
+        b = rand_tensor((3, 4), inds='bc')
+        c = rand_tensor((3, 5), inds='bc')
+        with pytest.raises(ValueError):
+            tensor_contract_batched([(a, b), (a, c)])
+        with pytest.raises(ValueError):
+            tensor_contract_batched([])
+
+
+class TestArrayBackends:
+
+    def test_infer_backend(self):
+        assert infer_backend(np.ones(2)) == 'numpy'
+        assert infer_backend(qu.qu([1, 0])) == 'numpy'
+        assert infer_backend(1.0) == 'numpy'
+
+    def test_dask(self):
+        da = pytest.importorskip('dask.array')
+        x = np.random.randn(4, 5, 6)
+        y = np.random.randn(6, 5, 7)
+        a = Tensor(da.from_array(x, chunks=2), inds='abc')
+        b = Tensor(da.from_array(y, chunks=2), inds='cbd')
+        assert infer_backend(a.data) == 'dask.array'
+        c = a @ b
+        assert isinstance(c.data, da.Array)
+        assert_allclose(c.data.compute(), np.einsum('abc,cbd->ad', x, y))
+        assert_allclose(a.norm(), np.linalg.norm(x))
+        # decompositions should remain lazy
+        for method, linds in [('svd', 'a'), ('svd', 'ab'), ('qr', 'ab'),
+                              ('qr', 'a'), ('lq', 'a'), ('lq', 'ab')]:
+            tn = a.split(list(linds), method=method, cutoff=0.0)
+            assert all(isinstance(t.data, da.Array) for t in tn)
+            assert_allclose((tn ^ all).transpose(*a.inds).data.compute(), x)
+        # so should truncated ones, the rank of ``z`` being 3
+        z = np.random.randn(20, 3) @ np.random.randn(3, 24)
+        c = Tensor(da.from_array(z.reshape(4, 5, 6, 4), chunks=2),
+                   inds='abcd')
+        tn = c.split(['a', 'b'], method='svds', max_bond=3, cutoff=0.0)
+        assert all(isinstance(t.data, da.Array) for t in tn)
+        assert_allclose((tn ^ all).data.compute(), z.reshape(4, 5, 6, 4))
+        assert_allclose(a.singular_values(['a']),
+                        np.linalg.svd(x.reshape(4, 30), compute_uv=False))
+        with pytest.raises(NotImplementedError):
+            a.split(['a'], method='eigh')
+
+    def test_sparse(self):
+        sparse = pytest.importorskip('sparse')
+        x = sparse.random((4, 5, 6), density=0.5)
+        y = sparse.random((6, 7), density=0.5)
+        a, b = Tensor(x, inds='abc'), Tensor(y, inds='cd')
+        assert infer_backend(a.data) == 'sparse'
+        c = a @ b
+        assert_allclose(c.data.todense(), np.tensordot(x.todense(),
+                                                       y.todense(), 1))
+        # only truncated decompositions are supported, without densifying
+        with pytest.raises(NotImplementedError):
+            a.split(['a', 'b'], cutoff=0.0)
+        with pytest.raises(ValueError):
+            a.split(['a', 'b'], method='svds', cutoff=0.0)
+        tn = a.split(['a', 'b'], method='svds', max_bond=4, cutoff=0.0)
+        assert tn.ind_size(tn.tensors[0].inds[-1]) == 4
+        U, s, V = np.linalg.svd(x.todense().reshape(20, 6))
+        x4 = (U[:, :4] * s[:4]) @ V[:4]
+        assert_allclose((tn ^ all).transpose(*a.inds).data.reshape(20, 6),
+                        x4, atol=1e-12)
+        # hermitian, with negative eigenvalues
+        h = sparse.random((6, 6), density=0.5)
+        h = Tensor(h + h.T, inds='ab')
+        tn = h.split(['a'], method='eigsh', max_bond=5, cutoff=0.0)
+        el, ev = np.linalg.eigh(h.data.todense())
+        ix = np.argsort(-abs(el))[:5]
+        assert_allclose((tn ^ all).data, (ev[:, ix] * el[ix]) @ ev[:, ix].T,
+                        atol=1e-12)
+
+
+class TestParallelContraction:
+
+    @pytest.mark.parametrize('pool', ['threads', 'processes'])
+    def test_contract_parallel_matches(self, pool):
+        # two disconnected pieces
+        p = MPS_rand_state(8, 5, dtype=complex)
+        q = MPS_rand_state(8, 5, dtype=complex, site_ind_id='q{}')
+        tn = (p.H & p) & (q.H & q)
+        x1 = tn ^ all
+
+        if pool == 'threads':
+            executor = qu.get_thread_pool(2)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(2)
+
+        x2 = tn.contract(all, executor=executor)
+        assert_allclose(x1, x2)
+
+        # slices should also be sent to the pool correctly
+        x3 = tn.contract(all, max_size=64, executor=executor)
+        assert_allclose(x1, x3)
+
+        if pool == 'processes':
+            executor.shutdown()
+
+    @pytest.mark.parametrize('num_tasks', [1, 2, 3, 10])
+    def test_contract_parallel_output_inds(self, num_tasks):
+        a = rand_tensor((2, 3, 4), inds='abc')
+        b = rand_tensor((3, 4, 5), inds='bcd')
+        c = rand_tensor((5, 6), inds='de')
+        d = rand_tensor((6, 2, 7), inds='efg')
+        x1 = tensor_contract(a, b, c, d, output_inds='gfa')
+        x2 = tensor_contract_parallel(a, b, c, d, output_inds='gfa',
+                                      executor=qu.get_thread_pool(2),
+                                      num_tasks=num_tasks)
+        assert x2.inds == ('g', 'f', 'a')
+        assert_allclose(x1.data, x2.data)
@@ -16,15 +16,20 @@ from quimb.tensor import (
     MPS_rand_state,
     MPS_product_state,
     MPS_computational_state,
+    MPS_neel_state,
     MPO_ham_ising,
     MPO_ham_XY,
     MPO_ham_heis,
     MPO_ham_mbl,
     MovingEnvironment,
+    EffHamLinearOperator,
     DMRG1,
     DMRG2,
+    DMRG2Parallel,
     DMRGX,
 )
+from quimb.tensor.tensor_core import TNLinearOperator
+from quimb.tensor.tensor_dmrg import parse_2site_inds_dims
 
 
 np.random.seed(42)
@@ -92,6 +97,57 @@ class TestMovingEnvironment:
         assert env.pos == 0
         assert len(env().tensors) == 4
 
+    @pytest.mark.parametrize("bsz", [1, 2])
+    @pytest.mark.parametrize("begin", ['left', 'right'])
+    def test_turn_around(self, bsz, begin):
+        n = 8
+        p = MPS_rand_state(n, 4)
+        norm = p.H | p
+        env = MovingEnvironment(norm, begin=begin, bsz=bsz)
+        env.move_to({'left': n - bsz, 'right': 0}[begin])
+        old_envs = {i: env.envs[i].tensors for i in env.envs}
+
+        # modify a single site, only the envs including it should change
+        p[3].modify(data=2 * p[3].data)
+        env.turn_around()
+        assert env.begin != begin
+        for i in env.envs:
+            kept = set(map(id, old_envs[i])) & set(map(id, env.envs[i]))
+            if begin == 'left':
+                # reused left envs, and the dummy right env at the end
+                n_kept = (i <= 3) + (i == n - bsz)
+            else:
+                n_kept = (i + bsz > 3) + (i == 0)
+            assert len(kept) == 2 * bsz + n_kept
+
+        for i in {'left': reversed(range(n - bsz + 1)),
+                  'right': range(n - bsz + 1)}[begin]:
+            env.move_to(i)
+            assert len(env().tensors) == 2 * bsz + 2
+            assert (env() ^ all) == pytest.approx(2.0)
+
+        with pytest.raises(ValueError):
+            env.move_to(3)
+            env.turn_around()
+
+    @pytest.mark.parametrize("invalidate", [False, True])
+    def test_turn_around_in_place_changes(self, invalidate):
+        n = 6
+        p = MPS_rand_state(n, 4)
+        env = MovingEnvironment(p.H | p, begin='left', bsz=2)
+        env.move_to(n - 2)
+
+        # in-place changes to the (shared) data can't be detected
+        p[1].data[...] *= 2
+        if invalidate:
+            env.invalidate([1])
+        env.turn_around()
+
+        # the left envs including site 1 are only updated if invalidated
+        assert (env() ^ all) == pytest.approx(4.0 if invalidate else 1.0)
+        env.move_to(0)
+        assert (env() ^ all) == pytest.approx(4.0)
+
     @pytest.mark.parametrize("n", [20, 19])
     @pytest.mark.parametrize("bsz", [1, 2])
     @pytest.mark.parametrize("ssz", [1 / 2, 1.0])
@@ -138,6 +194,43 @@ class TestMovingEnvironment:
             assert (cur_env ^ all) == pytest.approx(1.0)
 
 
+class TestEffHamLinearOperator:
+
+    @pytest.mark.parametrize("bsz", [1, 2])
+    @pytest.mark.parametrize("dtype", [float, complex])
+    def test_matches_tn_linear_operator(self, bsz, dtype):
+        n = 6
+        k = MPS_rand_state(n, 5, dtype=dtype)
+        b, H = k.H, MPO_ham_heis(n)
+        k.add_tag('_KET')
+        b.add_tag('_BRA')
+        H.add_tag('_HAM')
+        k.align_(H, b)
+        me = MovingEnvironment(b | H | k, begin='left', bsz=bsz)
+
+        for i in range(n - bsz + 1):
+            me.move_to(i)
+            tensors = me()['_HAM']
+            if bsz == 1:
+                lix, uix = b[i].inds, k[i].inds
+            else:
+                _, _, _, lix, _, _, uix, _, _ = parse_2site_inds_dims(k, b, i)
+
+            A = EffHamLinearOperator(tensors, lix, uix)
+            B = TNLinearOperator(tensors, lix, uix)
+            assert A.shape == B.shape
+            x = np.random.randn(A.shape[1]).astype(dtype)
+            X = np.random.randn(A.shape[1], 3).astype(dtype)
+            assert_allclose(A @ x, B @ x)
+            assert_allclose(A @ X, B @ X)
+
+    def test_bad_network(self):
+        k = MPS_rand_state(4, 3)
+        with pytest.raises(ValueError):
+            EffHamLinearOperator((k[0], k[1] @ k[2]),
+                                 ('k0', 'k1'), ('b0', 'b1'))
+
+
 class TestDMRG1:
 
     def test_single_explicit_sweep(self):
@@ -236,6 +329,26 @@ class TestDMRG1:
         exp_gs = MPS_product_state([plus()] * 6)
         assert_allclose(abs(exp_gs.H @ mps_gs), 1.0, rtol=1e-3)
 
+    @pytest.mark.parametrize("MPO_ham", [MPO_ham_XY, MPO_ham_heis])
+    def test_subspace_expansion(self, MPO_ham):
+        n = 10
+        h = MPO_ham(n)
+        # start from a product state so that bonds only grow by expansion
+        dmrg = DMRG1(h, bond_dims=[4, 8, 16], p0=MPS_neel_state(n))
+        dmrg.opts['bond_expand_method'] = 'subspace'
+        assert dmrg.solve(tol=1e-8, sweep_sequence='RL', max_sweeps=20)
+        assert 4 < dmrg.state.max_bond() <= 16
+
+        actual_e, gs = eigh(h.to_dense(), k=1)
+        assert_allclose(dmrg.energy, actual_e, rtol=1e-6)
+        assert_allclose(dmrg.state.H @ dmrg.state, 1.0)
+        assert_allclose(abs(expec(dmrg.state.to_dense(), gs)), 1.0, rtol=1e-4)
+
+        dmrg = DMRG1(MPO_ham(n, cyclic=True))
+        dmrg.opts['bond_expand_method'] = 'subspace'
+        with pytest.raises(NotImplementedError):
+            dmrg.solve(max_sweeps=1)
+
 
 class TestDMRG2:
     @pytest.mark.parametrize("dense", [False, True])
@@ -280,6 +393,83 @@ class TestDMRG2:
         assert_allclose(actual_e, eff_e, rtol=tol)
         assert_allclose(abs(expec(mps_gs_dense, gs)), 1.0, rtol=tol)
 
+    def test_reuse_environments(self):
+        n = 10
+        h = MPO_ham_heis(n)
+        p0 = MPS_rand_state(n, 4)
+        energies = []
+        for reuse in (False, True):
+            dmrg = DMRG2(h, bond_dims=[4, 8, 16], p0=p0)
+            dmrg.opts['reuse_environments'] = reuse
+            dmrg.solve(tol=1e-8, sweep_sequence='RL', max_sweeps=4)
+            me = dmrg.ME_eff_ham
+            # e.g. carry on with larger bonds and a rescaled hamiltonian
+            dmrg.ham[n // 2].modify(data=2 * dmrg.ham[n // 2].data)
+            dmrg.solve(tol=1e-8, bond_dims=24, sweep_sequence='RL',
+                       max_sweeps=2)
+            assert (dmrg.ME_eff_ham is me) == reuse
+            # in-place changes need to be flagged explicitly
+            dmrg.ham[n // 2].data[...] /= 2
+            dmrg.invalidate_envs([n // 2])
+            assert n // 2 not in dmrg.ME_eff_ham._site_data
+            dmrg.solve(tol=1e-8, sweep_sequence='RL', max_sweeps=2)
+            energies.append(dmrg.energies)
+
+        assert_allclose(*energies)
+        actual_e, _ = eigh(h.to_dense(), k=1)
+        assert_allclose(energies[1][-3], 2 * actual_e, rtol=1e-6)
+        assert_allclose(energies[1][-1], actual_e, rtol=1e-6)
+
+    def test_checkpoint_and_resume(self, tmpdir):
+        n = 10
+        fname = str(tmpdir.join('dmrg.npz'))
+        h = MPO_ham_heis(n)
+        p0 = MPS_rand_state(n, 4)
+        opts = {'tol': 1e-10, 'sweep_sequence': 'RL', 'max_sweeps': 5}
+
+        dmrg = DMRG2(h, bond_dims=[4, 8, 16], cutoffs=1e-10, p0=p0)
+        dmrg.solve(**opts)
+
+        # e.g. the job is killed after 3 sweeps
+        dmrg1 = DMRG2(h, bond_dims=[4, 8, 16], cutoffs=1e-10, p0=p0)
+        dmrg1.solve(checkpoint=fname, **{**opts, 'max_sweeps': 3})
+
+        dmrg2 = DMRG2(h, bond_dims=[4, 8, 16], cutoffs=1e-10, p0=p0)
+        dmrg2.solve(checkpoint=fname, resume=True, **opts)
+        assert len(dmrg2.energies) == len(dmrg.energies)
+        assert len(dmrg2.local_energies) == len(dmrg.local_energies)
+        assert_allclose(dmrg2.energies, dmrg.energies)
+        assert_allclose(dmrg2.total_energies[1], dmrg.total_energies[1])
+        assert dmrg2.state.max_bond() == 16
+        assert_allclose(abs(dmrg2.state.H @ dmrg.state), 1.0)
+
+        # resuming a finished run does nothing more
+        dmrg3 = DMRG2(h, bond_dims=[4, 8, 16], cutoffs=1e-10, p0=p0)
+        dmrg3.solve(checkpoint=fname, resume=True, **opts)
+        assert_allclose(dmrg3.energies, dmrg2.energies)
+
+    @pytest.mark.parametrize("dense", [None, False, True])
+    @pytest.mark.parametrize("MPO_ham", [MPO_ham_XY, MPO_ham_heis])
+    def test_block_sparse_matches_dense(self, dense, MPO_ham):
+        n = 8
+        h = MPO_ham(n, phys_charges=[1, -1])
+        p0 = MPS_neel_state(n).to_block_sparse([1, -1])
+
+        dmrg = DMRG2(h, bond_dims=[4, 8, 16], p0=p0)
+        dmrg.opts['local_eig_ham_dense'] = dense
+        assert dmrg.solve(tol=1e-6, verbosity=0)
+
+        # the neel state fixes the sector to total Sz = 0, the ground state's
+        actual_e, _ = eigh(MPO_ham(n).to_dense(), k=1)
+        assert_allclose(dmrg.energy, actual_e, rtol=1e-5)
+
+        # the state stays block-sparse in the same sector
+        assert dmrg.state[n - 1].data.charge == 0
+        assert_allclose(dmrg.state.H @ dmrg.state, 1.0)
+
+        with pytest.raises(ValueError):
+            DMRG2(h, bond_dims=[4, 8])
+
     def test_cyclic_solve_big_with_segmenting(self):
         n = 150
         ham = MPO_ham_heis(n, cyclic=True)
@@ -299,6 +489,52 @@ class TestDMRG2:
         assert res_dtype == dtype
 
 
+class TestDMRG2Parallel:
+    @pytest.mark.parametrize("num_segments", [1, 2, 3])
+    @pytest.mark.parametrize("MPO_ham", [MPO_ham_XY, MPO_ham_heis])
+    def test_matches_exact(self, num_segments, MPO_ham):
+        n = 12
+        h = MPO_ham(n)
+        dmrg = DMRG2Parallel(h, bond_dims=[4, 8, 16, 32], cutoffs=1e-10,
+                             num_segments=num_segments)
+        assert len(dmrg.segments) == num_segments
+        assert dmrg.solve(tol=1e-9, max_sweeps=20)
+
+        actual_e, gs = eigh(h.to_dense(), k=1)
+        assert_allclose(dmrg.energy, actual_e, rtol=1e-7)
+        assert_allclose(dmrg.state.H @ dmrg.state, 1.0, rtol=1e-5)
+        psi = dmrg.state.to_dense()
+        assert_allclose(abs(expec(psi, gs)), 1.0, rtol=1e-5)
+
+    @pytest.mark.parametrize("pool", ['threads', 'processes'])
+    def test_executor(self, pool):
+        from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+        Executor = {'threads': ThreadPoolExecutor,
+                    'processes': ProcessPoolExecutor}[pool]
+
+        n = 16
+        h = MPO_ham_heis(n)
+        p0 = MPS_rand_state(n, 4)
+        dmrg = DMRG2Parallel(h, bond_dims=[4, 8, 16], p0=p0, num_segments=3)
+        dmrg.solve(tol=1e-8, max_sweeps=4)
+
+        with Executor(3) as executor:
+            pdmrg = DMRG2Parallel(h, bond_dims=[4, 8, 16], p0=p0,
+                                  num_segments=3, executor=executor)
+            pdmrg.solve(tol=1e-8, max_sweeps=4)
+            # the number of segments defaults to the number of workers
+            assert len(DMRG2Parallel(h, executor=executor).segments) == 3
+
+        assert_allclose(dmrg.energies, pdmrg.energies)
+
+    def test_bad_segments(self):
+        with pytest.raises(ValueError):
+            DMRG2Parallel(MPO_ham_heis(6), num_segments=4)
+        with pytest.raises(NotImplementedError):
+            DMRG2Parallel(MPO_ham_heis(6, cyclic=True))
+
+
 class TestDMRGX:
 
     def test_explicit_sweeps(self):
@@ -0,0 +1,59 @@
+import pytest
+from pytest import approx
+
+import quimb as qu
+import quimb.tensor as qtn
+
+
+class TestTDVP:
+
+    @pytest.mark.parametrize('bsz', [1, 2])
+    def test_matches_exact(self, bsz):
+        n, tf = 8, 1.0
+        H = qtn.MPO_ham_heis(n)
+        if bsz == 1:
+            # the single site integrator can't grow the bond dimension
+            psi0 = qtn.MPS_rand_state(n, 16)
+        else:
+            psi0 = qtn.MPS_neel_state(n)
+
+        tdvp = qtn.TDVP(psi0, H, dt=0.05, bsz=bsz,
+                        split_opts={'cutoff': 1e-10})
+        tdvp.update_to(tf)
+        assert tdvp.t == approx(tf)
+
+        dham = qu.ham_heis(n, sparse=True, cyclic=False)
+        evo = qu.Evolution(psi0.to_dense(), dham)
+        evo.update_to(tf)
+
+        pt = tdvp.pt
+        assert pt.H @ pt == approx(1.0)
+        assert qu.expec(evo.pt, pt.to_dense()) == approx(1, rel=1e-6)
+        assert pt.H @ H.apply(pt) == approx(psi0.H @ H.apply(psi0))
+
+    def test_spin_ham_mpo(self):
+        n = 6
+        builder = qtn.SpinHam()
+        builder += 1.0, 'X', 'X'
+        builder += 0.7, 'Z'
+        H = builder.build_mpo(n)
+        psi0 = qtn.MPS_computational_state('0' * n)
+
+        tdvp = qtn.TDVP(psi0, H, dt=0.1, progbar=False)
+        ts = [0.5, 1.0]
+        pts = list(tdvp.at_times(ts))
+
+        evo = qu.Evolution(psi0.to_dense(), H.to_dense())
+        for t, pt in zip(ts, pts):
+            evo.update_to(t)
+            assert qu.expec(evo.pt, pt.to_dense()) == approx(1, rel=1e-5)
+
+    def test_bad_args(self):
+        psi0 = qtn.MPS_neel_state(6)
+        H = qtn.MPO_ham_heis(6)
+        with pytest.raises(ValueError):
+            qtn.TDVP(psi0, H, bsz=3)
+        with pytest.raises(NotImplementedError):
+            qtn.TDVP(qtn.MPS_rand_state(6, 4, cyclic=True), H)
+        with pytest.raises(ValueError):
+            qtn.TDVP(psi0, H).update_to(1.0)
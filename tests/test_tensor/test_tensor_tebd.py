@@ -4,7 +4,7 @@ import numpy as np
 
 import quimb as qu
 import quimb.tensor as qtn
-from quimb.tensor.tensor_tebd import OTOC_local
+from quimb.tensor.tensor_tebd import OTOC_local, TROTTER_SCHEMES
 
 
 class TestTEBD:
@@ -61,6 +61,114 @@ class TestTEBD:
 
         assert qu.expec(evo.pt, tebd.pt.to_dense()) == approx(1, rel=1e-5)
 
+    @pytest.mark.parametrize('order', list(TROTTER_SCHEMES))
+    def test_trotter_schemes(self, order):
+        p, _, sweeps = TROTTER_SCHEMES[order]
+        for direction in ('right', 'left'):
+            assert sum(f for d, f in sweeps if d == direction) == approx(1)
+
+        n = 6
+        psi0 = qtn.MPS_rand_state(n, 4)
+        H_int = qu.ham_heis(2, cyclic=False)
+        dham = qu.ham_heis(n, cyclic=False)
+
+        # check the error of a single step scales with the right order
+        errs = []
+        for dt in (0.4, 0.2):
+            tebd = qtn.TEBD(psi0, H_int, dt=dt, split_opts={'cutoff': 0.0})
+            tebd.step(order=order)
+            exact = qu.expm(-1j * dt * dham) @ psi0.to_dense()
+            errs.append(np.linalg.norm(tebd.pt.to_dense() - exact))
+        assert np.log2(errs[0] / errs[1]) == approx(p + 1, abs=0.2)
+
+        dham = qu.ham_heis(n, sparse=True, cyclic=False)
+        tebd = qtn.TEBD(psi0, H_int, tol=1e-5)
+        tebd.update_to(1.0, order=order)
+        evo = qu.Evolution(psi0.to_dense(), dham)
+        evo.update_to(1.0)
+        assert qu.expec(evo.pt, tebd.pt.to_dense()) == approx(1, rel=1e-5)
+
+    @pytest.mark.parametrize('n', [9, 10])
+    @pytest.mark.parametrize('split_opts', [
+        {'cutoff': 1e-10},
+        {'max_bond': 6, 'cutoff_mode': 'rel'},
+        {'method': 'eig'},
+    ])
+    def test_fused_matches_gate_split(self, n, split_opts):
+        psi0 = qtn.MPS_rand_state(n, 4, dtype=complex)
+        H_int = qu.ham_heis(2, cyclic=False)
+
+        pts = []
+        for fused in (False, True):
+            tebd = qtn.TEBD(psi0, H_int, dt=0.05, fused=fused,
+                            split_opts=split_opts)
+            assert tebd._can_fuse() == fused
+            tebd.update_to(0.5, order=4)
+            pts.append(tebd.pt)
+
+        assert pts[0].bond_sizes() == pts[1].bond_sizes()
+        assert pts[0].count_canonized() == pts[1].count_canonized()
+        assert abs(pts[0].H @ pts[1]) == approx(1.0)
+
+    @pytest.mark.parametrize('n', [6, 7])
+    @pytest.mark.parametrize('num_threads', [1, 2])
+    def test_parallel_vidal(self, n, num_threads):
+        psi0 = qtn.MPS_rand_state(n, 4, dtype=complex)
+        H_int = qu.ham_heis(2, cyclic=False)
+
+        tebd = qtn.TEBD(psi0, H_int, dt=0.05)
+        tebd.update_to(0.5, order=4)
+        ptebd = qtn.TEBDParallel(psi0, H_int, dt=0.05,
+                                 num_threads=num_threads)
+        ptebd.update_to(0.5, order=4)
+
+        assert (ptebd.executor is None) == (num_threads == 1)
+        assert ptebd.pt.bond_sizes() == tebd.pt.bond_sizes()
+        assert abs(ptebd.pt.H @ tebd.pt) == approx(1.0)
+        np.testing.assert_allclose(ptebd.lambdas[n // 2],
+                                   tebd.pt.singular_values(n // 2 + 1),
+                                   atol=1e-10)
+
+        with pytest.raises(ValueError):
+            qtn.TEBDParallel(psi0, H_int, split_opts={'method': 'eig'})
+
+    @pytest.mark.parametrize('tol', [None, 1e-4])
+    def test_checkpoint_and_resume(self, tmpdir, tol):
+        n, tf = 10, 1.0
+        fname = str(tmpdir.join('tebd.npz'))
+        psi0 = qtn.MPS_neel_state(n)
+        H_int = qu.ham_heis(2, cyclic=False)
+        dt = None if tol else 0.05
+
+        tebd = qtn.TEBD(psi0, H_int)
+        tebd.update_to(tf, dt=dt, tol=tol)
+
+        # kill the evolution part of the way through
+        tebd1 = qtn.TEBD(psi0, H_int)
+        step, num_steps = tebd1.step, [0]
+
+        def interrupted_step(*args, **kwargs):
+            if num_steps[0] == 5:
+                raise KeyboardInterrupt
+            num_steps[0] += 1
+            step(*args, **kwargs)
+
+        tebd1.step = interrupted_step
+        with pytest.raises(KeyboardInterrupt):
+            tebd1.update_to(tf, dt=dt, tol=tol, checkpoint=fname,
+                            checkpoint_every=2)
+
+        tebd2 = qtn.TEBD(psi0, H_int)
+        tebd2.load_checkpoint(fname)
+        assert tebd2.t == approx(4 * tebd._dt)
+        assert tebd2._queued_sweep
+
+        tebd2 = qtn.TEBD(psi0, H_int)
+        tebd2.update_to(tf, dt=dt, tol=tol, checkpoint=fname, resume=True)
+        assert tebd2.t == approx(tf)
+        assert tebd2.err == approx(tebd.err)
+        assert abs(tebd2.pt.H @ tebd.pt) == approx(1.0, rel=1e-10)
+
     @pytest.mark.parametrize('cyclic', [False, True])
     @pytest.mark.parametrize('dt,tol', [
         (0.0659283, None),
@@ -184,5 +292,5 @@ def test_OTOC_local():
                         split_opts={'cutoff': 1e-5, 'cutoff_mode': 'rel'},
                         initial_eigenstate='check'):
         x_t += [x]
-    assert x_t[0] == pytest.approx(0.52745, 1e-5)
-    assert x_t[1] == pytest.approx(0.70440, 1e-5)
+    assert x_t[0] == pytest.approx(0.52749, 1e-5)
+    assert x_t[1] == pytest.approx(0.70439, 1e-5)